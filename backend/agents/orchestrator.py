@@ -3,7 +3,7 @@ LangGraph Orchestrator - Manages the multi-agent resume pipeline.
 """
 
 import logging
-from typing import Dict, Any, Literal
+from typing import Callable, Dict, Any, Literal
 from langgraph.graph import StateGraph, END
 
 from .state import ResumeState, create_initial_state
@@ -64,19 +64,28 @@ class ResumeOrchestrator:
         # Compile the graph
         return workflow.compile()
     
-    def _run_generator(self, state: ResumeState) -> ResumeState:
+    def _notify(self, config, stage: str, **data):
+        """Pass a stage transition to the run's on_stage callback, if any."""
+        on_stage = ((config or {}).get('configurable') or {}).get('on_stage')
+        if on_stage is not None:
+            on_stage(stage, **data)
+    
+    def _run_generator(self, state: ResumeState, config=None) -> ResumeState:
         """Run the generator agent."""
         logger.info("Running Generator Agent")
+        self._notify(config, 'generator', iteration=state.get('iteration', 0) + 1)
         return self.generator.process(dict(state))
     
-    def _run_reviewer(self, state: ResumeState) -> ResumeState:
+    def _run_reviewer(self, state: ResumeState, config=None) -> ResumeState:
         """Run the reviewer agent."""
         logger.info("Running Reviewer Agent")
+        self._notify(config, 'reviewer', iteration=state.get('iteration', 0))
         return self.reviewer.process(dict(state))
     
-    def _run_analyzer(self, state: ResumeState) -> ResumeState:
+    def _run_analyzer(self, state: ResumeState, config=None) -> ResumeState:
         """Run the analyzer agent."""
         logger.info("Running Analyzer Agent")
+        self._notify(config, 'analyzer', iteration=state.get('iteration', 0))
         return self.analyzer.process(dict(state))
     
     def _should_regenerate(self, state: ResumeState) -> Literal["regenerate", "continue"]:
@@ -97,7 +106,8 @@ class ResumeOrchestrator:
         user_id: str,
         ground_truth: Dict[str, Any],
         job_description: str = None,
-        max_iterations: int = 3
+        max_iterations: int = 3,
+        on_stage: Callable[..., None] = None
     ) -> Dict[str, Any]:
         """
         Run the complete resume generation pipeline.
@@ -107,6 +117,9 @@ class ResumeOrchestrator:
             ground_truth: User's career data
             job_description: Optional target job description
             max_iterations: Max regeneration attempts
+            on_stage: Called as on_stage(agent_name, iteration=n) before
+                each agent runs; passed through the graph config since the
+                orchestrator is shared between threads
             
         Returns:
             Final state with generated resume
@@ -123,7 +136,9 @@ class ResumeOrchestrator:
         
         # Run the graph
         try:
-            final_state = self.graph.invoke(initial_state)
+            final_state = self.graph.invoke(
+                initial_state, config={'configurable': {'on_stage': on_stage}}
+            )
             logger.info(f"Pipeline completed. Score: {final_state.get('overall_score')}")
             return dict(final_state)
         except Exception as e:
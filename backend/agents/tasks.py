@@ -25,8 +25,13 @@ def run_resume_pipeline(
         user_id: User ID
         ground_truth: User's career data
         job_description: Optional job description for targeting
+    
+    Publishes progress events (started, generator/reviewer/analyzer with
+    the iteration, retrying, done, failed) for the SSE stream.
     """
+    from functools import partial
     from api.models import Resume
+    from core.progress import publish_progress, DONE, FAILED
     from .orchestrator import get_orchestrator
     
     logger.info(f"Starting pipeline task for resume {resume_id}")
@@ -36,13 +41,15 @@ def run_resume_pipeline(
         resume = Resume.objects.get(id=resume_id)
         resume.status = Resume.Status.PROCESSING
         resume.save(update_fields=['status'])
+        publish_progress(self.request.id, 'started')
         
         # Run the pipeline
         orchestrator = get_orchestrator()
         result = orchestrator.run(
             user_id=user_id,
             ground_truth=ground_truth,
-            job_description=job_description
+            job_description=job_description,
+            on_stage=partial(publish_progress, self.request.id)
         )
         
         # Save results
@@ -60,6 +67,7 @@ def run_resume_pipeline(
         resume.save()
         
         logger.info(f"Pipeline completed for resume {resume_id}. Score: {resume.match_score}")
+        publish_progress(self.request.id, DONE, match_score=resume.match_score)
         
         return {
             'status': 'completed',
@@ -69,6 +77,7 @@ def run_resume_pipeline(
         
     except Resume.DoesNotExist:
         logger.error(f"Resume {resume_id} not found")
+        publish_progress(self.request.id, FAILED, error='Resume not found')
         return {'status': 'error', 'message': 'Resume not found'}
         
     except Exception as e:
@@ -85,8 +94,10 @@ def run_resume_pipeline(
         
         # Retry on transient errors
         if self.request.retries < self.max_retries:
+            publish_progress(self.request.id, 'retrying', attempt=self.request.retries + 1)
             raise self.retry(exc=e)
         
+        publish_progress(self.request.id, FAILED, error=str(e)[:1000])
         return {'status': 'error', 'message': str(e)}
 
 
@@ -4,11 +4,12 @@ URL configuration for agents app.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import AgentViewSet
+from .views import AgentViewSet, resume_progress_stream
 
 router = DefaultRouter()
 router.register(r'', AgentViewSet, basename='agent')
 
 urlpatterns = [
+    path('stream/<str:resume_id>/', resume_progress_stream, name='agent-stream'),
     path('', include(router.urls)),
 ]
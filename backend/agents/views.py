@@ -2,15 +2,24 @@
 API views for the multi-agent system.
 """
 
+import logging
+
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from api.models import Resume
-from api.serializers import ResumeSerializer
+from api.serializers import ResumeSerializer, TaskStatusQuerySerializer
+from core.scheduling import tenant_for, fair_priority
+from core.progress import progress_response, issue_stream_ticket, redeem_stream_ticket, DONE, FAILED
+from core.etags import etag_response
 from .tasks import run_resume_pipeline
 
+logger = logging.getLogger(__name__)
+
 
 class AgentViewSet(viewsets.ViewSet):
     """
@@ -19,6 +28,10 @@ class AgentViewSet(viewsets.ViewSet):
     Endpoints:
     - POST /api/agents/generate/ - Generate a resume using agents
     - GET /api/agents/status/{resume_id}/ - Get generation status
+    - GET /api/agents/status/?task_ids=a,b,c - Compact status of many generations
+    - POST /api/agents/stream_ticket/{resume_id}/ - Single-use ticket for the stream
+    - GET /api/agents/stream/{resume_id}/?ticket=... - Generation progress as
+      Server-Sent Events (resume_progress_stream)
     """
     permission_classes = [IsAuthenticated]
     
@@ -54,11 +67,14 @@ class AgentViewSet(viewsets.ViewSet):
         job_description = request.data.get('job_description', '')
         
         # Trigger async pipeline
-        task = run_resume_pipeline.delay(
-            resume_id=str(resume.id),
-            user_id=str(user.id),
-            ground_truth=profile.ground_truth,
-            job_description=job_description
+        task = run_resume_pipeline.apply_async(
+            kwargs={
+                'resume_id': str(resume.id),
+                'user_id': str(user.id),
+                'ground_truth': profile.ground_truth,
+                'job_description': job_description,
+            },
+            priority=fair_priority(tenant_for(request))
         )
         
         # Store task ID
@@ -99,3 +115,89 @@ class AgentViewSet(viewsets.ViewSet):
             response['error'] = resume.error_message
         
         return Response(response)
+    
+    @action(detail=False, methods=['post'], url_path='stream_ticket/(?P<resume_id>[^/.]+)')
+    def stream_ticket(self, request, resume_id=None):
+        """
+        Issue a short-lived, single-use ticket for the progress stream of
+        one of the user's resumes. EventSource cannot send the JWT header,
+        and the ticket keeps the token itself out of URLs and logs.
+        """
+        if not Resume.objects.filter(id=resume_id, user=request.user).exists():
+            return Response({
+                'error': 'Resume not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            ticket = issue_stream_ticket(f"resume:{resume_id}", request.user.pk)
+        except Exception as e:
+            logger.warning(f"Could not issue stream ticket: {e}")
+            return Response({
+                'error': 'Progress stream unavailable'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        return Response({'ticket': ticket})
+    
+    @action(detail=False, methods=['get'], url_path='status')
+    def batch_status(self, request):
+        """
+        Status of many of the user's generations by task ID in one indexed
+        query.
+        
+        Returns {"results": {task_id: {resume_id, status, match_score}},
+        "missing": [task_id, ...]} with an ETag; polls sending the current
+        ETag in If-None-Match get an empty 304.
+        """
+        query = TaskStatusQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        task_ids = query.validated_data['task_ids']
+        
+        rows = Resume.objects.filter(user=request.user, task_id__in=task_ids).values(
+            'task_id', 'id', 'status', 'match_score'
+        )
+        results = {
+            row['task_id']: {
+                'resume_id': row['id'],
+                'status': row['status'],
+                'match_score': row['match_score'],
+            }
+            for row in rows
+        }
+        
+        return etag_response(request, {
+            'results': results,
+            'missing': [task_id for task_id in task_ids if task_id not in results],
+        })
+
+
+@require_GET
+def resume_progress_stream(request, resume_id):
+    """
+    Stream the progress of a resume generation as Server-Sent Events:
+    generator (with iteration), reviewer, analyzer, then done or failed.
+    
+    Authenticated by the session, or by a ticket from stream_ticket passed
+    as ``?ticket=``. The resume is looked up once at connect; events then
+    come from Redis pub/sub (see core.progress).
+    """
+    if request.user.is_authenticated:
+        user_id = request.user.pk
+    else:
+        user_id = redeem_stream_ticket(request.GET.get('ticket', ''), f"resume:{resume_id}")
+    if user_id is None:
+        return JsonResponse({'error': 'Invalid or expired stream ticket'}, status=401)
+    
+    resume = Resume.objects.filter(id=resume_id, user_id=user_id).only(
+        'task_id', 'status', 'match_score', 'error_message'
+    ).first()
+    if resume is None or not resume.task_id:
+        raise Http404('Resume not found')
+    
+    if resume.status == Resume.Status.COMPLETED:
+        initial = {'stage': DONE, 'match_score': resume.match_score}
+    elif resume.status == Resume.Status.FAILED:
+        initial = {'stage': FAILED, 'error': resume.error_message}
+    else:
+        initial = {'stage': resume.status.lower()}
+    
+    return progress_response(resume.task_id, initial=initial)
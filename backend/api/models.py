@@ -17,6 +17,9 @@ class JobPosting(models.Model):
     description = models.TextField()
     requirements = models.TextField(blank=True)
     embedding = models.JSONField(null=True, blank=True)
+    keywords = models.JSONField(null=True, blank=True)
+    features_fingerprint = models.CharField(max_length=64, blank=True)  # text + model version hash
+    critique_all_task_id = models.CharField(max_length=255, blank=True)  # latest critique_all run
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -30,6 +33,14 @@ class JobPosting(models.Model):
     @property
     def candidate_count(self):
         return self.candidates.count()
+    
+    @property
+    def description_text(self):
+        """Job description text used for critique scoring."""
+        text = f"{self.title}\n\n{self.description}"
+        if self.requirements:
+            text += f"\n\nRequirements:\n{self.requirements}"
+        return text
 
 
 class Resume(models.Model):
@@ -87,7 +98,7 @@ class Resume(models.Model):
     match_score = models.FloatField(null=True, blank=True)
     
     # Task tracking
-    task_id = models.CharField(max_length=255, blank=True)
+    task_id = models.CharField(max_length=255, blank=True, db_index=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     error_message = models.TextField(blank=True)
     
@@ -115,7 +126,14 @@ class Candidate(models.Model):
     name = models.CharField(max_length=255)
     email = models.EmailField(blank=True)
     resume_file = models.FileField(upload_to='resumes/%Y/%m/')
+    resume_sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # uploaded file content hash
     resume_text = models.TextField(blank=True)
+    resume_truncated = models.BooleanField(default=False)  # extraction stopped at a budget
+    resume_sections = models.JSONField(null=True, blank=True)  # extract_sections() output
+    resume_section_spans = models.JSONField(null=True, blank=True)  # split_sections() with offsets
+    keywords = models.JSONField(null=True, blank=True)
+    embedding = models.JSONField(null=True, blank=True)
+    features_fingerprint = models.CharField(max_length=64, blank=True)  # text + model version hash
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -134,13 +152,27 @@ class CritiqueResult(models.Model):
         COMPLETED = 'COMPLETED', 'Completed'
         FAILED = 'FAILED', 'Failed'
     
+    class Tier(models.TextChoices):
+        PREFILTER = 'PREFILTER', 'Prefilter (dictionary + TF-IDF)'
+        FULL = 'FULL', 'Full (NER + semantic)'
+    
+    class Stage(models.TextChoices):
+        """Pipeline stages, in order; ``stage`` holds the last one finished."""
+        EXTRACT = 'EXTRACT', 'Text extracted'
+        KEYWORDS = 'KEYWORDS', 'Keywords extracted'
+        EMBEDDINGS = 'EMBEDDINGS', 'Resume encoded'
+        SCORE = 'SCORE', 'Scored'
+        FEEDBACK = 'FEEDBACK', 'Feedback generated'
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     candidate = models.OneToOneField(Candidate, on_delete=models.CASCADE, related_name='critique')
-    task_id = models.CharField(max_length=255, blank=True)
+    task_id = models.CharField(max_length=255, blank=True, db_index=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
     overall_score = models.FloatField(null=True, blank=True)
     keyword_score = models.FloatField(null=True, blank=True)
     semantic_score = models.FloatField(null=True, blank=True)
+    tier = models.CharField(max_length=20, choices=Tier.choices, default=Tier.FULL)
+    stage = models.CharField(max_length=20, choices=Stage.choices, blank=True)
     result_json = models.JSONField(null=True, blank=True)
     error_message = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -151,6 +183,11 @@ class CritiqueResult(models.Model):
     
     def __str__(self):
         return f"Critique for {self.candidate.name}: {self.status}"
+    
+    def reached(self, stage: str) -> bool:
+        """Whether the pipeline has finished ``stage`` for this critique."""
+        stages = self.Stage.values
+        return bool(self.stage) and stages.index(self.stage) >= stages.index(stage)
 
 
 class JobApplication(models.Model):
@@ -4,6 +4,7 @@ Extended with Resume serializers.
 """
 
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth.models import User
 from .models import JobPosting, Candidate, CritiqueResult, Resume
 
@@ -13,7 +14,7 @@ class CritiqueResultSerializer(serializers.ModelSerializer):
         model = CritiqueResult
         fields = [
             'id', 'status', 'task_id', 'overall_score', 'keyword_score',
-            'semantic_score', 'result_json', 'error_message', 
+            'semantic_score', 'tier', 'stage', 'result_json', 'error_message', 
             'created_at', 'completed_at'
         ]
         read_only_fields = fields
@@ -27,9 +28,13 @@ class CandidateSerializer(serializers.ModelSerializer):
         model = Candidate
         fields = [
             'id', 'job_posting', 'name', 'email', 'resume_file',
-            'resume_url', 'resume_text', 'critique', 'created_at', 'updated_at'
+            'resume_url', 'resume_text', 'resume_truncated', 'resume_sections', 'critique',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'resume_text', 'resume_truncated', 'resume_sections', 'critique',
+            'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'resume_text', 'critique', 'created_at', 'updated_at']
     
     def get_resume_url(self, obj):
         if obj.resume_file:
@@ -42,17 +47,25 @@ class CandidateSerializer(serializers.ModelSerializer):
 
 class CandidateListSerializer(serializers.ModelSerializer):
     critique_status = serializers.SerializerMethodField()
+    critique_task_id = serializers.SerializerMethodField()
     overall_score = serializers.SerializerMethodField()
     
     class Meta:
         model = Candidate
-        fields = ['id', 'name', 'email', 'critique_status', 'overall_score', 'created_at']
+        fields = [
+            'id', 'name', 'email', 'critique_status', 'critique_task_id', 'overall_score', 'created_at'
+        ]
     
     def get_critique_status(self, obj):
         if hasattr(obj, 'critique'):
             return obj.critique.status
         return None
     
+    def get_critique_task_id(self, obj):
+        if hasattr(obj, 'critique') and obj.critique.task_id:
+            return obj.critique.task_id
+        return None
+    
     def get_overall_score(self, obj):
         if hasattr(obj, 'critique') and obj.critique.overall_score:
             return obj.critique.overall_score
@@ -125,6 +138,32 @@ class GenerateCritiqueSerializer(serializers.Serializer):
         return value
 
 
+class RankCandidatesSerializer(serializers.Serializer):
+    cascade = serializers.BooleanField(required=False, default=False)
+    top_k = serializers.IntegerField(required=False, min_value=1)
+    threshold = serializers.FloatField(required=False, min_value=0, max_value=100)
+
+
+class CritiqueAllSerializer(serializers.Serializer):
+    chunk_size = serializers.IntegerField(required=False, min_value=1, max_value=500)
+
+
+class TaskStatusQuerySerializer(serializers.Serializer):
+    """``?task_ids=a,b,c`` of the batch status endpoints."""
+    task_ids = serializers.CharField()
+    
+    def validate_task_ids(self, value):
+        # Keep the order, drop blanks and duplicates
+        task_ids = list(dict.fromkeys(task_id.strip() for task_id in value.split(',') if task_id.strip()))
+        limit = getattr(settings, 'TASK_STATUS_BATCH_MAX', 300)
+        
+        if not task_ids:
+            raise serializers.ValidationError("Provide at least one task id.")
+        if len(task_ids) > limit:
+            raise serializers.ValidationError(f"At most {limit} task ids per request.")
+        return task_ids
+
+
 # ===== Job Application Serializers =====
 
 from .models import JobApplication
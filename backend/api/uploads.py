@@ -0,0 +1,44 @@
+"""
+Upload handlers.
+"""
+
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler
+
+
+class ContentHashUploadHandler(FileUploadHandler):
+    """
+    Computes the SHA-256 of each uploaded file while it streams in.
+
+    Chunks are passed through unchanged to the next handler, which still
+    stores the file. Digests are left on ``request.upload_sha256``, keyed
+    by form field name.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self._hash = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self._hash.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        if not hasattr(self.request, 'upload_sha256'):
+            self.request.upload_sha256 = {}
+        self.request.upload_sha256[self.field_name] = self._hash.hexdigest()
+        # Let the next handler build the uploaded file
+        return None
+
+
+def hash_file(file, chunk_size: int = 64 * 1024) -> str:
+    """SHA-256 of a stored file (FieldFile or file-like), read in chunks."""
+    hasher = hashlib.sha256()
+    file.open('rb')
+    try:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            hasher.update(chunk)
+    finally:
+        file.close()
+    return hasher.hexdigest()
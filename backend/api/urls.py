@@ -4,7 +4,10 @@ URL configuration for the API app.
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import JobPostingViewSet, CandidateViewSet, CritiqueResultViewSet, JobApplicationViewSet
+from .views import (
+    JobPostingViewSet, CandidateViewSet, CritiqueResultViewSet, JobApplicationViewSet,
+    critique_progress_stream
+)
 
 router = DefaultRouter()
 router.register(r'jobs', JobPostingViewSet, basename='job')
@@ -13,6 +16,7 @@ router.register(r'critiques', CritiqueResultViewSet, basename='critique')
 router.register(r'applications', JobApplicationViewSet, basename='application')
 
 urlpatterns = [
+    path('critiques/stream/<str:task_id>/', critique_progress_stream, name='critique-stream'),
     path('', include(router.urls)),
 ]
 
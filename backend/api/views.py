@@ -2,11 +2,15 @@
 API ViewSets for the Resume Critique Agent.
 """
 
+import logging
+
+from celery.utils import uuid
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
 
 from .models import JobPosting, Candidate, CritiqueResult
 from .serializers import (
@@ -15,9 +19,28 @@ from .serializers import (
     CandidateSerializer,
     CandidateListSerializer,
     CritiqueResultSerializer,
-    GenerateCritiqueSerializer
+    GenerateCritiqueSerializer,
+    RankCandidatesSerializer,
+    CritiqueAllSerializer,
+    TaskStatusQuerySerializer
+)
+from critique.tasks import (
+    run_critique_pipeline,
+    index_job_posting,
+    rank_job_candidates,
+    critique_job_candidates,
+    extract_candidate_text
 )
-from critique.tasks import run_critique_pipeline
+from critique.cache import cache_stats, get_extracted_text
+from critique.parser import extract_sections, sections_to_json, split_sections
+from critique.locks import candidate_single_flight_key, acquire_single_flight, release_single_flight
+from core.monitoring import queue_stats
+from core.scheduling import tenant_for, fair_priority
+from core.progress import progress_response, DONE, FAILED
+from core.etags import etag_response
+from .uploads import ContentHashUploadHandler
+
+logger = logging.getLogger(__name__)
 
 
 class JobPostingViewSet(viewsets.ModelViewSet):
@@ -30,6 +53,9 @@ class JobPostingViewSet(viewsets.ModelViewSet):
     - GET /api/jobs/{id}/ - Retrieve a job posting with candidates
     - PUT /api/jobs/{id}/ - Update a job posting
     - DELETE /api/jobs/{id}/ - Delete a job posting
+    - POST /api/jobs/{id}/rank_candidates/ - Re-score all candidates in one batch
+    - POST /api/jobs/{id}/critique_all/ - Critique all candidates in one chunked task
+    - GET /api/jobs/{id}/critique_all/{task_id}/ - Progress of a critique_all task
     """
     queryset = JobPosting.objects.all()
     
@@ -37,6 +63,125 @@ class JobPostingViewSet(viewsets.ModelViewSet):
         if self.action == 'retrieve':
             return JobPostingDetailSerializer
         return JobPostingSerializer
+    
+    def perform_create(self, serializer):
+        job_posting = serializer.save()
+        index_job_posting.delay(str(job_posting.id))
+    
+    def perform_update(self, serializer):
+        job_posting = serializer.save()
+        index_job_posting.delay(str(job_posting.id))
+    
+    @action(detail=True, methods=['post'])
+    def rank_candidates(self, request, pk=None):
+        """
+        Re-rank every candidate of this posting in a single task.
+        
+        Request body (optional):
+        {
+            "cascade": true,    // prefilter everyone, full analysis for the shortlist
+            "top_k": 50,
+            "threshold": 40.0
+        }
+        
+        Returns a 202 Accepted with the task_id of the ranking task.
+        """
+        job_posting = self.get_object()
+        
+        serializer = RankCandidatesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        task = rank_job_candidates.apply_async(
+            args=[str(job_posting.id)],
+            kwargs={
+                'cascade': serializer.validated_data['cascade'],
+                'top_k': serializer.validated_data.get('top_k'),
+                'threshold': serializer.validated_data.get('threshold'),
+            },
+            priority=fair_priority(
+                tenant_for(request, job_posting), cost=job_posting.candidates.count()
+            )
+        )
+        
+        return Response({
+            'status': 'processing',
+            'task_id': task.id,
+            'message': 'Candidate ranking started.'
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=True, methods=['post'])
+    def critique_all(self, request, pk=None):
+        """
+        Critique every candidate of this posting in one chunked task.
+        
+        Request body (optional):
+        {
+            "chunk_size": 25    // candidates per batch, default CRITIQUE_BULK_CHUNK_SIZE
+        }
+        
+        Returns a 202 Accepted with the task_id; poll
+        critique_all/{task_id}/ for chunk-level progress.
+        """
+        job_posting = self.get_object()
+        
+        serializer = CritiqueAllSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        # Record the run on the posting so critique_all_progress only
+        # answers for this posting's tasks
+        task_id = uuid()
+        job_posting.critique_all_task_id = task_id
+        job_posting.save(update_fields=['critique_all_task_id'])
+        
+        # Charged per candidate so the owner's next tasks queue behind
+        # other users' interactive requests
+        task = critique_job_candidates.apply_async(
+            args=[str(job_posting.id)],
+            kwargs={'chunk_size': serializer.validated_data.get('chunk_size')},
+            task_id=task_id,
+            priority=fair_priority(
+                tenant_for(request, job_posting), cost=job_posting.candidates.count()
+            )
+        )
+        
+        return Response({
+            'status': 'processing',
+            'task_id': task.id,
+            'message': 'Critique of all candidates started.'
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=True, methods=['get'], url_path='critique_all/(?P<task_id>[^/.]+)')
+    def critique_all_progress(self, request, pk=None, task_id=None):
+        """
+        Celery state of a critique_all task of this posting, with per-chunk
+        counts. Tasks that are not this posting's critique_all runs are 404.
+        """
+        from celery.result import AsyncResult
+        
+        job_posting = self.get_object()
+        result = AsyncResult(task_id)
+        
+        # The latest run is recorded on the posting; earlier runs are
+        # recognised by the job id in their progress/result meta
+        info = result.info if result.state in ('PROGRESS', 'SUCCESS') else None
+        belongs = task_id == job_posting.critique_all_task_id or (
+            isinstance(info, dict) and info.get('job_id') == str(job_posting.id)
+        )
+        if not belongs:
+            return Response({'error': 'Task not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        if result.state == 'PROGRESS':
+            progress = result.info
+        elif result.successful():
+            progress = result.result
+        else:
+            progress = None
+        
+        return Response({
+            'task_id': task_id,
+            'state': result.state,
+            'progress': progress,
+        })
 
 
 class CandidateViewSet(viewsets.ModelViewSet):
@@ -53,6 +198,12 @@ class CandidateViewSet(viewsets.ModelViewSet):
     queryset = Candidate.objects.select_related('critique', 'job_posting').all()
     parser_classes = [MultiPartParser, FormParser]
     
+    def initialize_request(self, request, *args, **kwargs):
+        # Hash resume uploads while they stream in, before the body is parsed
+        if request.method == 'POST':
+            request.upload_handlers.insert(0, ContentHashUploadHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
+    
     def get_serializer_class(self):
         if self.action == 'list':
             return CandidateListSerializer
@@ -68,12 +219,38 @@ class CandidateViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def perform_create(self, serializer):
+        """
+        Reuse text already extracted from an identical PDF, otherwise
+        start extraction in the background.
+        """
+        resume_sha256 = getattr(self.request, 'upload_sha256', {}).get('resume_file', '')
+        extracted = get_extracted_text(resume_sha256)
+        
+        if extracted:
+            resume_text, resume_truncated = extracted
+            sections = split_sections(resume_text)
+            serializer.save(
+                resume_sha256=resume_sha256,
+                resume_text=resume_text,
+                resume_truncated=resume_truncated,
+                resume_sections=extract_sections(resume_text, sections),
+                resume_section_spans=sections_to_json(sections)
+            )
+        else:
+            candidate = serializer.save(resume_sha256=resume_sha256)
+            extract_candidate_text.apply_async(
+                args=[str(candidate.id)],
+                priority=fair_priority(tenant_for(self.request, candidate.job_posting))
+            )
+    
     @action(detail=True, methods=['post'])
     def generate_critique(self, request, pk=None):
         """
         Trigger asynchronous critique generation for a candidate.
         
-        Returns a 202 Accepted with the task_id for polling.
+        Returns a 202 Accepted with the task_id for polling, and whether the
+        resume text was already extracted (only scoring left to do).
         """
         candidate = self.get_object()
         
@@ -84,16 +261,28 @@ class CandidateViewSet(viewsets.ModelViewSet):
         # Use provided job_id or candidate's linked job
         job_id = serializer.validated_data.get('job_id') or candidate.job_posting_id
         
-        # Check if critique already exists and is processing
         critique, created = CritiqueResult.objects.get_or_create(
             candidate=candidate,
             defaults={'status': CritiqueResult.Status.PENDING}
         )
         
-        if critique.status == CritiqueResult.Status.PROCESSING:
+        # Single flight: claim (candidate, job, resume hash) for a task id
+        # chosen up front; concurrent duplicates get the in-flight id back
+        task_id = uuid()
+        lock_key = candidate_single_flight_key(candidate, job_id)
+        try:
+            in_flight = acquire_single_flight(lock_key, task_id)
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable, using status check: {e}")
+            lock_key = None
+            in_flight = (
+                critique.task_id if critique.status == CritiqueResult.Status.PROCESSING else None
+            )
+        
+        if in_flight:
             return Response({
                 'status': 'already_processing',
-                'task_id': critique.task_id,
+                'task_id': in_flight,
                 'message': 'Critique generation is already in progress.'
             }, status=status.HTTP_409_CONFLICT)
         
@@ -106,19 +295,40 @@ class CandidateViewSet(viewsets.ModelViewSet):
             critique.result_json = None
             critique.error_message = ''
             critique.completed_at = None
+            critique.stage = ''
             critique.save()
         
-        # Trigger async task
-        task = run_critique_pipeline.delay(str(candidate.id), str(job_id))
-        
-        # Store task ID
-        critique.task_id = task.id
+        # Store task ID before the task can start
+        critique.task_id = task_id
         critique.status = CritiqueResult.Status.PROCESSING
         critique.save(update_fields=['task_id', 'status'])
         
+        # Trigger async task
+        try:
+            task = run_critique_pipeline.apply_async(
+                args=[str(candidate.id), str(job_id)],
+                kwargs={'lock_key': lock_key},
+                task_id=task_id,
+                priority=fair_priority(tenant_for(request, candidate.job_posting))
+            )
+        except Exception as e:
+            # Nothing will run under this task id: free the claim so a
+            # retry isn't answered with a 409 for a task that doesn't exist
+            logger.error(f"Could not enqueue critique for candidate {candidate.id}: {e}")
+            if lock_key:
+                release_single_flight(lock_key, task_id)
+            critique.status = CritiqueResult.Status.FAILED
+            critique.error_message = 'Could not queue the critique, please retry.'
+            critique.save(update_fields=['status', 'error_message'])
+            return Response(
+                {'error': 'Critique queue unavailable, please retry.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        
         return Response({
             'status': 'processing',
             'task_id': task.id,
+            'text_ready': bool(candidate.resume_text),
             'message': 'Critique generation started.'
         }, status=status.HTTP_202_ACCEPTED)
 
@@ -131,6 +341,11 @@ class CritiqueResultViewSet(viewsets.ReadOnlyModelViewSet):
     - GET /api/critiques/ - List all critique results
     - GET /api/critiques/{id}/ - Retrieve a specific critique result
     - GET /api/critiques/by_task/{task_id}/ - Retrieve critique by Celery task ID
+    - GET /api/critiques/status/?task_ids=a,b,c - Compact status of many critiques
+    - GET /api/critiques/cache_stats/ - Result and extraction cache hit/miss counters
+    - GET /api/critiques/queue_stats/ - Celery queue depth and wait times
+    - GET /api/critiques/stream/{task_id}/ - Progress as Server-Sent Events
+      (critique_progress_stream)
     """
     queryset = CritiqueResult.objects.select_related('candidate').all()
     serializer_class = CritiqueResultSerializer
@@ -144,6 +359,71 @@ class CritiqueResultViewSet(viewsets.ReadOnlyModelViewSet):
         critique = get_object_or_404(CritiqueResult, task_id=task_id)
         serializer = self.get_serializer(critique)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'], url_path='status')
+    def batch_status(self, request):
+        """
+        Status of many critiques by task ID in one indexed query, for
+        dashboards tracking many runs at once.
+        
+        Returns {"results": {task_id: {candidate_id, status, stage,
+        overall_score}}, "missing": [task_id, ...]} with an ETag; polls
+        sending the current ETag in If-None-Match get an empty 304.
+        """
+        query = TaskStatusQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        task_ids = query.validated_data['task_ids']
+        
+        rows = CritiqueResult.objects.filter(task_id__in=task_ids).values(
+            'task_id', 'candidate_id', 'status', 'stage', 'overall_score'
+        )
+        results = {row.pop('task_id'): row for row in rows}
+        
+        return etag_response(request, {
+            'results': results,
+            'missing': [task_id for task_id in task_ids if task_id not in results],
+        })
+    
+    @action(detail=False, methods=['get'])
+    def cache_stats(self, request):
+        """Hit/miss counters of the critique result and extracted text caches."""
+        return Response(cache_stats())
+    
+    @action(detail=False, methods=['get'])
+    def queue_stats(self, request):
+        """Depth and publish-to-start latency of each Celery queue."""
+        try:
+            return Response(queue_stats())
+        except Exception as e:
+            logger.warning(f"Queue stats unavailable: {e}")
+            return Response(
+                {'error': 'Queue stats unavailable'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+
+@require_GET
+def critique_progress_stream(request, task_id):
+    """
+    Stream the progress of a critique run as Server-Sent Events.
+    
+    A plain Django view: DRF content negotiation has no text/event-stream
+    renderer. The critique is looked up once at connect; events then come
+    from Redis pub/sub (see core.progress).
+    """
+    critique = get_object_or_404(
+        CritiqueResult.objects.only('status', 'stage', 'overall_score', 'error_message'),
+        task_id=task_id
+    )
+    
+    if critique.status == CritiqueResult.Status.COMPLETED:
+        initial = {'stage': DONE, 'overall_score': critique.overall_score}
+    elif critique.status == CritiqueResult.Status.FAILED:
+        initial = {'stage': FAILED, 'error': critique.error_message}
+    else:
+        initial = {'stage': critique.stage.lower() or critique.status.lower()}
+    
+    return progress_response(task_id, initial=initial)
 
 
 # ===== Job Application ViewSet =====
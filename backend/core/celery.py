@@ -2,8 +2,13 @@
 Celery configuration for Resume Critique Agent.
 """
 
+import gc
+import logging
 import os
 from celery import Celery
+from celery.signals import task_prerun, worker_init
+
+logger = logging.getLogger(__name__)
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
@@ -17,6 +22,9 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Auto-discover tasks in all installed apps
 app.autodiscover_tasks()
 
+# Queue depth / latency signal handlers
+from . import monitoring  # noqa: E402,F401
+
 # Celery worker optimization settings
 app.conf.update(
     worker_max_tasks_per_child=50,  # Restart worker after 50 tasks to prevent memory leaks
@@ -26,6 +34,91 @@ app.conf.update(
 )
 
 
+# Set in the worker parent by preload_nlp_models, inherited by its children
+_models_preloaded = False
+# Set in each child once it has run the warm-up
+_models_warmed_up = False
+
+
+def _is_prefork_nlp_worker(worker) -> bool:
+    """
+    True for a prefork worker consuming a queue critique tasks route to
+    (the interactive nlp queue or the bulk queue).
+    
+    Thread and solo pools don't fork, and the llm/extraction workers never
+    run critique tasks, so preloading there only costs memory.
+    """
+    from celery.concurrency import get_implementation
+    from celery.concurrency.prefork import TaskPool
+    from django.conf import settings
+    
+    pool_cls = get_implementation(getattr(worker, 'pool_cls', None) or 'prefork')
+    if not (isinstance(pool_cls, type) and issubclass(pool_cls, TaskPool)):
+        return False
+    
+    routes = getattr(settings, 'CELERY_TASK_ROUTES', {})
+    model_queues = {
+        routes.get(name, {}).get('queue', 'nlp')
+        for name in ('critique.tasks.*', 'critique.tasks.critique_job_candidates')
+    }
+    return any(queue in worker.app.amqp.queues.consume_from for queue in model_queues)
+
+
+@worker_init.connect
+def preload_nlp_models(sender=None, **kwargs):
+    """
+    Load the critique NLP models in the nlp worker parent before the pool forks.
+    
+    Opt-in via CRITIQUE_PRELOAD_MODELS, and only on the prefork worker that
+    consumes critique tasks. Prefork children (including the ones recycled
+    by worker_max_tasks_per_child) then inherit the loaded models instead
+    of loading them on their first task. No inference runs in the parent:
+    each child warms up before its first task (warm_up_nlp_models).
+    """
+    global _models_preloaded
+    from django.conf import settings
+    
+    if not getattr(settings, 'CRITIQUE_PRELOAD_MODELS', False):
+        return
+    if sender is None or not _is_prefork_nlp_worker(sender):
+        return
+    
+    from critique.services import preload_models
+    preload_models(warm_up=False)
+    _models_preloaded = True
+    
+    # Move the loaded objects out of the GC's reach so collections in the
+    # children don't touch (and un-share) their pages
+    gc.freeze()
+
+
+@task_prerun.connect
+def warm_up_nlp_models(**kwargs):
+    """
+    Run the model warm-up in a prefork child, once, before its first task.
+    
+    Not in worker_process_init: the pool kills children that take longer
+    than worker_proc_alive_timeout (4 s) to finish that signal, and a cold
+    spaCy pipeline or encoder can exceed it, crash-looping the pool.
+    """
+    global _models_warmed_up
+    from django.conf import settings
+    
+    if _models_warmed_up or not _models_preloaded:
+        return
+    _models_warmed_up = True
+    if not getattr(settings, 'CRITIQUE_PRELOAD_WARM_UP', True):
+        return
+    
+    from critique.services import warm_up_models
+    try:
+        seconds = warm_up_models()
+        logger.info(f"NLP models warmed up in {seconds:.1f}s")
+    except Exception as e:
+        # The task itself pays for it instead
+        logger.warning(f"NLP model warm-up failed: {e}")
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     """Debug task to verify Celery is working."""
@@ -0,0 +1,35 @@
+"""
+ETag handling for polled JSON endpoints.
+"""
+
+import hashlib
+import json
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def payload_etag(payload) -> str:
+    """Strong ETag of a JSON-serializable payload."""
+    body = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+    return f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+
+
+def etag_response(request, payload) -> Response:
+    """
+    Response for ``payload`` carrying its ETag, or an empty 304 if the
+    client's If-None-Match already names it.
+    """
+    etag = payload_etag(payload)
+    if_none_match = request.headers.get('If-None-Match', '')
+    client_etags = {tag.strip() for tag in if_none_match.split(',')}
+
+    if etag in client_etags or '*' in client_etags:
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(payload)
+
+    response['ETag'] = etag
+    # Let caches store it, but revalidate on every poll
+    response['Cache-Control'] = 'no-cache'
+    return response
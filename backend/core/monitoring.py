@@ -0,0 +1,101 @@
+"""
+Per-queue depth and latency for the Celery queues.
+
+Publishing stamps every task message with its publish time; when a
+worker starts the task, the wait since publishing is recorded in a
+capped Redis list per queue. queue_stats() combines those samples with
+the current queue lengths (Redis broker lists).
+"""
+
+import logging
+import time
+
+from celery.signals import before_task_publish, task_prerun
+
+logger = logging.getLogger(__name__)
+
+QUEUES = ('nlp', 'bulk', 'llm', 'extraction', 'celery')
+
+LATENCY_KEY = 'celery:latency:{queue}'
+LATENCY_SAMPLES = 500
+
+PUBLISHED_AT_HEADER = 'published_at'
+
+
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    """Record when the message was sent, read back by the worker."""
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def record_queue_latency(task=None, **kwargs):
+    """Push the publish-to-start wait onto the queue's sample list."""
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None) if task else None
+    if published_at is None:
+        return
+
+    queue = (task.request.delivery_info or {}).get('routing_key') or 'celery'
+    wait = max(time.time() - published_at, 0.0)
+
+    from core.redis_client import get_redis
+    try:
+        key = LATENCY_KEY.format(queue=queue)
+        pipe = get_redis().pipeline()
+        pipe.lpush(key, round(wait, 3))
+        pipe.ltrim(key, 0, LATENCY_SAMPLES - 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not record queue latency: {e}")
+
+
+def _percentile(sorted_values, fraction: float):
+    if not sorted_values:
+        return None
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def priority_lists(queue: str) -> list:
+    """(priority, broker list) pairs holding ``queue``'s messages, highest first."""
+    from django.conf import settings
+
+    options = getattr(settings, 'CELERY_BROKER_TRANSPORT_OPTIONS', {})
+    sep = options.get('sep', '\x06\x16')
+    steps = options.get('priority_steps', [0, 3, 6, 9])
+    # kombu keeps priority 0 in the plain queue list
+    return [(step, f"{queue}{sep}{step}" if step else queue) for step in steps]
+
+
+def queue_stats(queues=QUEUES) -> dict:
+    """
+    Depth and recent wait times (seconds from publish to start) per queue.
+
+    Depth sums the queue's priority lists; ``depth_by_priority`` lists the
+    non-empty ones.
+    """
+    from core.redis_client import get_redis
+
+    client = get_redis()
+    stats = {}
+    for queue in queues:
+        lists = priority_lists(queue)
+        pipe = client.pipeline()
+        for _, name in lists:
+            pipe.llen(name)
+        lengths = pipe.execute()
+        by_priority = {
+            priority: length for (priority, _), length in zip(lists, lengths) if length
+        }
+
+        samples = sorted(float(value) for value in client.lrange(LATENCY_KEY.format(queue=queue), 0, -1))
+        stats[queue] = {
+            'depth': sum(lengths),
+            'depth_by_priority': by_priority,
+            'latency_samples': len(samples),
+            'latency_p50': _percentile(samples, 0.5),
+            'latency_p95': _percentile(samples, 0.95),
+            'latency_max': samples[-1] if samples else None,
+        }
+    return stats
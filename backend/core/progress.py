@@ -0,0 +1,225 @@
+"""
+Task progress over Redis pub/sub, streamed to browsers as Server-Sent Events.
+
+Celery tasks publish each stage transition to ``progress:{task_id}`` and
+keep the latest event under ``progress:last:{task_id}``. A stream
+subscribes to the channel, replays the latest event (so late subscribers
+start from the current stage) and forwards new events until the task
+reaches a terminal stage. Neither side touches the database per event.
+
+Streams that need authentication take a single-use ticket in the query
+string (EventSource cannot send an Authorization header, and a JWT in
+the URL would end up in access logs): issue_stream_ticket() from an
+authenticated API call, redeem_stream_ticket() when the stream opens.
+
+Each open stream holds a gunicorn thread, so a process serves at most
+PROGRESS_STREAMS_PER_PROCESS of them at once; beyond that clients get a
+503 and fall back to polling, leaving the other threads to the API.
+"""
+
+import json
+import logging
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'progress:{task_id}'
+LAST_EVENT_KEY = 'progress:last:{task_id}'
+TICKET_KEY = 'progress:ticket:{scope}:{ticket}'
+
+DONE = 'done'
+FAILED = 'failed'
+TERMINAL_STAGES = (DONE, FAILED)
+
+_stream_slots = None
+_stream_slots_lock = threading.Lock()
+
+
+def publish_progress(task_id: str, stage: str, **data):
+    """
+    Publish a stage transition of ``task_id``.
+
+    Best effort: progress is informational, so Redis errors are logged and
+    never fail the task.
+    """
+    if not task_id:
+        return
+
+    from core.redis_client import get_redis
+
+    event = json.dumps({'task_id': task_id, 'stage': stage, 'at': time.time(), **data})
+    ttl = getattr(settings, 'PROGRESS_EVENT_TTL', 3600)
+    try:
+        pipe = get_redis().pipeline()
+        pipe.set(LAST_EVENT_KEY.format(task_id=task_id), event, ex=ttl)
+        pipe.publish(CHANNEL.format(task_id=task_id), event)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not publish progress of {task_id}: {e}")
+
+
+def issue_stream_ticket(scope: str, owner) -> str:
+    """
+    Single-use ticket opening one stream of ``scope`` (e.g.
+    ``resume:{id}``) on behalf of ``owner``.
+
+    Expires after PROGRESS_TICKET_TTL seconds. Redis errors propagate.
+    """
+    from core.redis_client import get_redis
+
+    ticket = secrets.token_urlsafe(24)
+    ttl = getattr(settings, 'PROGRESS_TICKET_TTL', 30)
+    get_redis().set(TICKET_KEY.format(scope=scope, ticket=ticket), str(owner), ex=ttl)
+    return ticket
+
+
+def redeem_stream_ticket(ticket: str, scope: str):
+    """
+    Consume ``ticket`` for ``scope``.
+
+    Returns the owner it was issued to, or None if it is unknown, expired,
+    already used or issued for another scope.
+    """
+    if not ticket:
+        return None
+
+    from core.redis_client import get_redis
+
+    key = TICKET_KEY.format(scope=scope, ticket=ticket)
+    try:
+        # MULTI/EXEC: read and delete atomically so a ticket works once
+        pipe = get_redis().pipeline()
+        pipe.get(key)
+        pipe.delete(key)
+        owner, _ = pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not redeem stream ticket: {e}")
+        return None
+    return owner.decode() if owner is not None else None
+
+
+def _sse(data: str) -> bytes:
+    return f"data: {data}\n\n".encode()
+
+
+def _is_terminal(data: str) -> bool:
+    try:
+        return json.loads(data).get('stage') in TERMINAL_STAGES
+    except ValueError:
+        return False
+
+
+def stream_progress(task_id: str, initial: dict = None):
+    """
+    Yield SSE frames for ``task_id`` until it finishes.
+
+    Args:
+        task_id: Celery task id
+        initial: State read from the database at connect time; sent first
+                 if it is terminal or nothing was published yet
+
+    Sends a keep-alive comment every PROGRESS_STREAM_HEARTBEAT seconds and
+    gives up after PROGRESS_STREAM_MAX_SECONDS (EventSource reconnects and
+    picks up from the latest event).
+    """
+    from core.redis_client import get_redis
+
+    heartbeat = getattr(settings, 'PROGRESS_STREAM_HEARTBEAT', 15)
+    deadline = time.monotonic() + getattr(settings, 'PROGRESS_STREAM_MAX_SECONDS', 60)
+
+    client = get_redis()
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    try:
+        # Subscribe before reading the latest event so nothing published
+        # in between is missed
+        pubsub.subscribe(CHANNEL.format(task_id=task_id))
+        last = client.get(LAST_EVENT_KEY.format(task_id=task_id))
+        if initial is not None and (last is None or initial.get('stage') in TERMINAL_STAGES):
+            last = json.dumps({'task_id': task_id, **initial})
+        elif last is not None:
+            last = last.decode()
+
+        # Tell EventSource how long to wait before reconnecting
+        yield b'retry: 3000\n\n'
+        if last is not None:
+            yield _sse(last)
+            if _is_terminal(last):
+                return
+
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=heartbeat)
+            if message is None:
+                yield b': keep-alive\n\n'
+                continue
+
+            data = message['data'].decode()
+            yield _sse(data)
+            if _is_terminal(data):
+                return
+    except Exception as e:
+        logger.warning(f"Progress stream of {task_id} ended: {e}")
+    finally:
+        pubsub.close()
+
+
+def _get_stream_slots() -> threading.BoundedSemaphore:
+    """Lazy create the process-wide stream limit."""
+    global _stream_slots
+    with _stream_slots_lock:
+        if _stream_slots is None:
+            _stream_slots = threading.BoundedSemaphore(
+                getattr(settings, 'PROGRESS_STREAMS_PER_PROCESS', 8)
+            )
+    return _stream_slots
+
+
+class _SlotStream:
+    """
+    Iterator over stream frames that holds a stream slot until closed.
+
+    Django closes the streaming content when the response finishes, even
+    if it was never iterated, so the slot is always released.
+    """
+
+    def __init__(self, frames, slots):
+        self._frames = frames
+        self._slots = slots
+        self._released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._frames)
+
+    def close(self):
+        self._frames.close()
+        if not self._released:
+            self._released = True
+            self._slots.release()
+
+
+def progress_response(task_id: str, initial: dict = None):
+    """
+    text/event-stream response relaying stream_progress(), or a 503 when
+    this process already serves its share of streams.
+    """
+    slots = _get_stream_slots()
+    if not slots.acquire(blocking=False):
+        response = JsonResponse({'error': 'Too many progress streams, poll instead'}, status=503)
+        response['Retry-After'] = '30'
+        return response
+
+    response = StreamingHttpResponse(
+        _SlotStream(stream_progress(task_id, initial=initial), slots),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx-style proxies from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
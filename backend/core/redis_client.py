@@ -0,0 +1,20 @@
+"""
+Shared Redis connection for application-level caching and coordination.
+"""
+
+import redis
+from django.conf import settings
+
+_client = None
+
+
+def get_redis():
+    """Lazy create the process-wide Redis client (connection pooled)."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_timeout=5,
+            socket_connect_timeout=5,
+        )
+    return _client
@@ -0,0 +1,85 @@
+"""
+Fair-share Celery priorities per tenant.
+
+A tenant is the owner of the job posting a task works for, or else the
+requesting user. Every enqueue charges the tenant's usage counter in
+Redis. The task's priority drops one level for every
+CELERY_FAIR_SHARE_STEP tasks the tenant queued recently, this one
+included. The Redis transport serves priority 0 first (see
+CELERY_BROKER_TRANSPORT_OPTIONS).
+
+Priorities only order queued messages; they cannot preempt a running
+task. Whole-posting jobs, which run as one long message, are therefore
+routed to their own 'bulk' queue and worker (CELERY_TASK_ROUTES), where
+fair_priority orders one recruiter's batches behind another's. On the
+nlp queue it keeps a user firing many single critiques from starving
+everyone else.
+
+Usage is counted in fixed windows of CELERY_FAIR_SHARE_WINDOW seconds.
+The current window and the previous one are summed, so a burst keeps
+weighing on the tenant for one to two windows.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+USAGE_KEY = 'celery:usage:{tenant}:{window}'
+
+HIGHEST_PRIORITY = 0
+LOWEST_PRIORITY = 9
+
+
+def tenant_for(request=None, job_posting=None) -> str:
+    """Tenant to charge: the posting owner, else the authenticated user."""
+    owner_id = getattr(job_posting, 'user_id', None)
+    if owner_id:
+        return f"user:{owner_id}"
+
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return 'anonymous'
+
+
+def fair_priority(tenant: str, cost: int = 1) -> int:
+    """
+    Charge ``cost`` tasks to ``tenant`` and return the priority to enqueue with.
+
+    Args:
+        tenant: Key from tenant_for()
+        cost: Number of units of work the task represents (e.g. candidates
+              of a bulk critique)
+
+    Returns:
+        Celery priority between HIGHEST_PRIORITY and LOWEST_PRIORITY, based
+        on the tenant's usage including this charge, less one unit so a
+        single task from an idle tenant keeps HIGHEST_PRIORITY.
+        HIGHEST_PRIORITY if Redis is unavailable.
+    """
+    from core.redis_client import get_redis
+
+    # Every enqueue is at least one unit, even a bulk job with no candidates
+    cost = max(cost, 1)
+    window = getattr(settings, 'CELERY_FAIR_SHARE_WINDOW', 300)
+    step = getattr(settings, 'CELERY_FAIR_SHARE_STEP', 5)
+
+    current_window = int(time.time() // window)
+    current_key = USAGE_KEY.format(tenant=tenant, window=current_window)
+    previous_key = USAGE_KEY.format(tenant=tenant, window=current_window - 1)
+
+    try:
+        pipe = get_redis().pipeline()
+        pipe.incrby(current_key, cost)
+        pipe.expire(current_key, window * 2)
+        pipe.get(previous_key)
+        used, _, previous = pipe.execute()
+    except Exception as e:
+        logger.warning(f"Fair-share usage unavailable for {tenant}: {e}")
+        return HIGHEST_PRIORITY
+
+    recent = used - 1 + int(previous or 0)
+    return min(HIGHEST_PRIORITY + recent // step, LOWEST_PRIORITY)
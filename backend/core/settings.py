@@ -200,15 +200,110 @@ CSRF_TRUSTED_ORIGINS = env.list(
     default=['http://localhost:3000', 'http://localhost:5173', 'https://*.huggingface.co']
 )
 
+# ===== Redis =====
+REDIS_URL = env('REDIS_URL', default='redis://localhost:6379/0')
+
 # ===== Celery Configuration =====
-CELERY_BROKER_URL = env('REDIS_URL', default='redis://localhost:6379/0')
-CELERY_RESULT_BACKEND = env('REDIS_URL', default='redis://localhost:6379/0')
+CELERY_BROKER_URL = REDIS_URL
+CELERY_RESULT_BACKEND = REDIS_URL
 CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 600  # 10 minutes for agent tasks
+CELERY_TASK_ROUTES = {
+    # Eager resume extraction on upload; low priority, own worker
+    'critique.tasks.extract_candidate_text': {'queue': 'extraction'},
+    # Whole-posting ranking/critique runs for minutes as one message; a
+    # priority can't preempt it, so it gets its own worker and never
+    # occupies the interactive nlp slots
+    'critique.tasks.rank_job_candidates': {'queue': 'bulk'},
+    'critique.tasks.critique_job_candidates': {'queue': 'bulk'},
+    # CPU-bound spaCy / encoder work: prefork worker (CELERY_NLP_CONCURRENCY children)
+    'critique.tasks.*': {'queue': 'nlp'},
+    # Network-bound LLM calls: high-concurrency thread pool worker
+    'agents.tasks.*': {'queue': 'llm'},
+}
+# Priority lists per queue; workers take priority 0 first (see core.scheduling)
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+# Fair share: a tenant's tasks drop one priority level per STEP tasks queued
+# within the last one to two WINDOWs (seconds)
+CELERY_FAIR_SHARE_WINDOW = env.int('CELERY_FAIR_SHARE_WINDOW', default=300)
+CELERY_FAIR_SHARE_STEP = env.int('CELERY_FAIR_SHARE_STEP', default=5)
+
+# Task progress streams (core.progress): latest-event TTL, SSE keep-alive
+# interval and the longest a stream stays open before the client reconnects
+PROGRESS_EVENT_TTL = 3600
+PROGRESS_STREAM_HEARTBEAT = 15
+PROGRESS_STREAM_MAX_SECONDS = 60
+# Lifetime of the single-use tickets that authenticate a stream
+PROGRESS_TICKET_TTL = 30
+# Open streams per gunicorn process (each holds a thread); keep well under
+# --threads so API requests always have threads left. Extra clients get a
+# 503 and poll instead.
+PROGRESS_STREAMS_PER_PROCESS = env.int('PROGRESS_STREAMS_PER_PROCESS', default=8)
+
+# Most task ids accepted by the batch status endpoints
+TASK_STATUS_BATCH_MAX = 300
+
+# ===== Critique Engine =====
+# Optional JSON skills taxonomy ({"skills": [...], "aliases": {...}}); defaults to TECH_SKILLS
+CRITIQUE_SKILLS_TAXONOMY = env('CRITIQUE_SKILLS_TAXONOMY', default='')
+
+# nlp.pipe tuning for batched keyword extraction (n_process > 1 only outside prefork workers)
+CRITIQUE_SPACY_BATCH_SIZE = env.int('CRITIQUE_SPACY_BATCH_SIZE', default=32)
+CRITIQUE_SPACY_N_PROCESS = env.int('CRITIQUE_SPACY_N_PROCESS', default=1)
+
+# 'chunked' encodes whole documents in model-sized windows, 'truncate' only the start.
+# Chunked costs one encoder pass per window: compare with manage.py benchmark_embedding_modes
+CRITIQUE_EMBEDDING_MODE = env('CRITIQUE_EMBEDDING_MODE', default='truncate')
+CRITIQUE_EMBEDDING_POOLING = env('CRITIQUE_EMBEDDING_POOLING', default='mean')  # 'mean' or 'max'
+
+# Sentence encoder backend: 'torch', 'onnx' or 'onnx-int8' (see manage.py export_encoder)
+CRITIQUE_ENCODER_BACKEND = env('CRITIQUE_ENCODER_BACKEND', default='torch')
+CRITIQUE_ONNX_MODEL_DIR = env('CRITIQUE_ONNX_MODEL_DIR', default=str(BASE_DIR / 'models' / 'all-MiniLM-L6-v2-onnx'))
+
+# Redis cache of full critique results, keyed on resume + JD text and scoring version
+CRITIQUE_RESULT_CACHE_ENABLED = env.bool('CRITIQUE_RESULT_CACHE_ENABLED', default=True)
+CRITIQUE_RESULT_CACHE_TTL = env.int('CRITIQUE_RESULT_CACHE_TTL', default=7 * 24 * 3600)
+
+# Lifetime of the generate_critique single-flight key; frees keys of crashed workers.
+# 0 derives it from run_critique_pipeline's time limit, retries and retry delay
+CRITIQUE_SINGLE_FLIGHT_TTL = env.int('CRITIQUE_SINGLE_FLIGHT_TTL', default=0)
+
+# Cascade ranking: full NER + semantic analysis only for the prefilter's top K / above threshold
+CRITIQUE_CASCADE_TOP_K = env.int('CRITIQUE_CASCADE_TOP_K', default=50)
+CRITIQUE_CASCADE_THRESHOLD = env.float('CRITIQUE_CASCADE_THRESHOLD', default=None)
+
+# Candidates per batch in POST /api/jobs/{id}/critique_all/
+CRITIQUE_BULK_CHUNK_SIZE = env.int('CRITIQUE_BULK_CHUNK_SIZE', default=25)
+
+# Unix socket of the local inference server (manage.py run_inference_server); empty = in-process models
+CRITIQUE_INFERENCE_SOCKET = env('CRITIQUE_INFERENCE_SOCKET', default='')
+CRITIQUE_INFERENCE_TIMEOUT = env.float('CRITIQUE_INFERENCE_TIMEOUT', default=30)
+
+# Resume PDF extraction budgets; the sandbox runs pdfplumber in a memory-capped subprocess
+CRITIQUE_PDF_SANDBOX = env.bool('CRITIQUE_PDF_SANDBOX', default=True)
+CRITIQUE_PDF_MAX_PAGES = env.int('CRITIQUE_PDF_MAX_PAGES', default=50)
+CRITIQUE_PDF_MAX_CHARS = env.int('CRITIQUE_PDF_MAX_CHARS', default=100000)
+CRITIQUE_PDF_TIMEOUT = env.float('CRITIQUE_PDF_TIMEOUT', default=60)  # seconds
+CRITIQUE_PDF_MEMORY_MB = env.int('CRITIQUE_PDF_MEMORY_MB', default=1024)
+# 'pdfplumber' (layout analysis), 'pypdf' (text layer only) or 'adaptive' (probe, then pick).
+# Check adaptive's agreement on your own resumes with manage.py benchmark_pdf_extractors first.
+CRITIQUE_PDF_EXTRACTOR = env('CRITIQUE_PDF_EXTRACTOR', default='pdfplumber')
+# Process pool for per-page extraction of long PDFs (1 = serial)
+CRITIQUE_PDF_WORKERS = env.int('CRITIQUE_PDF_WORKERS', default=1)
+CRITIQUE_PDF_PARALLEL_MIN_PAGES = env.int('CRITIQUE_PDF_PARALLEL_MIN_PAGES', default=8)
+
+# Load spaCy and the encoder in the prefork nlp worker's parent so its children inherit
+# them; the warm-up inference runs in each child before its first task
+CRITIQUE_PRELOAD_MODELS = env.bool('CRITIQUE_PRELOAD_MODELS', default=False)
+CRITIQUE_PRELOAD_WARM_UP = env.bool('CRITIQUE_PRELOAD_WARM_UP', default=True)
 
 # ===== LangChain / LLM Configuration =====
 OPENAI_API_KEY = env('OPENAI_API_KEY', default='')
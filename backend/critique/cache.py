@@ -0,0 +1,146 @@
+"""
+Content-addressed caches for the critique pipeline.
+
+Critique results are keyed on hash(resume_text) + hash(jd_text) + the
+scoring version, so re-running a critique on unchanged texts (a
+re-triggered generate_critique, the same PDF uploaded twice) is served
+from Redis without loading spaCy or the sentence encoder.
+
+Extracted resume text is looked up by the SHA-256 of the uploaded file:
+any Candidate that already holds text for the same PDF supplies it, so
+the same resume sent to several postings is only extracted once.
+"""
+
+import json
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when feedback or scoring logic changes in a way that affects results
+SCORING_VERSION = 1
+
+KEY_PREFIX = 'critique:result'
+HITS_KEY = 'critique:cache:hits'
+MISSES_KEY = 'critique:cache:misses'
+EXTRACTION_HITS_KEY = 'critique:extraction:hits'
+EXTRACTION_MISSES_KEY = 'critique:extraction:misses'
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_scoring_version() -> str:
+    """Scoring logic version combined with the feature models version."""
+    from .services import get_features_version
+    return f"{SCORING_VERSION}-{get_features_version()}"
+
+
+def critique_cache_key(resume_text: str, jd_text: str) -> str:
+    return f"{KEY_PREFIX}:{get_scoring_version()}:{_text_hash(resume_text)}:{_text_hash(jd_text)}"
+
+
+def _enabled() -> bool:
+    return getattr(settings, 'CRITIQUE_RESULT_CACHE_ENABLED', True)
+
+
+def get_cached_critique(resume_text: str, jd_text: str) -> Optional[dict]:
+    """
+    Return the cached critique_to_dict() output, or None on a miss.
+
+    Redis errors are logged and treated as a miss.
+    """
+    if not _enabled():
+        return None
+
+    from core.redis_client import get_redis
+
+    try:
+        client = get_redis()
+        payload = client.get(critique_cache_key(resume_text, jd_text))
+        client.incr(HITS_KEY if payload is not None else MISSES_KEY)
+    except Exception as e:
+        logger.warning(f"Critique cache lookup failed: {e}")
+        return None
+
+    return json.loads(payload) if payload is not None else None
+
+
+def set_cached_critique(resume_text: str, jd_text: str, result: dict):
+    """
+    Store a critique_to_dict() output with the configured TTL.
+
+    Degraded results (a component fell back to a neutral score) are not
+    stored, so the next run of the same texts scores them properly.
+    """
+    if not _enabled():
+        return
+    if result.get('scores', {}).get('degraded'):
+        logger.info("Not caching degraded critique result")
+        return
+
+    from core.redis_client import get_redis
+
+    try:
+        get_redis().set(
+            critique_cache_key(resume_text, jd_text),
+            json.dumps(result),
+            ex=getattr(settings, 'CRITIQUE_RESULT_CACHE_TTL', 7 * 24 * 3600),
+        )
+    except Exception as e:
+        logger.warning(f"Critique cache store failed: {e}")
+
+
+def get_extracted_text(resume_sha256: str) -> Optional[Tuple[str, bool]]:
+    """
+    Text already extracted from a PDF with this content hash.
+
+    Returns (resume_text, resume_truncated) or None on a miss.
+    """
+    from api.models import Candidate
+    from core.redis_client import get_redis
+
+    if not resume_sha256:
+        return None
+
+    match = (
+        Candidate.objects
+        .filter(resume_sha256=resume_sha256)
+        .exclude(resume_text='')
+        .values_list('resume_text', 'resume_truncated')
+        .first()
+    )
+
+    try:
+        get_redis().incr(EXTRACTION_HITS_KEY if match else EXTRACTION_MISSES_KEY)
+    except Exception as e:
+        logger.warning(f"Extraction cache counter update failed: {e}")
+
+    return match
+
+
+def _counter_stats(hits_key: str, misses_key: str) -> dict:
+    from core.redis_client import get_redis
+
+    hits, misses = get_redis().mget(hits_key, misses_key)
+    hits = int(hits or 0)
+    misses = int(misses or 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters since the counters were last reset."""
+    stats = _counter_stats(HITS_KEY, MISSES_KEY)
+    stats['extraction'] = _counter_stats(EXTRACTION_HITS_KEY, EXTRACTION_MISSES_KEY)
+    return stats
@@ -0,0 +1,129 @@
+"""
+Sentence encoder backends for CPU inference.
+
+- torch: the reference sentence-transformers model (full precision)
+- onnx: the same transformer exported to ONNX and run with ONNX Runtime
+- onnx-int8: the ONNX export with dynamically int8-quantized weights
+
+The ONNX variants are produced offline by ``manage.py export_encoder`` and
+need the optional requirements-onnx.txt; without ONNX Runtime installed,
+resolve_backend() falls back to torch.
+All backends expose the subset of the SentenceTransformer interface that
+the critique services use: ``encode()``, ``tokenizer`` and
+``max_seq_length``.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ('torch', 'onnx', 'onnx-int8')
+
+ONNX_MODEL_FILES = {
+    'onnx': 'model.onnx',
+    'onnx-int8': 'model-int8.onnx',
+}
+
+# Written next to the exported models by export_encoder
+ENCODER_CONFIG_FILE = 'encoder_config.json'
+
+# Resume/job pairs used to validate and benchmark the backends
+DEFAULT_CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'encoder_corpus.json')
+
+
+class OnnxEncoder:
+    """
+    Mean-pooled, L2-normalized sentence embeddings from an ONNX export.
+
+    Reproduces the Transformer -> Pooling(mean) -> Normalize stack of
+    all-MiniLM-L6-v2 on top of ONNX Runtime.
+    """
+
+    def __init__(self, model_dir: str, model_file: str):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model_dir, ENCODER_CONFIG_FILE)) as fh:
+            config = json.load(fh)
+
+        self.max_seq_length = config['max_seq_length']
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            sess_options=options,
+            providers=['CPUExecutionProvider'],
+        )
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+    def encode(self, sentences: List[str], batch_size: int = 32, **kwargs):
+        import numpy as np
+
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size=batch_size)[0]
+
+        # Sort by length so batches need little padding, like SentenceTransformer
+        order = sorted(range(len(sentences)), key=lambda i: -len(sentences[i]))
+        embeddings = [None] * len(sentences)
+
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            features = self.tokenizer(
+                [sentences[i] for i in batch_indices],
+                padding=True,
+                truncation=True,
+                max_length=self.max_seq_length,
+                return_tensors='np',
+            )
+            inputs = {
+                name: value.astype(np.int64)
+                for name, value in features.items()
+                if name in self._input_names
+            }
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = features['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+            for index, embedding in zip(batch_indices, pooled):
+                embeddings[index] = embedding
+
+        if not embeddings:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(embeddings)
+
+
+def resolve_backend(backend: str) -> str:
+    """
+    The backend that will actually run: ONNX backends fall back to torch
+    when onnxruntime isn't installed. Checked without importing it.
+    """
+    if backend in ONNX_MODEL_FILES and importlib.util.find_spec('onnxruntime') is None:
+        return 'torch'
+    return backend
+
+
+def load_encoder(backend: str, model_name: str, onnx_model_dir: str):
+    """Load the sentence encoder for a backend name."""
+    if backend == 'torch':
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+
+    if backend in ONNX_MODEL_FILES:
+        return OnnxEncoder(onnx_model_dir, ONNX_MODEL_FILES[backend])
+
+    raise ValueError(f"Unknown encoder backend '{backend}', expected one of {BACKENDS}")
+
+
+def load_corpus(path: str = DEFAULT_CORPUS_PATH) -> List[dict]:
+    """Load a list of {"resume": ..., "job": ...} pairs."""
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
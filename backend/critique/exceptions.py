@@ -0,0 +1,27 @@
+"""
+Exceptions raised by the critique engine.
+"""
+
+
+class CritiqueError(Exception):
+    """Base class for critique engine errors."""
+
+
+class NonRetryableError(CritiqueError):
+    """A failure that retrying the task cannot fix."""
+
+
+class InsufficientTextError(NonRetryableError):
+    """The resume yields too little text to critique."""
+
+
+class ExtractionBudgetExceeded(NonRetryableError):
+    """PDF extraction hit a budget before producing usable text."""
+
+    def __init__(self, reason: str, message: str = ''):
+        self.reason = reason
+        super().__init__(message or f"PDF extraction exceeded its {reason} budget")
+
+
+class PdfParseError(NonRetryableError):
+    """The PDF extractor crashed on the file itself (malformed or hostile PDF)."""
@@ -0,0 +1,237 @@
+"""
+Local inference server with dynamic micro-batching.
+
+One long-lived process owns spaCy and the sentence encoder and serves
+``encode`` / ``keywords`` requests over a Unix socket. Requests that
+arrive within a short window are coalesced into a single model call, so
+concurrent Celery children and web processes share one copy of the
+models and the encoder runs on full batches.
+
+Run it with ``manage.py run_inference_server``. When
+CRITIQUE_INFERENCE_SOCKET is set, critique.services routes encoding and
+keyword extraction to the server and falls back to in-process models
+when the server is not running.
+
+Wire format: 4-byte big-endian length followed by a JSON body, both ways.
+    request:  {"op": "encode" | "keywords" | "version", "texts": [...]}
+    response: {"result": [...], "version": "..."} or {"error": "..."}
+
+``version`` is the server's own features version (the models and
+settings it runs), so features it produced are fingerprinted with it
+rather than with the client's configuration.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct('>I')
+
+
+class InferenceUnavailable(Exception):
+    """The inference server could not be reached or failed the request."""
+
+
+def _send_message(sock, payload: dict):
+    body = json.dumps(payload).encode('utf-8')
+    sock.sendall(_HEADER.pack(len(body)) + body)
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed mid-message")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _recv_message(sock) -> dict:
+    (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return json.loads(_recv_exact(sock, size))
+
+
+# ===== Server =====
+
+class MicroBatcher:
+    """
+    Coalesces concurrent requests for one operation into batched calls.
+
+    The first pending request opens a window of ``max_wait`` seconds;
+    everything queued until the window closes, or until ``max_batch``
+    texts are collected, runs as one call of ``process``.
+    """
+
+    def __init__(self, name: str, process: Callable[[List[str]], list],
+                 max_batch: int, max_wait: float):
+        self.name = name
+        self.process = process
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, texts: List[str]) -> Future:
+        future = Future()
+        self._queue.put((texts, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        size = len(batch[0][0])
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[0])
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            texts = [text for request_texts, _ in batch for text in request_texts]
+
+            try:
+                results = self.process(texts)
+            except Exception as e:
+                logger.exception(f"Batched {self.name} failed")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            logger.debug(f"{self.name}: {len(batch)} requests, {len(texts)} texts in one call")
+            offset = 0
+            for request_texts, future in batch:
+                future.set_result(results[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """Serves requests on one client connection until it closes."""
+
+    def handle(self):
+        while True:
+            try:
+                message = _recv_message(self.request)
+            except (ConnectionError, struct.error):
+                return
+
+            version = self.server.features_version
+            if message.get('op') == 'version':
+                _send_message(self.request, {'result': version, 'version': version})
+                continue
+
+            batcher = self.server.batchers.get(message.get('op'))
+            if batcher is None:
+                _send_message(self.request, {'error': f"Unknown op {message.get('op')!r}"})
+                continue
+
+            try:
+                result = batcher.submit(message.get('texts', [])).result()
+                _send_message(self.request, {'result': result, 'version': version})
+            except Exception as e:
+                _send_message(self.request, {'error': str(e)})
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Listen backlog; every worker process may connect at once
+    request_queue_size = 128
+
+    def __init__(self, socket_path: str, max_batch: int = 64, max_wait_ms: float = 10):
+        from .services import (
+            _encode_texts_local, _extract_keywords_batch_local, local_features_version, preload_models,
+        )
+
+        preload_models()
+        self.features_version = local_features_version()
+
+        def encode(texts):
+            return [embedding.tolist() for embedding in _encode_texts_local(texts)]
+
+        def keywords(texts):
+            # Fail the request rather than answer with partial keywords;
+            # the client falls back to its own models
+            return [
+                sorted(keyword_set)
+                for keyword_set in _extract_keywords_batch_local(texts, strict=True)
+            ]
+
+        max_wait = max_wait_ms / 1000
+        self.batchers = {
+            'encode': MicroBatcher('encode', encode, max_batch, max_wait),
+            'keywords': MicroBatcher('keywords', keywords, max_batch, max_wait),
+        }
+
+        # Remove a socket left behind by a previous run
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _RequestHandler)
+
+
+# ===== Client =====
+
+class InferenceClient:
+    """Blocking client; opens one short-lived connection per request."""
+
+    def __init__(self, socket_path: str, timeout: float = 30):
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def _request(self, op: str, texts: List[str]) -> dict:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.socket_path)
+                _send_message(sock, {'op': op, 'texts': texts})
+                response = _recv_message(sock)
+        except (OSError, ConnectionError, struct.error, ValueError) as e:
+            raise InferenceUnavailable(str(e)) from e
+
+        if 'error' in response:
+            raise InferenceUnavailable(response['error'])
+        return response
+
+    def encode(self, texts: List[str]) -> Tuple[List[List[float]], str]:
+        """Embeddings and the features version of the server that made them."""
+        response = self._request('encode', texts)
+        return response['result'], response['version']
+
+    def extract_keywords(self, texts: List[str]) -> List[List[str]]:
+        return self._request('keywords', texts)['result']
+
+    def version(self) -> str:
+        """The server's features version."""
+        return self._request('version', [])['result']
+
+
+def get_inference_client() -> Optional[InferenceClient]:
+    """Client for the configured inference server, or None if it isn't running."""
+    from django.conf import settings
+
+    socket_path = getattr(settings, 'CRITIQUE_INFERENCE_SOCKET', '')
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+    return InferenceClient(
+        socket_path, timeout=getattr(settings, 'CRITIQUE_INFERENCE_TIMEOUT', 30)
+    )
@@ -0,0 +1,108 @@
+"""
+Single-flight guard for critique runs.
+
+generate_critique claims a Redis key for (candidate, job, resume content
+hash) with ``SET NX EX`` before it enqueues anything. The key holds the
+task id chosen up front, so a duplicate request reads back the in-flight
+task id instead of queueing a second pipeline. The task refreshes the
+key at the start of every attempt and releases it when it finishes; the
+TTL frees keys left behind by crashed workers. It covers the task's
+worst case (every attempt running to the hard time limit, plus the retry
+delays), so a key never expires under a run that is still retrying.
+"""
+
+import logging
+from typing import Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'critique:inflight'
+
+# Delete the key only if it still holds our task id
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+# Reset the TTL only if the key still holds our task id
+_REFRESH_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def single_flight_ttl() -> int:
+    """
+    Key lifetime: CRITIQUE_SINGLE_FLIGHT_TTL, or when unset (0) the worst
+    case run of run_critique_pipeline from its time limit and retries.
+    """
+    ttl = getattr(settings, 'CRITIQUE_SINGLE_FLIGHT_TTL', 0)
+    if ttl:
+        return ttl
+
+    from .tasks import run_critique_pipeline
+
+    time_limit = run_critique_pipeline.time_limit or getattr(settings, 'CELERY_TASK_TIME_LIMIT', 600)
+    attempts = run_critique_pipeline.max_retries + 1
+    backoff = run_critique_pipeline.default_retry_delay * run_critique_pipeline.max_retries
+    # Margin for queue wait ahead of the first attempt
+    return time_limit * attempts + backoff + 300
+
+
+def single_flight_key(candidate_id, job_id, content_hash: str) -> str:
+    return f"{KEY_PREFIX}:{candidate_id}:{job_id}:{content_hash}"
+
+
+def candidate_single_flight_key(candidate, job_id) -> str:
+    """Key of a critique of ``candidate``'s current resume against ``job_id``."""
+    return single_flight_key(
+        candidate.id, job_id, candidate.resume_sha256 or candidate.resume_file.name
+    )
+
+
+def acquire_single_flight(key: str, task_id: str) -> Optional[str]:
+    """
+    Claim ``key`` for ``task_id``.
+
+    Returns None if the claim succeeded, otherwise the task id of the run
+    already in flight. Redis errors propagate to the caller.
+    """
+    from core.redis_client import get_redis
+
+    client = get_redis()
+    ttl = single_flight_ttl()
+
+    while True:
+        if client.set(key, task_id, nx=True, ex=ttl):
+            return None
+        holder = client.get(key)
+        # None: the holder released between our SET and GET, try again
+        if holder is not None:
+            return holder.decode()
+
+
+def release_single_flight(key: str, task_id: str):
+    """Release ``key`` if ``task_id`` still holds it."""
+    from core.redis_client import get_redis
+
+    try:
+        get_redis().eval(_RELEASE_SCRIPT, 1, key, task_id)
+    except Exception as e:
+        # The TTL frees the key eventually
+        logger.warning(f"Could not release single-flight key {key}: {e}")
+
+
+def refresh_single_flight(key: str, task_id: str):
+    """Restart the TTL of ``key`` if ``task_id`` still holds it."""
+    from core.redis_client import get_redis
+
+    try:
+        get_redis().eval(_REFRESH_SCRIPT, 1, key, task_id, single_flight_ttl())
+    except Exception as e:
+        logger.warning(f"Could not refresh single-flight key {key}: {e}")
@@ -0,0 +1,134 @@
+"""
+Benchmark truncated against chunked document encoding.
+
+Usage:
+    python manage.py benchmark_embedding_modes --resumes-dir fixtures/resumes
+
+Encodes resumes and their job descriptions in 'truncate' mode and in
+'chunked' mode (every chunk, pooled), and reports encoder time per
+resume, chunks encoded per resume and how far the truncated resume/job
+similarity is from the whole-document one. 'truncate' stays the default
+until chunked matches its time per resume. Resumes come from
+--resumes-dir (.txt files, or .pdf files run through the extractor) or
+are built from the encoder corpus at realistic resume length.
+"""
+
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from critique.encoders import DEFAULT_CORPUS_PATH, load_corpus
+
+HEADERS = [
+    'Professional Summary', 'Work Experience', 'Education', 'Technical Skills',
+    'Projects', 'Certifications', 'Awards', 'Volunteering',
+]
+
+
+def _build_resumes(count: int) -> list:
+    """(resume, job) pairs of roughly 400-900 word resumes from the corpus."""
+    corpus = load_corpus(DEFAULT_CORPUS_PATH)
+    sentences = [s for pair in corpus for s in pair['resume'].split('. ')]
+    rng = random.Random(0)
+    pairs = []
+    for index in range(count):
+        pair = corpus[index % len(corpus)]
+        own = pair['resume'].split('. ')
+        lines = ['Jane Doe', 'jane@example.com', '']
+        for header in rng.sample(HEADERS, 6):
+            lines.append(header)
+            # Mostly the pair's own sentences, padded with the rest of the corpus
+            lines.extend(
+                rng.choice(own) if rng.random() < 0.6 else rng.choice(sentences)
+                for _ in range(rng.randint(4, 10))
+            )
+            lines.append('')
+        pairs.append(('\n'.join(lines), pair['job']))
+    return pairs
+
+
+def _load_resumes(directory: str) -> list:
+    """(resume, job) pairs of the files in ``directory``, matched to corpus jobs."""
+    from critique.sandbox import extract_resume_text
+
+    jobs = [pair['job'] for pair in load_corpus(DEFAULT_CORPUS_PATH)]
+    pairs = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if name.endswith('.txt'):
+            with open(path, encoding='utf-8') as fh:
+                text = fh.read()
+        elif name.endswith('.pdf'):
+            with open(path, 'rb') as fh:
+                text = extract_resume_text(fh).text
+        else:
+            continue
+        pairs.append((text, jobs[len(pairs) % len(jobs)]))
+    return pairs
+
+
+class Command(BaseCommand):
+    help = "Compare encoder time and scores of truncated and chunked encoding"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=50, help="Synthetic resumes to build")
+        parser.add_argument('--resumes-dir', default='', help="Directory of .txt/.pdf resumes to use instead")
+        parser.add_argument('--repeats', type=int, default=3)
+
+    def _run(self, pairs, repeats, **overrides):
+        """Seconds per resume and resume/job similarities under ``overrides``."""
+        from critique.services import _encode_texts_local, cosine_similarity
+
+        texts = [text for pair in pairs for text in pair]
+        with override_settings(**overrides):
+            # Warm-up run, not timed
+            embeddings = _encode_texts_local(texts)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                _encode_texts_local(texts)
+            elapsed = (time.perf_counter() - start) / (repeats * len(pairs))
+
+        similarities = [
+            cosine_similarity(embeddings[index], embeddings[index + 1])
+            for index in range(0, len(texts), 2)
+        ]
+        return elapsed, similarities
+
+    def handle(self, *args, **options):
+        from critique.services import chunk_text, get_sentence_model
+
+        if options['resumes_dir']:
+            pairs = _load_resumes(options['resumes_dir'])
+        else:
+            pairs = _build_resumes(options['resumes'])
+        if not pairs:
+            raise CommandError("No resumes to encode")
+
+        model = get_sentence_model()
+        window = model.max_seq_length - 2
+        counts = sorted(len(chunk_text(resume, model.tokenizer, window)) for resume, _ in pairs)
+        words = sum(len(resume.split()) for resume, _ in pairs) / len(pairs)
+        self.stdout.write(
+            f"{len(pairs)} resumes, {words:.0f} words and {sum(counts) / len(counts):.1f} "
+            f"chunks on average (median {counts[len(counts) // 2]}, max {counts[-1]})"
+        )
+
+        repeats = options['repeats']
+        truncate_seconds, truncated = self._run(pairs, repeats, CRITIQUE_EMBEDDING_MODE='truncate')
+        chunked_seconds, whole = self._run(pairs, repeats, CRITIQUE_EMBEDDING_MODE='chunked')
+
+        self.stdout.write(f"{'mode':>10} {'ms/resume':>10} {'chunks':>7}")
+        self.stdout.write(f"{'truncate':>10} {truncate_seconds * 1000:>10.1f} {1.0:>7.1f}")
+        self.stdout.write(
+            f"{'chunked':>10} {chunked_seconds * 1000:>10.1f} {sum(counts) / len(counts):>7.1f}"
+        )
+
+        deltas = [abs(score - ref) for score, ref in zip(truncated, whole)]
+        self.stdout.write(
+            f"Chunked costs {chunked_seconds / truncate_seconds:.2f}x truncate; truncation moves "
+            f"the resume/job similarity by {sum(deltas) / len(deltas):.3f} on average "
+            f"(max {max(deltas):.3f})"
+        )
@@ -0,0 +1,82 @@
+"""
+Benchmark encoder backends: throughput and resident memory.
+
+Usage:
+    python manage.py benchmark_encoders --repeats 20
+
+Each backend runs in a fresh process so its RSS is measured in isolation.
+The ONNX backends need a prior ``manage.py export_encoder``.
+"""
+
+import multiprocessing
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from critique.encoders import BACKENDS, DEFAULT_CORPUS_PATH, load_corpus
+
+
+def _measure_backend(backend, texts, repeats, results):
+    """Runs in a spawned child process."""
+    import django
+    django.setup()
+
+    from critique.encoders import load_encoder
+    from critique.services import SENTENCE_MODEL_NAME, resident_memory_mb
+
+    try:
+        start = time.perf_counter()
+        encoder = load_encoder(backend, SENTENCE_MODEL_NAME, settings.CRITIQUE_ONNX_MODEL_DIR)
+        load_seconds = time.perf_counter() - start
+
+        # Warm-up run, not timed
+        encoder.encode(texts)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            encoder.encode(texts)
+        elapsed = time.perf_counter() - start
+
+        results.put({
+            'backend': backend,
+            'load_seconds': load_seconds,
+            'encodes_per_sec': repeats * len(texts) / elapsed,
+            'rss_mb': resident_memory_mb(),
+        })
+    except Exception as e:
+        results.put({'backend': backend, 'error': str(e)})
+
+
+class Command(BaseCommand):
+    help = "Measure encodes/sec and RSS for each sentence encoder backend"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=BACKENDS)
+        parser.add_argument('--corpus', default=DEFAULT_CORPUS_PATH)
+        parser.add_argument('--repeats', type=int, default=20)
+
+    def handle(self, *args, **options):
+        corpus = load_corpus(options['corpus'])
+        texts = [pair['resume'] for pair in corpus] + [pair['job'] for pair in corpus]
+
+        context = multiprocessing.get_context('spawn')
+        self.stdout.write(f"{'backend':>10} {'load s':>8} {'encodes/s':>10} {'RSS MB':>8}")
+
+        for backend in options['backends']:
+            results = context.Queue()
+            process = context.Process(
+                target=_measure_backend,
+                args=(backend, texts, options['repeats'], results),
+            )
+            process.start()
+            result = results.get()
+            process.join()
+
+            if 'error' in result:
+                self.stdout.write(f"{backend:>10} failed: {result['error']}")
+                continue
+            self.stdout.write(
+                f"{backend:>10} {result['load_seconds']:>8.1f} "
+                f"{result['encodes_per_sec']:>10.1f} {result['rss_mb']:>8.0f}"
+            )
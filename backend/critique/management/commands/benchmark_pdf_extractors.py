@@ -0,0 +1,85 @@
+"""
+Benchmark PDF extractors on a directory of resume PDFs.
+
+Usage:
+    python manage.py benchmark_pdf_extractors /path/to/resume_pdfs
+
+Reports pages/sec and docs/sec for each extractor, the adaptive mode's
+choices, and how closely each extractor's text agrees with pdfplumber's.
+Agreement is the word-level difflib ratio against the pdfplumber text.
+"""
+
+import difflib
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from critique.parser import EXTRACTORS, extract_text_from_pdf, probe_pdf, select_extractor
+
+REFERENCE_EXTRACTOR = 'pdfplumber'
+
+
+def _agreement(text: str, reference: str) -> float:
+    return difflib.SequenceMatcher(None, text.split(), reference.split(), autojunk=False).ratio()
+
+
+class Command(BaseCommand):
+    help = "Compare throughput and text agreement of the PDF extractors"
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help="Directory of PDF fixtures")
+        parser.add_argument('--repeats', type=int, default=3)
+        parser.add_argument(
+            '--agreement-threshold', type=float, default=0.9,
+            help="Agreement ratio counted as a match"
+        )
+
+    def handle(self, *args, **options):
+        paths = sorted(Path(options['directory']).glob('*.pdf'))
+        if not paths:
+            raise CommandError(f"No PDFs found in {options['directory']}")
+
+        # Probe once for page counts and the adaptive choice
+        page_counts = {}
+        choices = Counter()
+        for path in paths:
+            with open(path, 'rb') as fh:
+                probe = probe_pdf(fh)
+            page_counts[path] = probe.page_count
+            choices[select_extractor(probe)] += 1
+        total_pages = sum(page_counts.values())
+
+        self.stdout.write(f"{len(paths)} PDFs, {total_pages} pages")
+        self.stdout.write(
+            "Adaptive picks: " + ", ".join(f"{name}={count}" for name, count in sorted(choices.items()))
+        )
+
+        texts = {}
+        self.stdout.write(
+            f"{'extractor':>10} {'docs/s':>8} {'pages/s':>8} {'agreement':>10} {'matches':>8}"
+        )
+        # Reference first, so the others can be compared against it
+        extractors = [REFERENCE_EXTRACTOR] + [e for e in EXTRACTORS if e != REFERENCE_EXTRACTOR]
+
+        for extractor in extractors:
+            texts[extractor] = {}
+            start = time.perf_counter()
+            for _ in range(options['repeats']):
+                for path in paths:
+                    texts[extractor][path] = extract_text_from_pdf(str(path), extractor=extractor)
+            elapsed = time.perf_counter() - start
+
+            ratios = [
+                _agreement(texts[extractor][path], texts[REFERENCE_EXTRACTOR][path])
+                for path in paths
+            ]
+            matches = sum(1 for ratio in ratios if ratio >= options['agreement_threshold'])
+            runs = options['repeats']
+            self.stdout.write(
+                f"{extractor:>10} {runs * len(paths) / elapsed:>8.2f} "
+                f"{runs * total_pages / elapsed:>8.1f} "
+                f"{sum(ratios) / len(ratios):>10.3f} "
+                f"{matches / len(paths):>8.0%}"
+            )
@@ -0,0 +1,153 @@
+"""
+Benchmark the section splitter against the previous per-pattern version.
+
+Usage:
+    python manage.py benchmark_section_splitter --repeats 200
+
+Builds resumes from the encoder corpus with the usual section headers,
+checks extract_sections() and analyze_formatting() give the same output
+as the old implementations, then times both, plus split + formatting
+against the old extract_sections + analyze_formatting pair.
+"""
+
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from critique.encoders import DEFAULT_CORPUS_PATH, load_corpus
+from critique.parser import extract_sections, split_sections
+from critique.services import analyze_formatting
+
+HEADERS = [
+    'Professional Summary', 'Work Experience', 'Education', 'Technical Skills',
+    'Projects', 'Certifications', 'Awards', 'Volunteering',
+]
+
+
+def reference_extract_sections(text: str) -> dict:
+    """The per-line, per-pattern implementation extract_sections replaced."""
+    sections = {}
+    section_patterns = [
+        (r'(?i)^(summary|professional\s+summary|objective|profile)', 'summary'),
+        (r'(?i)^(experience|work\s+experience|employment|professional\s+experience)', 'experience'),
+        (r'(?i)^(education|academic|qualifications)', 'education'),
+        (r'(?i)^(skills|technical\s+skills|core\s+competencies|technologies)', 'skills'),
+        (r'(?i)^(projects|personal\s+projects|portfolio)', 'projects'),
+        (r'(?i)^(certifications?|licenses?|credentials)', 'certifications'),
+        (r'(?i)^(awards?|achievements?|honors?)', 'awards'),
+    ]
+
+    current_section = 'header'
+    current_content = []
+    for line in text.split('\n'):
+        line_stripped = line.strip()
+        matched_section = None
+        for pattern, section_name in section_patterns:
+            if re.match(pattern, line_stripped):
+                matched_section = section_name
+                break
+
+        if matched_section:
+            if current_content:
+                sections[current_section] = '\n'.join(current_content).strip()
+            current_section = matched_section
+            current_content = []
+        else:
+            current_content.append(line)
+
+    if current_content:
+        sections[current_section] = '\n'.join(current_content).strip()
+    return sections
+
+
+def reference_analyze_formatting(resume_text: str) -> list:
+    """The analyze_formatting that rescanned the text for every check."""
+    notes = []
+    patterns = {
+        'summary': r'(?i)(summary|objective|profile)',
+        'experience': r'(?i)(experience|employment|work history)',
+        'education': r'(?i)(education|academic)',
+        'skills': r'(?i)(skills|competencies|technologies)',
+    }
+    for section, pattern in patterns.items():
+        if not re.search(pattern, resume_text):
+            notes.append(f"Consider adding a clear '{section.title()}' section")
+
+    if '•' not in resume_text and '-' not in resume_text:
+        notes.append("Use bullet points to improve readability and ATS parsing")
+
+    if not re.search(r'\d+%|\$\d+|\d+\s*(years?|months?)', resume_text):
+        notes.append("Add quantifiable achievements (percentages, dollar amounts, timeframes)")
+
+    action_verbs = ['achieved', 'developed', 'led', 'managed', 'created', 'implemented',
+                    'increased', 'reduced', 'improved', 'designed', 'built', 'launched']
+    has_action_verbs = any(
+        resume_text.lower().startswith(verb) or f'\n{verb}' in resume_text.lower()
+        for verb in action_verbs
+    )
+    if not has_action_verbs:
+        notes.append("Start bullet points with strong action verbs")
+
+    return notes if notes else ["Resume formatting appears well-structured"]
+
+
+def _build_resumes(count: int) -> list:
+    corpus = load_corpus(DEFAULT_CORPUS_PATH)
+    rng = random.Random(0)
+    resumes = []
+    for index in range(count):
+        sentences = corpus[index % len(corpus)]['resume'].split('. ')
+        lines = ['Jane Doe', 'jane@example.com']
+        for header in rng.sample(HEADERS, 5):
+            lines.append(header)
+            lines.extend(rng.choice(sentences) for _ in range(rng.randint(3, 12)))
+            lines.append('')
+        resumes.append('\n'.join(lines))
+    return resumes
+
+
+class Command(BaseCommand):
+    help = "Check the section splitter matches the old version and time both"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resumes', type=int, default=50)
+        parser.add_argument('--repeats', type=int, default=200)
+
+    def _time(self, func, resumes, repeats):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for text in resumes:
+                func(text)
+        return (time.perf_counter() - start) / (repeats * len(resumes)) * 1e6
+
+    def handle(self, *args, **options):
+        resumes = _build_resumes(options['resumes'])
+
+        for text in resumes:
+            if extract_sections(text) != reference_extract_sections(text):
+                raise CommandError(f"Section maps differ for:\n{text}")
+            if analyze_formatting(text, sections=split_sections(text)) != reference_analyze_formatting(text):
+                raise CommandError(f"Formatting notes differ for:\n{text}")
+        self.stdout.write(f"Identical sections and formatting notes on {len(resumes)} resumes")
+
+        repeats = options['repeats']
+        old_split = self._time(reference_extract_sections, resumes, repeats)
+        new_split = self._time(extract_sections, resumes, repeats)
+        old_both = self._time(
+            lambda text: (reference_extract_sections(text), reference_analyze_formatting(text)),
+            resumes, repeats
+        )
+        new_both = self._time(
+            lambda text: analyze_formatting(text, sections=split_sections(text)),
+            resumes, repeats
+        )
+
+        self.stdout.write(f"{'':>24} {'old us':>8} {'new us':>8} {'speedup':>8}")
+        self.stdout.write(
+            f"{'extract_sections':>24} {old_split:>8.1f} {new_split:>8.1f} {old_split / new_split:>7.1f}x"
+        )
+        self.stdout.write(
+            f"{'sections + formatting':>24} {old_both:>8.1f} {new_both:>8.1f} {old_both / new_both:>7.1f}x"
+        )
@@ -0,0 +1,87 @@
+"""
+Benchmark the compiled skill matcher against the per-skill regex loop.
+
+Usage:
+    python manage.py benchmark_skill_matcher --sizes 150 1000 5000 10000
+"""
+
+import random
+import re
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from critique.matcher import SkillMatcher, build_terms
+from critique.services import TECH_SKILLS
+
+WORDS_PER_DOC = 900
+
+
+def _legacy_find(skills, text_lower):
+    """Original matcher: one regex search per skill."""
+    found = set()
+    for skill in skills:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found.add(skill)
+    return found
+
+
+def _synthetic_taxonomy(size, rng):
+    """TECH_SKILLS padded with random single and multi-word terms."""
+    skills = set(TECH_SKILLS)
+    while len(skills) < size:
+        words = [
+            ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+            for _ in range(rng.randint(1, 3))
+        ]
+        skills.add(' '.join(words))
+    return sorted(skills)
+
+
+def _synthetic_resume(skills, filler, rng):
+    tokens = [rng.choice(filler) for _ in range(WORDS_PER_DOC)]
+    for i in range(0, len(tokens), 12):
+        tokens[i] = rng.choice(skills)
+    return ' '.join(tokens)
+
+
+class Command(BaseCommand):
+    help = "Compare per-document skill matching cost as the taxonomy grows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[150, 1000, 5000, 10000])
+        parser.add_argument('--docs', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=13)
+        parser.add_argument('--skip-legacy', action='store_true',
+                            help="Only time the compiled matcher")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        filler = ['experience', 'team', 'built', 'using', 'and', 'with', 'the',
+                  'delivered', 'project', 'c++', 'asp.net', 'node.js', 'ci/cd']
+
+        self.stdout.write(f"{'terms':>8} {'build ms':>10} {'matcher ms/doc':>15} {'legacy ms/doc':>14}")
+        for size in options['sizes']:
+            skills = _synthetic_taxonomy(size, rng)
+            docs = [_synthetic_resume(skills, filler, rng).lower() for _ in range(options['docs'])]
+
+            start = time.perf_counter()
+            matcher = SkillMatcher(build_terms(skills))
+            build_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            results = [matcher.find(doc) for doc in docs]
+            matcher_ms = (time.perf_counter() - start) * 1000 / len(docs)
+
+            legacy_col = '-'
+            if not options['skip_legacy']:
+                start = time.perf_counter()
+                expected = [_legacy_find(skills, doc) for doc in docs]
+                legacy_ms = (time.perf_counter() - start) * 1000 / len(docs)
+                legacy_col = f"{legacy_ms:.2f}"
+                if results != expected:
+                    self.stderr.write(self.style.ERROR(f"Mismatch against legacy matcher at {size} terms"))
+
+            self.stdout.write(f"{size:>8} {build_ms:>10.1f} {matcher_ms:>15.2f} {legacy_col:>14}")
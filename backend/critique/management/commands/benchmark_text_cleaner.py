@@ -0,0 +1,80 @@
+"""
+Benchmark clean_resume_text against the previous multi-pass implementation.
+
+Usage:
+    python manage.py benchmark_text_cleaner --size-kb 500
+
+Times both on a large resume-like document, Unicode and ASCII-only. The
+outputs must match there too; equivalence on random inputs is tested in
+critique/tests/test_text_cleaner.py.
+"""
+
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from critique.encoders import DEFAULT_CORPUS_PATH, load_corpus
+from critique.parser import clean_resume_text
+
+BULLET_CHARS = ['•', '●', '○', '◦', '▪', '▫', '■', '□', '►', '➤', '➢', '→', '»', '✓', '✔']
+
+
+def reference_clean_resume_text(text: str) -> str:
+    """The multi-pass implementation clean_resume_text replaced."""
+    if not text:
+        return ""
+
+    for char in BULLET_CHARS:
+        text = text.replace(char, '• ')
+    text = re.sub(r'[^\x20-\x7E\n\t]', ' ', text)
+    text = re.sub(r'[ \t]+', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    lines = [line.strip() for line in text.split('\n')]
+    text = '\n'.join(lines)
+    return text.strip()
+
+
+def _build_document(size_kb: int) -> str:
+    """Corpus resumes dressed up like raw PDF output, repeated to size."""
+    corpus = load_corpus(DEFAULT_CORPUS_PATH)
+    rng = random.Random(0)
+    parts = []
+    for pair in corpus:
+        lines = []
+        for line in pair['resume'].split('. '):
+            bullet = rng.choice(BULLET_CHARS)
+            lines.append(f"{bullet}\t {line}  – 2019–2023 ")
+        parts.append('\n'.join(lines) + '\n\n\n\n')
+
+    block = ''.join(parts)
+    return block * max(1, size_kb * 1024 // len(block))
+
+
+class Command(BaseCommand):
+    help = "Check clean_resume_text is output-identical to the old version and time both"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size-kb', type=int, default=500)
+        parser.add_argument('--repeats', type=int, default=20)
+
+    def handle(self, *args, **options):
+        documents = {'unicode': _build_document(options['size_kb'])}
+        documents['ascii'] = documents['unicode'].encode('ascii', 'replace').decode('ascii')
+
+        self.stdout.write(f"{'input':>8} {'old ms':>8} {'new ms':>8} {'speedup':>8}")
+        for name, text in documents.items():
+            if clean_resume_text(text) != reference_clean_resume_text(text):
+                raise CommandError(f"Output differs on the {name} document")
+
+            timings = []
+            for implementation in (reference_clean_resume_text, clean_resume_text):
+                start = time.perf_counter()
+                for _ in range(options['repeats']):
+                    implementation(text)
+                timings.append((time.perf_counter() - start) / options['repeats'] * 1000)
+
+            self.stdout.write(
+                f"{name:>8} {timings[0]:>8.1f} {timings[1]:>8.1f} {timings[0] / timings[1]:>7.1f}x"
+            )
@@ -0,0 +1,144 @@
+"""
+Export the sentence encoder to ONNX and validate it against the reference.
+
+Usage:
+    python manage.py export_encoder
+    python manage.py export_encoder --skip-export --max-drift 0.01
+
+Writes model.onnx (fp32), model-int8.onnx (dynamic int8 quantization),
+the tokenizer and encoder_config.json to CRITIQUE_ONNX_MODEL_DIR. Then
+scores the fixture corpus with every backend and reports the drift of
+the resume/job similarity against the PyTorch reference.
+"""
+
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from critique.encoders import (
+    BACKENDS, DEFAULT_CORPUS_PATH, ENCODER_CONFIG_FILE, ONNX_MODEL_FILES,
+    load_corpus, load_encoder,
+)
+from critique.services import SENTENCE_MODEL_NAME, cosine_similarity
+
+
+def export_onnx(output_dir: str):
+    """Export the transformer of the sentence model to fp32 and int8 ONNX files."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(SENTENCE_MODEL_NAME, device='cpu')
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer.save_pretrained(output_dir)
+
+    sample = tokenizer(['Exporting the resume encoder'], return_tensors='pt')
+    input_names = list(sample.keys())
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Positional-argument wrapper returning the token embeddings."""
+
+        def __init__(self, inner):
+            super().__init__()
+            self.inner = inner
+
+        def forward(self, *args):
+            return self.inner(**dict(zip(input_names, args))).last_hidden_state
+
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['last_hidden_state'] = {0: 'batch', 1: 'sequence'}
+
+    fp32_path = os.path.join(output_dir, ONNX_MODEL_FILES['onnx'])
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(transformer),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=['last_hidden_state'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    quantize_dynamic(
+        fp32_path,
+        os.path.join(output_dir, ONNX_MODEL_FILES['onnx-int8']),
+        weight_type=QuantType.QInt8,
+    )
+
+    with open(os.path.join(output_dir, ENCODER_CONFIG_FILE), 'w') as fh:
+        json.dump({
+            'model_name': SENTENCE_MODEL_NAME,
+            'max_seq_length': model.max_seq_length,
+        }, fh, indent=2)
+
+
+def score_corpus(encoder, corpus):
+    """Resume/job similarity for every pair, plus the raw embeddings."""
+    resumes = encoder.encode([pair['resume'] for pair in corpus])
+    jobs = encoder.encode([pair['job'] for pair in corpus])
+    scores = [cosine_similarity(resume, job) for resume, job in zip(resumes, jobs)]
+    return scores, list(resumes) + list(jobs)
+
+
+class Command(BaseCommand):
+    help = "Export the sentence encoder to ONNX (fp32 + int8) and report score drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', default=settings.CRITIQUE_ONNX_MODEL_DIR)
+        parser.add_argument('--corpus', default=DEFAULT_CORPUS_PATH,
+                            help="JSON list of {resume, job} pairs")
+        parser.add_argument('--max-drift', type=float, default=0.02,
+                            help="Fail if any pair's similarity moves more than this")
+        parser.add_argument('--skip-export', action='store_true',
+                            help="Only validate previously exported models")
+
+    def handle(self, *args, **options):
+        output_dir = options['output_dir']
+
+        if not options['skip_export']:
+            self.stdout.write(f"Exporting {SENTENCE_MODEL_NAME} to {output_dir}...")
+            try:
+                export_onnx(output_dir)
+            except ImportError as e:
+                raise CommandError(
+                    f"{e}; install the ONNX extras with pip install -r requirements-onnx.txt"
+                )
+
+        corpus = load_corpus(options['corpus'])
+        reference_scores, reference_embeddings = score_corpus(
+            load_encoder('torch', SENTENCE_MODEL_NAME, output_dir), corpus
+        )
+
+        self.stdout.write(
+            f"{'backend':>10} {'max drift':>10} {'mean drift':>11} {'min emb cos':>12}"
+        )
+        failed = []
+        for backend in BACKENDS:
+            if backend == 'torch':
+                continue
+            scores, embeddings = score_corpus(
+                load_encoder(backend, SENTENCE_MODEL_NAME, output_dir), corpus
+            )
+            drifts = [abs(score - ref) for score, ref in zip(scores, reference_scores)]
+            agreement = min(
+                cosine_similarity(embedding, ref)
+                for embedding, ref in zip(embeddings, reference_embeddings)
+            )
+            max_drift = max(drifts)
+            self.stdout.write(
+                f"{backend:>10} {max_drift:>10.4f} {sum(drifts) / len(drifts):>11.4f} {agreement:>12.4f}"
+            )
+            if max_drift > options['max_drift']:
+                failed.append(backend)
+
+        if failed:
+            raise CommandError(
+                f"Score drift above {options['max_drift']} for: {', '.join(failed)}"
+            )
+        self.stdout.write(self.style.SUCCESS("All backends within drift tolerance"))
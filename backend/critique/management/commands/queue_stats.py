@@ -0,0 +1,35 @@
+"""
+Show the depth and recent wait times of the Celery queues.
+
+Usage:
+    python manage.py queue_stats
+    python manage.py queue_stats --queue nlp --queue llm
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.monitoring import QUEUES, queue_stats
+
+
+def _seconds(value) -> str:
+    return '-' if value is None else f"{value:.2f}"
+
+
+class Command(BaseCommand):
+    help = "Show Celery queue depth and publish-to-start latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', action='append', dest='queues', choices=QUEUES)
+
+    def handle(self, *args, **options):
+        stats = queue_stats(options['queues'] or QUEUES)
+
+        self.stdout.write(
+            f"{'queue':<12} {'depth':>6} {'samples':>8} {'p50 s':>8} {'p95 s':>8} {'max s':>8}"
+        )
+        for queue, row in stats.items():
+            self.stdout.write(
+                f"{queue:<12} {row['depth']:>6} {row['latency_samples']:>8} "
+                f"{_seconds(row['latency_p50']):>8} {_seconds(row['latency_p95']):>8} "
+                f"{_seconds(row['latency_max']):>8}"
+            )
@@ -0,0 +1,43 @@
+"""
+Run the local NLP inference server.
+
+Usage:
+    python manage.py run_inference_server --socket /tmp/critique-inference.sock
+
+Set CRITIQUE_INFERENCE_SOCKET to the same path so workers use it.
+"""
+
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from critique.inference import InferenceServer
+
+
+class Command(BaseCommand):
+    help = "Serve encode/keyword requests from one model copy with micro-batching"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=settings.CRITIQUE_INFERENCE_SOCKET)
+        parser.add_argument('--max-batch', type=int, default=64,
+                            help="Max texts coalesced into one model call")
+        parser.add_argument('--max-wait-ms', type=float, default=10,
+                            help="How long the first request waits for others to join its batch")
+
+    def handle(self, *args, **options):
+        if not options['socket']:
+            raise CommandError("Pass --socket or set CRITIQUE_INFERENCE_SOCKET")
+
+        server = InferenceServer(
+            options['socket'],
+            max_batch=options['max_batch'],
+            max_wait_ms=options['max_wait_ms'],
+        )
+        self.stdout.write(f"Inference server listening on {options['socket']}")
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if os.path.exists(options['socket']):
+                os.unlink(options['socket'])
@@ -0,0 +1,169 @@
+"""
+Simulate bulk critiques and interactive critiques competing for workers.
+
+Usage:
+    python manage.py simulate_fair_scheduling --bulk 1000 --jobs 8 --workers 2
+
+Publishes through the configured Redis broker (same transport options
+as Celery) to a scratch queue. At t=0 one recruiter runs critique_all on
+--jobs postings, splitting --bulk candidates between them. As in the
+API, each critique_all is a single message charged one unit per
+candidate and holds a worker for --per-candidate seconds per candidate.
+Other users enqueue single critiques (one unit, --service seconds)
+while the bulk work drains. Workers are simulated on a virtual clock:
+each takes the next message from the broker whenever it is free. The
+run is repeated three ways and the wait of each class of task reported:
+
+- fifo: one shared queue, every message at priority 0
+- fair share: one shared queue, priorities from fair_priority()
+- bulk queue: as deployed; critique_all goes to its own queue served by
+  --bulk-workers, single critiques to the --workers nlp workers
+
+Priorities only order queued messages: in the shared-queue runs a
+critique_all already running keeps its worker, so interactive waits are
+bounded below by how long the bulk messages that took every worker run.
+"""
+
+import time
+import uuid
+from collections import deque
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.scheduling import USAGE_KEY, HIGHEST_PRIORITY, fair_priority
+
+
+def _summary(waits: list) -> str:
+    if not waits:
+        return f"{'-':>8} {'-':>8} {'-':>8}"
+    waits = sorted(waits)
+    mean = sum(waits) / len(waits)
+    p95 = waits[min(int(0.95 * len(waits)), len(waits) - 1)]
+    return f"{mean:>8.1f} {p95:>8.1f} {waits[-1]:>8.1f}"
+
+
+class Command(BaseCommand):
+    help = "Compare waits of interactive tasks behind bulk critiques: FIFO, fair share, bulk queue"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bulk', type=int, default=1000, help="Candidates across the bulk critiques")
+        parser.add_argument('--jobs', type=int, default=8, help="critique_all messages the bulk is split into")
+        parser.add_argument('--per-candidate', type=float, default=0.5, help="Seconds per candidate of a bulk critique")
+        parser.add_argument('--interactive', type=int, default=20, help="Single critiques from other users")
+        parser.add_argument('--users', type=int, default=5, help="Users sending the single critiques")
+        parser.add_argument('--every', type=float, default=15.0, help="Seconds between single critiques")
+        parser.add_argument('--workers', type=int, default=2, help="nlp workers (CELERY_NLP_CONCURRENCY)")
+        parser.add_argument('--bulk-workers', type=int, default=1, help="Workers of the bulk queue")
+        parser.add_argument('--service', type=float, default=2.0, help="Seconds per single critique")
+
+    def _arrivals(self, options, run_id: str) -> list:
+        """(time, kind, tenant, cost, service seconds) of every message, in arrival order."""
+        arrivals = []
+        jobs = max(options['jobs'], 1)
+        for index in range(jobs):
+            # Spread the remainder so the candidates add up to --bulk
+            candidates = options['bulk'] // jobs + (index < options['bulk'] % jobs)
+            if candidates:
+                arrivals.append((
+                    0.0, 'bulk', f"sim:{run_id}:recruiter",
+                    candidates, candidates * options['per_candidate'],
+                ))
+        for index in range(options['interactive']):
+            arrivals.append((
+                5.0 + index * options['every'],
+                'interactive',
+                f"sim:{run_id}:user-{index % options['users']}",
+                1,
+                options['service'],
+            ))
+        return arrivals
+
+    def _simulate(self, connection, arrivals: list, worker_queues: list, fair: bool, route) -> dict:
+        """
+        Args:
+            worker_queues: Queue name each simulated worker consumes
+            route: Maps a message kind to its queue name
+        """
+        suffix = uuid.uuid4().hex[:8]
+        queues = {name: connection.SimpleQueue(f"fairsim-{name}-{suffix}") for name in set(worker_queues)}
+        waits = {'bulk': [], 'interactive': []}
+        free_at = [0.0] * len(worker_queues)
+        pending = deque(arrivals)
+
+        try:
+            while True:
+                worker = min(range(len(worker_queues)), key=free_at.__getitem__)
+                now = free_at[worker]
+                if now == float('inf'):
+                    break
+
+                # Publish everything that has arrived by now
+                while pending and pending[0][0] <= now:
+                    arrived, kind, tenant, cost, service = pending.popleft()
+                    priority = fair_priority(tenant, cost=cost) if fair else HIGHEST_PRIORITY
+                    queues[route(kind)].put(
+                        {'arrived': arrived, 'kind': kind, 'service': service}, priority=priority
+                    )
+
+                queue = queues[worker_queues[worker]]
+                try:
+                    message = queue.get_nowait()
+                except queue.Empty:
+                    # Idle until the next arrival, or done
+                    free_at[worker] = pending[0][0] if pending else float('inf')
+                    continue
+
+                message.ack()
+                waits[message.payload['kind']].append(now - message.payload['arrived'])
+                free_at[worker] = now + message.payload['service']
+        finally:
+            for queue in queues.values():
+                queue.clear()
+                queue.close()
+        return waits
+
+    def _clear_usage(self, run_id: str):
+        from core.redis_client import get_redis
+
+        client = get_redis()
+        pattern = USAGE_KEY.format(tenant=f"sim:{run_id}:*", window='*')
+        for key in client.scan_iter(match=pattern):
+            client.delete(key)
+
+    def handle(self, *args, **options):
+        from kombu import Connection
+
+        run_id = uuid.uuid4().hex[:8]
+        arrivals = self._arrivals(options, run_id)
+        transport_options = getattr(settings, 'CELERY_BROKER_TRANSPORT_OPTIONS', {})
+
+        self.stdout.write(
+            f"{options['bulk']} candidates in {options['jobs']} critique_all messages at t=0 "
+            f"({options['per_candidate']:.1f}s each), {options['interactive']} single critiques "
+            f"every {options['every']:.0f}s ({options['service']:.1f}s each), "
+            f"{options['workers']} nlp + {options['bulk_workers']} bulk workers"
+        )
+        self.stdout.write(f"{'':>22} {'mean s':>8} {'p95 s':>8} {'max s':>8}")
+
+        shared = ['nlp'] * (options['workers'] + options['bulk_workers'])
+        split = ['nlp'] * options['workers'] + ['bulk'] * options['bulk_workers']
+        runs = (
+            ('fifo', shared, False, lambda kind: 'nlp'),
+            ('fair share', shared, True, lambda kind: 'nlp'),
+            ('bulk queue', split, True, lambda kind: 'bulk' if kind == 'bulk' else 'nlp'),
+        )
+
+        with Connection(settings.CELERY_BROKER_URL, transport_options=transport_options) as connection:
+            try:
+                for label, worker_queues, fair, route in runs:
+                    # Each run starts from zero usage
+                    self._clear_usage(run_id)
+                    start = time.perf_counter()
+                    waits = self._simulate(connection, arrivals, worker_queues, fair, route)
+                    elapsed = time.perf_counter() - start
+                    for kind in ('interactive', 'bulk'):
+                        self.stdout.write(f"{label + ' ' + kind:>22} {_summary(waits[kind])}")
+                    self.stdout.write(f"{'':>22} ({elapsed:.1f}s wall clock)")
+            finally:
+                self._clear_usage(run_id)
@@ -0,0 +1,156 @@
+"""
+Compiled multi-pattern skill matcher.
+
+Builds an Aho-Corasick automaton over the skills taxonomy once per process
+and finds every skill in a single pass over the text, so the cost per
+document no longer grows with the size of the dictionary.
+"""
+
+import json
+import logging
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Same definition of a "word" character as the regex \b assertion
+_WORD_CHAR = re.compile(r'\w')
+
+
+def _is_word_char(ch: str) -> bool:
+    return _WORD_CHAR.match(ch) is not None
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over skill surface forms.
+
+    Every surface form maps to a canonical skill name, which allows aliases
+    (e.g. ``k8s`` -> ``kubernetes``) to report a single keyword. A hit only
+    counts if it satisfies the same ``\\b<term>\\b`` boundaries the regex
+    based matcher used, so terms like ``c++``, ``.net`` and ``node.js``
+    keep their previous semantics.
+    """
+
+    def __init__(self, terms: Dict[str, str]):
+        """
+        Args:
+            terms: Mapping of lowercased surface form -> canonical skill
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[int, str]]] = [[]]
+
+        for surface, canonical in terms.items():
+            if surface:
+                self._add(surface, canonical)
+        self._build_failure_links()
+        self.size = len(terms)
+
+    def _add(self, surface: str, canonical: str):
+        state = 0
+        for ch in surface:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(surface), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit matches that end at the same position
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def find(self, text_lower: str) -> Set[str]:
+        """Return canonical skills found in already-lowercased text."""
+        found = set()
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        length = len(text_lower)
+        state = 0
+
+        for end, ch in enumerate(text_lower, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            for term_length, canonical in output[state]:
+                if canonical in found:
+                    continue
+                start = end - term_length
+                if self._at_boundary(text_lower, start, length) and \
+                        self._at_boundary(text_lower, end, length):
+                    found.add(canonical)
+
+        return found
+
+    @staticmethod
+    def _at_boundary(text: str, index: int, length: int) -> bool:
+        """Equivalent of the regex \\b assertion at ``index``."""
+        before = index > 0 and _is_word_char(text[index - 1])
+        after = index < length and _is_word_char(text[index])
+        return before != after
+
+
+def build_terms(
+    skills: Iterable[str],
+    aliases: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """Build the surface form -> canonical mapping for a taxonomy."""
+    terms = {skill.lower(): skill.lower() for skill in skills}
+    for alias, canonical in (aliases or {}).items():
+        terms[alias.lower()] = canonical.lower()
+    return terms
+
+
+def load_taxonomy(path: str) -> Dict[str, str]:
+    """
+    Load a skills taxonomy from a JSON file.
+
+    Expected format:
+    {
+        "skills": ["kubernetes", "go", ...],
+        "aliases": {"k8s": "kubernetes", "golang": "go"}
+    }
+    """
+    with open(path, encoding='utf-8') as fh:
+        data = json.load(fh)
+    return build_terms(data.get('skills', []), data.get('aliases', {}))
+
+
+_skill_matcher = None
+
+
+def get_skill_matcher() -> SkillMatcher:
+    """Lazy build the process-wide skill matcher."""
+    global _skill_matcher
+    if _skill_matcher is None:
+        from django.conf import settings
+        from .services import TECH_SKILLS
+
+        taxonomy_path = getattr(settings, 'CRITIQUE_SKILLS_TAXONOMY', '')
+        if taxonomy_path:
+            terms = load_taxonomy(taxonomy_path)
+            logger.info(f"Loaded skills taxonomy from {taxonomy_path} ({len(terms)} terms)")
+        else:
+            terms = build_terms(TECH_SKILLS)
+        _skill_matcher = SkillMatcher(terms)
+    return _skill_matcher
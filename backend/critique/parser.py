@@ -4,74 +4,373 @@ Uses pdfplumber for superior layout analysis.
 """
 
 import re
+import mmap
+import codecs
 import logging
-from typing import Optional
-from io import BytesIO
+import tempfile
+import shutil
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Generator, List, Optional
 
 logger = logging.getLogger(__name__)
 
 
-def extract_text_from_pdf(file_path_or_buffer) -> str:
+def _source_path(source) -> Optional[str]:
+    """Local filesystem path of a PDF source, if it has one."""
+    if isinstance(source, (str, Path)):
+        return str(source)
+    if hasattr(source, 'storage'):
+        try:
+            return source.path
+        except NotImplementedError:
+            return None  # Remote storage, no local path
+    return None
+
+
+@contextmanager
+def _open_pdf_stream(source):
+    """
+    Open a PDF source as a seekable binary stream without copying it.
+    
+    - Local paths and FieldFiles on filesystem storage are memory-mapped.
+    - Other FieldFiles / storage files are opened and read in place.
+    - Non-seekable streams are spooled to a temporary file, since PDF
+      parsing needs random access.
+    """
+    path = _source_path(source)
+    
+    if path is not None:
+        with open(path, 'rb') as fh:
+            try:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty file, nothing to map
+                yield fh
+                return
+            with mapped:
+                yield mapped
+        return
+    
+    if hasattr(source, 'open') and getattr(source, 'closed', False):
+        source.open('rb')
+    
+    if hasattr(source, 'seekable') and source.seekable():
+        source.seek(0)
+        yield source
+        return
+    
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as spooled:
+        shutil.copyfileobj(source, spooled)
+        spooled.seek(0)
+        yield spooled
+
+
+def _pdfplumber_pages(stream, max_pages: Optional[int]) -> Generator[str, None, Optional[str]]:
+    """Raw page texts with pdfplumber's layout analysis."""
+    import pdfplumber
+    
+    with pdfplumber.open(stream) as pdf:
+        for index, page in enumerate(pdf.pages):
+            if max_pages is not None and index >= max_pages:
+                return 'pages'
+            
+            page_text = page.extract_text()
+            page.flush_cache()
+            yield page_text
+
+
+def _pypdf_pages(stream, max_pages: Optional[int]) -> Generator[str, None, Optional[str]]:
+    """Raw page texts from PyPDF2's text layer, without layout analysis."""
+    from PyPDF2 import PdfReader
+    
+    reader = PdfReader(stream)
+    for index, page in enumerate(reader.pages):
+        if max_pages is not None and index >= max_pages:
+            return 'pages'
+        
+        yield page.extract_text()
+
+
+_PAGE_READERS = {
+    'pdfplumber': _pdfplumber_pages,
+    'pypdf': _pypdf_pages,
+}
+
+
+def _page_count(stream) -> int:
+    """Page count from the document's page tree, without parsing any page."""
+    try:
+        from PyPDF2 import PdfReader
+        count = len(PdfReader(stream).pages)
+    except ImportError:
+        import pdfplumber
+        with pdfplumber.open(stream) as pdf:
+            count = len(pdf.pages)
+    stream.seek(0)
+    return count
+
+
+def _extract_page_range(path: str, extractor: str, start: int, stop: int) -> List[str]:
+    """Raw texts of pages [start, stop); runs in a pool worker."""
+    with open(path, 'rb') as fh:
+        if extractor == 'pdfplumber':
+            import pdfplumber
+            with pdfplumber.open(fh) as pdf:
+                texts = []
+                for page in pdf.pages[start:stop]:
+                    texts.append(page.extract_text())
+                    page.flush_cache()
+                return texts
+        
+        from PyPDF2 import PdfReader
+        reader = PdfReader(fh)
+        return [reader.pages[index].extract_text() for index in range(start, stop)]
+
+
+def _parallel_pages(
+    stream,
+    path: str,
+    extractor: str,
+    max_pages: Optional[int],
+    workers: int,
+    min_pages: int
+) -> Generator[str, None, Optional[str]]:
+    """
+    Raw page texts extracted by a process pool, in page order.
+    
+    Each worker opens the file itself and extracts one contiguous range of
+    pages. Short documents, and callers that cannot fork (daemonic Celery
+    prefork children), use the serial readers instead.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    
+    page_count = _page_count(stream)
+    pages_to_read = min(page_count, max_pages) if max_pages is not None else page_count
+    
+    if pages_to_read < min_pages or multiprocessing.current_process().daemon:
+        return (yield from _PAGE_READERS[extractor](stream, max_pages))
+    
+    workers = min(workers, pages_to_read)
+    step = -(-pages_to_read // workers)  # ceil
+    ranges = [(start, min(start + step, pages_to_read)) for start in range(0, pages_to_read, step)]
+    
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        # map() yields results in submission order, i.e. page order
+        for texts in executor.map(
+            _extract_page_range,
+            [path] * len(ranges),
+            [extractor] * len(ranges),
+            [start for start, _ in ranges],
+            [stop for _, stop in ranges],
+        ):
+            yield from texts
+    finally:
+        # Skip ranges not started yet when the caller stops early
+        executor.shutdown(wait=True, cancel_futures=True)
+    
+    return 'pages' if pages_to_read < page_count else None
+
+
+def _resolve_extractor(stream, extractor: str) -> str:
+    """Map the configured extractor to the one to use for this document."""
+    if extractor not in EXTRACTORS:
+        raise ValueError(f"Unknown PDF extractor '{extractor}', expected one of {EXTRACTORS}")
+    
+    if extractor == 'adaptive':
+        try:
+            probe = probe_pdf(stream)
+            extractor = select_extractor(probe)
+            logger.debug(f"PDF probe {probe} -> {extractor}")
+        except Exception as e:
+            logger.warning(f"PDF probe failed, using pdfplumber: {e}")
+            extractor = 'pdfplumber'
+        stream.seek(0)
+    
+    if extractor == 'pdfplumber':
+        try:
+            import pdfplumber  # noqa: F401
+        except ImportError:
+            logger.warning("pdfplumber not installed, falling back to PyPDF2")
+            extractor = 'pypdf'
+    
+    return extractor
+
+
+def iter_pdf_pages(
+    file_path_or_buffer,
+    max_chars: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    extractor: str = 'pdfplumber',
+    workers: int = 1,
+    parallel_min_pages: int = 8
+) -> Generator[str, None, Optional[str]]:
+    """
+    Yield cleaned text of a PDF one page at a time.
+    
+    Pages are parsed lazily and their layout objects released after
+    extraction, so memory stays flat regardless of page count.
+    
+    Args:
+        file_path_or_buffer: File path, FieldFile or file-like object
+        max_chars: Stop once this many characters have been yielded
+        max_pages: Stop after this many pages
+        extractor: 'pdfplumber', 'pypdf' or 'adaptive' (probe, then pick)
+        workers: Extract pages in a process pool of this size (local files only)
+        parallel_min_pages: Documents with fewer pages are extracted serially
+        
+    Returns:
+        The budget that stopped extraction early ('chars' or 'pages'),
+        or None if the whole document was read
+    """
+    total_chars = 0
+    path = _source_path(file_path_or_buffer)
+    with _open_pdf_stream(file_path_or_buffer) as stream:
+        extractor = _resolve_extractor(stream, extractor)
+        if workers > 1 and path is not None:
+            pages = _parallel_pages(stream, path, extractor, max_pages, workers, parallel_min_pages)
+        else:
+            pages = _PAGE_READERS[extractor](stream, max_pages)
+        
+        while True:
+            try:
+                page_text = next(pages)
+            except StopIteration as stop:
+                return stop.value
+            
+            page_text = clean_resume_text(page_text)
+            if not page_text:
+                continue
+            
+            yield page_text
+            total_chars += len(page_text)
+            if max_chars is not None and total_chars >= max_chars:
+                pages.close()
+                return 'chars'
+
+
+def extract_text_from_pdf(
+    file_path_or_buffer,
+    max_chars: Optional[int] = None,
+    extractor: str = 'pdfplumber'
+) -> str:
     """
     Extract text from a PDF file or buffer.
     
     Args:
         file_path_or_buffer: Either a file path string or a file-like object
+        max_chars: Stop extracting once this many characters were collected
+        extractor: 'pdfplumber', 'pypdf' or 'adaptive'
         
     Returns:
         Extracted and cleaned text from the PDF
     """
     try:
-        import pdfplumber
-        
-        # Handle both file paths and file objects
-        if hasattr(file_path_or_buffer, 'read'):
-            pdf = pdfplumber.open(BytesIO(file_path_or_buffer.read()))
-        else:
-            pdf = pdfplumber.open(file_path_or_buffer)
-        
-        text_parts = []
-        
-        for page in pdf.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text_parts.append(page_text)
-        
-        pdf.close()
-        
-        raw_text = '\n\n'.join(text_parts)
-        return clean_resume_text(raw_text)
-        
-    except ImportError:
-        logger.warning("pdfplumber not installed, falling back to PyPDF2")
-        return _fallback_extract_pypdf2(file_path_or_buffer)
+        return '\n\n'.join(
+            iter_pdf_pages(file_path_or_buffer, max_chars=max_chars, extractor=extractor)
+        )
     except Exception as e:
         logger.error(f"Error extracting text from PDF: {e}")
         raise
 
 
-def _fallback_extract_pypdf2(file_path_or_buffer) -> str:
-    """Fallback PDF extraction using PyPDF2."""
-    try:
-        from PyPDF2 import PdfReader
-        
-        if hasattr(file_path_or_buffer, 'read'):
-            reader = PdfReader(BytesIO(file_path_or_buffer.read()))
-        else:
-            reader = PdfReader(file_path_or_buffer)
-        
-        text_parts = []
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
+# ===== Adaptive extractor selection =====
+
+EXTRACTORS = ('pdfplumber', 'pypdf', 'adaptive')
+
+# Pages sampled by the probe
+PROBE_PAGES = 3
+
+# Below this many characters per page the PDF has no usable text layer
+# (scanned); layout analysis can't recover text there either
+MIN_TEXT_CHARS_PER_PAGE = 100
+
+# Text runs at least this long are body text rather than dates or labels
+COLUMN_RUN_MIN_CHARS = 15
+
+# Share of body-text runs starting in the middle band of the page above
+# which the layout is treated as multi-column
+MULTI_COLUMN_RATIO = 0.25
+MIDDLE_BAND = (0.3, 0.7)
+
+
+@dataclass
+class PdfProbe:
+    page_count: int
+    chars_per_page: float
+    has_text_layer: bool
+    multi_column: bool
+
+
+def probe_pdf(stream, sample_pages: int = PROBE_PAGES) -> PdfProbe:
+    """
+    Cheaply inspect a PDF with PyPDF2.
+    
+    Reads the text layer of the first few pages and records where each
+    text run starts. Single-column resumes start nearly all body text at
+    the left margin; a second column shows up as long runs starting in
+    the middle of the page.
+    """
+    from PyPDF2 import PdfReader
+    
+    reader = PdfReader(stream)
+    page_count = len(reader.pages)
+    sampled = min(sample_pages, page_count)
+    
+    total_chars = 0
+    body_runs = 0
+    middle_runs = 0
+    
+    for index in range(sampled):
+        page = reader.pages[index]
+        left = float(page.mediabox.left)
+        width = float(page.mediabox.width) or 1.0
+        band_start = left + MIDDLE_BAND[0] * width
+        band_end = left + MIDDLE_BAND[1] * width
         
-        raw_text = '\n\n'.join(text_parts)
-        return clean_resume_text(raw_text)
+        def visitor(text, cm, tm, font_dict, font_size):
+            nonlocal body_runs, middle_runs
+            if len(text.strip()) < COLUMN_RUN_MIN_CHARS:
+                return
+            # Text matrix origin in user space
+            x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+            body_runs += 1
+            if band_start <= x <= band_end:
+                middle_runs += 1
         
-    except Exception as e:
-        logger.error(f"Fallback PDF extraction failed: {e}")
-        raise
+        total_chars += len((page.extract_text(visitor_text=visitor) or '').strip())
+    
+    chars_per_page = total_chars / sampled if sampled else 0.0
+    return PdfProbe(
+        page_count=page_count,
+        chars_per_page=chars_per_page,
+        has_text_layer=chars_per_page >= MIN_TEXT_CHARS_PER_PAGE,
+        multi_column=bool(body_runs) and middle_runs / body_runs >= MULTI_COLUMN_RATIO,
+    )
+
+
+def select_extractor(probe: PdfProbe) -> str:
+    """pdfplumber only where layout analysis pays off: multi-column text PDFs."""
+    if probe.has_text_layer and probe.multi_column:
+        return 'pdfplumber'
+    return 'pypdf'
+
+
+# Non-ASCII characters (bullets included) become spaces while encoding to
+# ASCII; the old code replaced bullets with '• ' and then blanked the
+# non-ASCII '•', which collapses to the same single space.
+codecs.register_error('resume_blank', lambda error: (' ' * (error.end - error.start), error.end))
+
+# Control characters, DEL and tabs -> space. Mapping tabs here lets a plain
+# ' {2,}' collapse what used to be '[ \t]+'.
+_CONTROL_TABLE = str.maketrans({
+    codepoint: ' ' for codepoint in (*range(0x20), 0x7F) if codepoint != ord('\n')
+})
+_SPACE_RUN_RE = re.compile(r' {2,}')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
 
 
 def clean_resume_text(text: str) -> str:
@@ -86,75 +385,118 @@ def clean_resume_text(text: str) -> str:
     if not text:
         return ""
     
-    # Replace common bullet point characters with standard bullet
-    bullet_chars = ['•', '●', '○', '◦', '▪', '▫', '■', '□', '►', '➤', '➢', '→', '»', '✓', '✔']
-    for char in bullet_chars:
-        text = text.replace(char, '• ')
-    
-    # Remove non-printable characters except newlines and tabs
-    text = re.sub(r'[^\x20-\x7E\n\t]', ' ', text)
+    # Replace bullets and other non-printable characters with spaces
+    if not text.isascii():
+        text = text.encode('ascii', 'resume_blank').decode('ascii')
+    text = text.translate(_CONTROL_TABLE)
     
     # Normalize multiple spaces to single space
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _SPACE_RUN_RE.sub(' ', text)
     
     # Normalize multiple newlines to double newline (paragraph break)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
+    # Remove leading/trailing whitespace from each line (at most one space
+    # after the collapse above)
+    text = text.replace(' \n', '\n').replace('\n ', '\n')
     
     # Remove extra blank lines at start/end
-    text = text.strip()
-    
-    return text
+    return text.strip()
+
+
+# Common section headers (case-insensitive), matched at the start of a
+# stripped line. Earlier entries win when several match.
+SECTION_HEADERS = [
+    ('summary', r'summary|professional\s+summary|objective|profile'),
+    ('experience', r'experience|work\s+experience|employment|professional\s+experience'),
+    ('education', r'education|academic|qualifications'),
+    ('skills', r'skills|technical\s+skills|core\s+competencies|technologies'),
+    ('projects', r'projects|personal\s+projects|portfolio'),
+    ('certifications', r'certifications?|licenses?|credentials'),
+    ('awards', r'awards?|achievements?|honors?'),
+]
+
+# One alternation of named groups; match.lastgroup is the section name
+_SECTION_HEADER_RE = re.compile(
+    '|'.join(f'(?P<{name}>{pattern})' for name, pattern in SECTION_HEADERS),
+    re.IGNORECASE
+)
 
 
-def extract_sections(text: str) -> dict:
+@dataclass
+class Section:
+    name: str
+    header: str  # The header line as written ('' for the leading 'header' block)
+    start: int   # Offsets of the stripped content in the text
+    end: int
+    lines: int   # Content lines between this header and the next
+
+
+def split_sections(text: str) -> List[Section]:
     """
-    Attempt to identify common resume sections.
+    Split a resume into sections in document order.
     
-    Returns a dict with section names and their content.
-    Common sections: Summary, Experience, Education, Skills, Projects
+    Every line is classified with a single match against the precompiled
+    header alternation. Content is given as character offsets, so callers
+    can slice the text instead of rescanning it.
     """
-    sections = {}
-    
-    # Common section headers (case-insensitive)
-    section_patterns = [
-        (r'(?i)^(summary|professional\s+summary|objective|profile)', 'summary'),
-        (r'(?i)^(experience|work\s+experience|employment|professional\s+experience)', 'experience'),
-        (r'(?i)^(education|academic|qualifications)', 'education'),
-        (r'(?i)^(skills|technical\s+skills|core\s+competencies|technologies)', 'skills'),
-        (r'(?i)^(projects|personal\s+projects|portfolio)', 'projects'),
-        (r'(?i)^(certifications?|licenses?|credentials)', 'certifications'),
-        (r'(?i)^(awards?|achievements?|honors?)', 'awards'),
-    ]
+    sections = []
+    current = Section(name='header', header='', start=0, end=0, lines=0)
+    content_start = 0
+    position = 0
     
-    lines = text.split('\n')
-    current_section = 'header'
-    current_content = []
+    def close(section, end):
+        raw = text[content_start:end]
+        content = raw.strip()
+        section.start = content_start + len(raw) - len(raw.lstrip())
+        section.end = section.start + len(content)
+        sections.append(section)
     
-    for line in lines:
+    for line in text.split('\n'):
+        line_end = position + len(line)
         line_stripped = line.strip()
+        match = _SECTION_HEADER_RE.match(line_stripped)
         
-        # Check if this line is a section header
-        matched_section = None
-        for pattern, section_name in section_patterns:
-            if re.match(pattern, line_stripped):
-                matched_section = section_name
-                break
-        
-        if matched_section:
-            # Save previous section
-            if current_content:
-                sections[current_section] = '\n'.join(current_content).strip()
-            current_section = matched_section
-            current_content = []
+        if match:
+            close(current, max(position - 1, content_start))
+            current = Section(name=match.lastgroup, header=line_stripped, start=0, end=0, lines=0)
+            content_start = min(line_end + 1, len(text))
         else:
-            current_content.append(line)
-    
-    # Save last section
-    if current_content:
-        sections[current_section] = '\n'.join(current_content).strip()
+            current.lines += 1
+        
+        position = line_end + 1
     
+    close(current, len(text))
     return sections
+
+
+def extract_sections(text: str, sections: Optional[List[Section]] = None) -> dict:
+    """
+    Attempt to identify common resume sections.
+    
+    Returns a dict with section names and their content.
+    Common sections: Summary, Experience, Education, Skills, Projects
+    
+    Args:
+        text: Resume text
+        sections: split_sections() output for ``text``, if already computed
+    """
+    if sections is None:
+        sections = split_sections(text)
+    return {
+        section.name: text[section.start:section.end]
+        for section in sections
+        if section.lines
+    }
+
+
+def sections_to_json(sections: List[Section]) -> List[dict]:
+    """split_sections() output as JSON-serializable dicts (for a JSONField)."""
+    return [asdict(section) for section in sections]
+
+
+def sections_from_json(data: Optional[List[dict]]) -> Optional[List[Section]]:
+    """Inverse of sections_to_json(); None stays None."""
+    if data is None:
+        return None
+    return [Section(**section) for section in data]
@@ -0,0 +1,285 @@
+"""
+Resource-limited PDF text extraction.
+
+pdfplumber can spend minutes or gigabytes on pathological PDFs, so resume
+extraction runs in a child process (``python -m critique.sandbox``) with
+an address-space cap and a wall-clock timeout, plus page and character
+budgets. The child streams one JSON line per page to stdout, so the text
+read before a budget was hit survives even when the child is killed.
+
+An extractor crash on the file itself is reported by the child as an
+``error`` line and raised as PdfParseError, which is not retried; the
+same PDF would crash again. So is a child killed by a signal the sandbox
+did not cause (SIGSEGV/SIGABRT in a C parser, the OOM killer); only our
+own SIGKILL on timeout and RLIMIT_CPU's SIGXCPU count as a 'timeout'
+truncation. Failures of the child that it did not report (it could not
+start, import or read the file) raise plain CritiqueError and stay
+retryable.
+
+A plain subprocess is used rather than multiprocessing because Celery
+prefork children are daemonic and cannot fork their own pool children.
+"""
+
+import json
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from .exceptions import CritiqueError, PdfParseError
+
+logger = logging.getLogger(__name__)
+
+# Directory containing the critique package, so the child can import it
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class ExtractionResult:
+    text: str
+    truncated: bool = False
+    reason: str = ''  # '', 'pages', 'chars', 'timeout' or 'memory'
+    pages: int = 0
+
+
+def _budgets() -> dict:
+    from django.conf import settings
+
+    return {
+        'max_pages': getattr(settings, 'CRITIQUE_PDF_MAX_PAGES', 50),
+        'max_chars': getattr(settings, 'CRITIQUE_PDF_MAX_CHARS', 100000),
+        'timeout': getattr(settings, 'CRITIQUE_PDF_TIMEOUT', 60),
+        'memory_mb': getattr(settings, 'CRITIQUE_PDF_MEMORY_MB', 1024),
+        'extractor': getattr(settings, 'CRITIQUE_PDF_EXTRACTOR', 'pdfplumber'),
+        'workers': getattr(settings, 'CRITIQUE_PDF_WORKERS', 1),
+        'parallel_min_pages': getattr(settings, 'CRITIQUE_PDF_PARALLEL_MIN_PAGES', 8),
+    }
+
+
+@contextmanager
+def _local_path(file):
+    """Yield a filesystem path for a path, FieldFile or file-like object."""
+    if isinstance(file, (str, os.PathLike)):
+        yield str(file)
+        return
+
+    try:
+        yield file.path
+        return
+    except (AttributeError, NotImplementedError):
+        pass  # Remote storage or plain stream, spool it to disk
+
+    if hasattr(file, 'open'):
+        file.open('rb')
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as tmp:
+        shutil.copyfileobj(file, tmp)
+        tmp.flush()
+        yield tmp.name
+
+
+def _limit_resources(memory_mb: int, timeout: float):
+    """Build a preexec_fn that caps the child's memory and CPU time."""
+    def apply():
+        try:
+            import resource
+        except ImportError:
+            return  # Not available on this platform
+
+        memory = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        # Backstop in case the parent dies before it can kill the child.
+        # Soft below hard, so hitting it ends the child with SIGXCPU,
+        # which the parent can tell apart from any other kill
+        cpu = int(timeout) + 5
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 5))
+    return apply
+
+
+def _signal_name(number: int) -> str:
+    try:
+        return signal.Signals(number).name
+    except ValueError:
+        return f"signal {number}"
+
+
+def _parse_output(stdout: bytes):
+    """Collect page texts, the child's stop reason and parser error from its JSON lines."""
+    pages = []
+    reason = None
+    error = None
+    for line in stdout.splitlines():
+        try:
+            message = json.loads(line)
+        except ValueError:
+            continue  # Partial line from a killed child
+        if 'page' in message:
+            pages.append(message['page'])
+        elif 'done' in message:
+            reason = message.get('reason') or ''
+        elif 'error' in message:
+            error = message['error']
+    return pages, reason, error
+
+
+def extract_in_sandbox(file) -> ExtractionResult:
+    """
+    Extract resume text in a resource-limited subprocess.
+
+    Args:
+        file: File path, FieldFile or file-like object
+
+    Returns:
+        ExtractionResult, with truncated=True and partial text when a
+        page, character, time or memory budget was hit
+    """
+    budgets = _budgets()
+
+    with _local_path(file) as path:
+        command = [
+            sys.executable, '-m', 'critique.sandbox', path,
+            '--max-pages', str(budgets['max_pages']),
+            '--max-chars', str(budgets['max_chars']),
+            '--extractor', budgets['extractor'],
+            '--workers', str(budgets['workers']),
+            '--parallel-min-pages', str(budgets['parallel_min_pages']),
+        ]
+        process = subprocess.Popen(
+            command,
+            cwd=_PROJECT_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=_limit_resources(budgets['memory_mb'], budgets['timeout']),
+            # Own process group, so page workers are killed along with the child
+            start_new_session=True,
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=budgets['timeout'])
+            timed_out = False
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            # Output read so far is kept across the retry
+            stdout, stderr = process.communicate()
+            timed_out = True
+
+    pages, reason, parse_error = _parse_output(stdout)
+
+    if timed_out or process.returncode == -signal.SIGXCPU:
+        # Killed by us, or by RLIMIT_CPU
+        reason = 'timeout'
+    elif process.returncode < 0:
+        # Any other signal (SIGSEGV/SIGABRT in a C parser, the OOM killer)
+        # is the file crashing the extractor; it would again on a retry
+        raise PdfParseError(f"PDF extraction failed: extractor killed by {_signal_name(-process.returncode)}")
+    elif parse_error is not None:
+        raise PdfParseError(f"PDF extraction failed: {parse_error}")
+    elif reason is None:
+        error = stderr.decode('utf-8', errors='replace').strip()
+        if 'MemoryError' in error:
+            reason = 'memory'
+        else:
+            raise CritiqueError(f"PDF extraction failed: {error.splitlines()[-1] if error else process.returncode}")
+
+    if reason:
+        logger.warning(f"PDF extraction stopped early ({reason}) after {len(pages)} pages")
+
+    return ExtractionResult(
+        text='\n\n'.join(pages),
+        truncated=bool(reason),
+        reason=reason,
+        pages=len(pages),
+    )
+
+
+def extract_in_process(file) -> ExtractionResult:
+    """Extract with the page and character budgets only, without a subprocess."""
+    from .parser import iter_pdf_pages
+
+    budgets = _budgets()
+    generator = iter_pdf_pages(
+        file,
+        max_chars=budgets['max_chars'],
+        max_pages=budgets['max_pages'],
+        extractor=budgets['extractor'],
+        workers=budgets['workers'],
+        parallel_min_pages=budgets['parallel_min_pages'],
+    )
+    pages = []
+    while True:
+        try:
+            pages.append(next(generator))
+        except StopIteration as stop:
+            reason = stop.value or ''
+            break
+        except (OSError, MemoryError):
+            raise
+        except Exception as e:
+            raise PdfParseError(f"PDF extraction failed: {type(e).__name__}: {e}") from e
+
+    return ExtractionResult(
+        text='\n\n'.join(pages),
+        truncated=bool(reason),
+        reason=reason,
+        pages=len(pages),
+    )
+
+
+def extract_resume_text(file) -> ExtractionResult:
+    """Extract resume text, sandboxed unless CRITIQUE_PDF_SANDBOX is off."""
+    from django.conf import settings
+
+    if getattr(settings, 'CRITIQUE_PDF_SANDBOX', True):
+        return extract_in_sandbox(file)
+    return extract_in_process(file)
+
+
+def _main(argv=None):
+    """Child process entry point: stream pages of one PDF as JSON lines."""
+    import argparse
+    from .parser import iter_pdf_pages
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('path')
+    parser.add_argument('--max-pages', type=int, default=None)
+    parser.add_argument('--max-chars', type=int, default=None)
+    parser.add_argument('--extractor', default='pdfplumber')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--parallel-min-pages', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    def emit(message):
+        sys.stdout.write(json.dumps(message) + '\n')
+        sys.stdout.flush()
+
+    generator = iter_pdf_pages(
+        args.path,
+        max_chars=args.max_chars,
+        max_pages=args.max_pages,
+        extractor=args.extractor,
+        workers=args.workers,
+        parallel_min_pages=args.parallel_min_pages,
+    )
+    try:
+        while True:
+            try:
+                emit({'page': next(generator)})
+            except StopIteration as stop:
+                emit({'done': True, 'reason': stop.value or ''})
+                break
+    except MemoryError:
+        emit({'done': True, 'reason': 'memory'})
+    except OSError:
+        # Could not read the file: not the PDF's fault, let the parent retry
+        raise
+    except Exception as e:
+        # The extractor choked on the PDF itself
+        emit({'error': f"{type(e).__name__}: {e}"})
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    _main()
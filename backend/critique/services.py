@@ -4,16 +4,46 @@ Uses spaCy for NER and sentence-transformers for semantic similarity.
 """
 
 import re
+import json
+import time
+import hashlib
 import logging
+from functools import lru_cache
 from typing import Dict, List, Set, Tuple, Optional
 from dataclasses import dataclass, asdict
 
+from .exceptions import CritiqueError
+from .matcher import get_skill_matcher
+from .parser import split_sections
+
 logger = logging.getLogger(__name__)
 
 # Lazy loading of heavy ML models
 _nlp = None
 _sentence_model = None
 
+# Pipeline components whose output extract_keywords never reads.
+# The tagger, parser and attribute_ruler stay on because noun_chunks
+# depends on POS tags and dependency labels.
+UNUSED_SPACY_PIPES = (
+    'lemmatizer', 'textcat', 'textcat_multilabel', 'senter', 'entity_linker',
+)
+
+# Characters of each document handed to spaCy
+SPACY_MAX_CHARS = 100000
+
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Characters of each document handed to the sentence encoder ('truncate' mode)
+EMBEDDING_MAX_CHARS = 10000
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|\n')
+
+# Bump whenever keyword extraction or embedding logic changes, so that
+# stored document features (e.g. JobPosting.embedding) are recomputed
+FEATURES_VERSION = 1
+
 
 def get_nlp():
     """Lazy load spaCy model."""
@@ -28,6 +58,11 @@ def get_nlp():
             except OSError:
                 _nlp = spacy.load("en_core_web_sm")
                 logger.info("Loaded spaCy small model (transformer not available)")
+            
+            # Only entities and noun chunks are read, skip everything else
+            for name in UNUSED_SPACY_PIPES:
+                if name in _nlp.pipe_names:
+                    _nlp.disable_pipe(name)
         except ImportError:
             logger.error("spaCy not installed")
             raise
@@ -35,19 +70,92 @@ def get_nlp():
 
 
 def get_sentence_model():
-    """Lazy load sentence-transformers model."""
+    """Lazy load the sentence encoder for the configured backend."""
     global _sentence_model
     if _sentence_model is None:
+        from django.conf import settings
+        from .encoders import load_encoder, resolve_backend
+        
+        configured = getattr(settings, 'CRITIQUE_ENCODER_BACKEND', 'torch')
+        backend = resolve_backend(configured)
+        if backend != configured:
+            logger.warning(
+                f"onnxruntime not installed (requirements-onnx.txt), using the {backend} "
+                f"encoder instead of {configured}"
+            )
         try:
-            from sentence_transformers import SentenceTransformer
-            _sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
-            logger.info("Loaded sentence-transformers model")
+            _sentence_model = load_encoder(
+                backend,
+                SENTENCE_MODEL_NAME,
+                getattr(settings, 'CRITIQUE_ONNX_MODEL_DIR', ''),
+            )
+            logger.info(f"Loaded sentence encoder ({backend} backend)")
         except ImportError:
-            logger.error("sentence-transformers not installed")
+            logger.error(f"Dependencies for the {backend} encoder backend not installed")
             raise
     return _sentence_model
 
 
+def resident_memory_mb() -> float:
+    """Current resident set size of this process in MB."""
+    try:
+        with open('/proc/self/status') as fh:
+            for line in fh:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    
+    # Not on Linux: fall back to peak RSS
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+_WARMUP_TEXT = (
+    "Senior Python developer with 5 years of experience building Django "
+    "REST APIs on AWS. Led a team of four engineers at Acme Corp."
+)
+
+
+def warm_up_models() -> float:
+    """
+    Run one inference through spaCy and the encoder; returns the seconds taken.
+    
+    Starts torch's and BLAS's thread pools, so in a prefork worker it must
+    run in the children, never in the parent: pools started before fork
+    are not usable in the child and can hang its first inference.
+    """
+    start = time.perf_counter()
+    _extract_keywords_local(_WARMUP_TEXT)
+    _encode_texts_local([_WARMUP_TEXT])
+    return time.perf_counter() - start
+
+
+def preload_models(warm_up: bool = True):
+    """
+    Load spaCy, the sentence encoder and the skill matcher up front.
+    
+    Called in the Celery prefork parent (CRITIQUE_PRELOAD_MODELS) so every
+    child inherits the loaded models copy-on-write instead of paying the
+    load on its first task; the parent passes warm_up=False and each child
+    calls warm_up_models() before its first task. Elsewhere (e.g. the inference
+    server) the optional warm-up runs here so the first real request sees
+    steady-state latency.
+    """
+    start = time.perf_counter()
+    get_nlp()
+    get_sentence_model()
+    get_skill_matcher()
+    load_seconds = time.perf_counter() - start
+    
+    warm_up_seconds = warm_up_models() if warm_up else 0.0
+    
+    logger.info(
+        f"Preloaded NLP models in {load_seconds:.1f}s "
+        f"(warm-up {warm_up_seconds:.1f}s), RSS {resident_memory_mb():.0f} MB"
+    )
+
+
 # Technical skills dictionary for enhanced NER
 TECH_SKILLS = {
     # Programming Languages
@@ -91,6 +199,18 @@ class CritiqueScore:
     missing_keywords: List[str]
     resume_keywords: List[str]
     jd_keywords: List[str]
+    # True when a component fell back to a neutral value (e.g. encoder failure)
+    degraded: bool = False
+
+
+@dataclass
+class DocumentFeatures:
+    """Keywords and embedding of a document, reusable across critiques."""
+    keywords: Set[str]
+    embedding: Optional[List[float]]
+    fingerprint: str
+    # False when spaCy failed and the keywords are only the dictionary matches
+    complete: bool = True
 
 
 @dataclass
@@ -103,7 +223,58 @@ class DetailedCritique:
     formatting_notes: List[str]
 
 
-def extract_keywords(text: str) -> Set[str]:
+def _keywords_from_doc(doc, keywords: Set[str]) -> Set[str]:
+    """Add NER entities and short noun chunks from a spaCy Doc."""
+    # Extract relevant entity types
+    for ent in doc.ents:
+        if ent.label_ in ('ORG', 'PRODUCT', 'GPE', 'EVENT', 'WORK_OF_ART'):
+            keywords.add(ent.text.lower())
+    
+    # Extract noun chunks (noun phrases)
+    for chunk in doc.noun_chunks:
+        # Only include short, meaningful phrases
+        if 1 <= len(chunk.text.split()) <= 3:
+            chunk_lower = chunk.text.lower().strip()
+            if len(chunk_lower) > 2:
+                keywords.add(chunk_lower)
+    
+    return keywords
+
+
+def _remote_keywords(texts: List[str]) -> Optional[List[Set[str]]]:
+    """Keywords from the local inference server, or None to use in-process models."""
+    from .inference import InferenceUnavailable, get_inference_client
+    
+    client = get_inference_client()
+    if client is None:
+        return None
+    try:
+        return [set(keywords) for keywords in client.extract_keywords(texts)]
+    except InferenceUnavailable as e:
+        logger.warning(f"Inference server unavailable, using in-process models: {e}")
+        return None
+
+
+def _remote_embeddings(texts: List[str]):
+    """
+    (embeddings, features version) from the local inference server, or
+    None to use in-process models.
+    """
+    import numpy as np
+    from .inference import InferenceUnavailable, get_inference_client
+    
+    client = get_inference_client()
+    if client is None:
+        return None
+    try:
+        embeddings, version = client.encode(texts)
+    except InferenceUnavailable as e:
+        logger.warning(f"Inference server unavailable, using in-process models: {e}")
+        return None
+    return np.asarray(embeddings, dtype=np.float32), version
+
+
+def extract_keywords(text: str, strict: bool = False) -> Set[str]:
     """
     Extract keywords from text using spaCy NER and pattern matching.
     
@@ -111,41 +282,95 @@ def extract_keywords(text: str) -> Set[str]:
     - Named Entity Recognition (ORG, PRODUCT, etc.)
     - Dictionary-based technical skill matching
     - Noun phrase extraction
-    """
-    keywords = set()
-    text_lower = text.lower()
     
-    # Dictionary-based skill extraction (case-insensitive)
-    for skill in TECH_SKILLS:
-        # Use word boundary matching for multi-word skills
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            keywords.add(skill)
+    Uses the local inference server when one is configured and running.
+    
+    Args:
+        text: Document to process
+        strict: Raise CritiqueError if spaCy fails instead of returning the
+            dictionary matches alone (for results that get persisted)
+    """
+    remote = _remote_keywords([text])
+    if remote is not None:
+        return remote[0]
+    return _extract_keywords_local(text, strict=strict)
+
+
+def _extract_keywords_local(text: str, strict: bool = False) -> Set[str]:
+    # Dictionary-based skill extraction (case-insensitive, single pass)
+    keywords = get_skill_matcher().find(text.lower())
     
     # spaCy NER extraction
     try:
         nlp = get_nlp()
-        doc = nlp(text[:100000])  # Limit text length for performance
-        
-        # Extract relevant entity types
-        for ent in doc.ents:
-            if ent.label_ in ('ORG', 'PRODUCT', 'GPE', 'EVENT', 'WORK_OF_ART'):
-                keywords.add(ent.text.lower())
-        
-        # Extract noun chunks (noun phrases)
-        for chunk in doc.noun_chunks:
-            # Only include short, meaningful phrases
-            if 1 <= len(chunk.text.split()) <= 3:
-                chunk_lower = chunk.text.lower().strip()
-                if len(chunk_lower) > 2:
-                    keywords.add(chunk_lower)
-                    
+        doc = nlp(text[:SPACY_MAX_CHARS])  # Limit text length for performance
+        _keywords_from_doc(doc, keywords)
     except Exception as e:
+        if strict:
+            raise CritiqueError(f"spaCy extraction failed: {e}") from e
         logger.warning(f"spaCy extraction failed: {e}")
     
     return keywords
 
 
+def extract_keywords_batch(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+    n_process: Optional[int] = None,
+    strict: bool = False
+) -> List[Set[str]]:
+    """
+    Extract keywords from many documents with a single streamed spaCy pass.
+    
+    Produces the same keyword sets as calling extract_keywords() on each
+    text, but lets spaCy batch the documents through ``nlp.pipe``.
+    
+    Args:
+        texts: Documents to process
+        batch_size: Documents per spaCy batch (CRITIQUE_SPACY_BATCH_SIZE)
+        n_process: Worker processes for nlp.pipe (CRITIQUE_SPACY_N_PROCESS).
+            Keep at 1 inside Celery prefork children, which cannot fork.
+        strict: Raise CritiqueError if spaCy fails (see extract_keywords)
+    """
+    remote = _remote_keywords(texts)
+    if remote is not None:
+        return remote
+    return _extract_keywords_batch_local(texts, batch_size, n_process, strict=strict)
+
+
+def _extract_keywords_batch_local(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+    n_process: Optional[int] = None,
+    strict: bool = False
+) -> List[Set[str]]:
+    from django.conf import settings
+    
+    if batch_size is None:
+        batch_size = getattr(settings, 'CRITIQUE_SPACY_BATCH_SIZE', 32)
+    if n_process is None:
+        n_process = getattr(settings, 'CRITIQUE_SPACY_N_PROCESS', 1)
+    
+    matcher = get_skill_matcher()
+    results = [matcher.find(text.lower()) for text in texts]
+    
+    try:
+        nlp = get_nlp()
+        docs = nlp.pipe(
+            (text[:SPACY_MAX_CHARS] for text in texts),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+        spacy_keywords = [_keywords_from_doc(doc, set()) for doc in docs]
+    except Exception as e:
+        logger.warning(f"Batched spaCy extraction failed, falling back to single documents: {e}")
+        return [_extract_keywords_local(text, strict=strict) for text in texts]
+    
+    for keywords, extra in zip(results, spacy_keywords):
+        keywords.update(extra)
+    return results
+
+
 def calculate_jaccard_similarity(set1: Set[str], set2: Set[str]) -> float:
     """
     Calculate Jaccard similarity between two sets.
@@ -161,40 +386,327 @@ def calculate_jaccard_similarity(set1: Set[str], set2: Set[str]) -> float:
     return intersection / union if union > 0 else 0.0
 
 
-def calculate_semantic_similarity(text1: str, text2: str) -> float:
+@lru_cache(maxsize=1)
+def local_features_version() -> str:
     """
-    Calculate semantic similarity using sentence embeddings.
+    Identify the in-process models and settings that produce document features.
     
-    Uses cosine similarity between dense vector representations.
+    Built from package metadata only, so it never loads spaCy or the encoder.
     """
+    from importlib import metadata
+    from django.conf import settings
+    from .encoders import resolve_backend
+    
+    parts = {
+        'version': FEATURES_VERSION,
+        'encoder': SENTENCE_MODEL_NAME,
+        # The backend that actually runs, so an ONNX fallback is told apart
+        'encoder_backend': resolve_backend(getattr(settings, 'CRITIQUE_ENCODER_BACKEND', 'torch')),
+        'embedding_mode': getattr(settings, 'CRITIQUE_EMBEDDING_MODE', 'truncate'),
+        'pooling': getattr(settings, 'CRITIQUE_EMBEDDING_POOLING', 'mean'),
+    }
+    
+    # Same preference order as get_nlp()
+    for package in ('en_core_web_trf', 'en_core_web_sm'):
+        try:
+            parts['spacy_model'] = f"{package}=={metadata.version(package)}"
+            break
+        except metadata.PackageNotFoundError:
+            continue
+    
+    taxonomy_path = getattr(settings, 'CRITIQUE_SKILLS_TAXONOMY', '')
+    if taxonomy_path:
+        with open(taxonomy_path, 'rb') as fh:
+            parts['taxonomy'] = hashlib.sha256(fh.read()).hexdigest()
+    
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
+
+
+# (version, expiry) of the inference server's features version
+_remote_version_cache = (None, 0.0)
+REMOTE_VERSION_TTL = 60  # seconds
+
+
+def _remote_features_version() -> Optional[str]:
+    """The inference server's features version, or None if it isn't in use."""
+    global _remote_version_cache
+    from .inference import InferenceUnavailable, get_inference_client
+    
+    client = get_inference_client()
+    if client is None:
+        return None
+    
+    version, expires = _remote_version_cache
+    if version is not None and time.monotonic() < expires:
+        return version
     try:
-        from sentence_transformers import util
+        version = client.version()
+    except InferenceUnavailable:
+        return None
+    _remote_version_cache = (version, time.monotonic() + REMOTE_VERSION_TTL)
+    return version
+
+
+def get_features_version() -> str:
+    """
+    Features version of whichever encoder currently produces features:
+    the inference server's while it is running, else the in-process one.
+    
+    Stored features whose fingerprint was made under another version (e.g.
+    a server running a different model or ONNX backend) no longer match.
+    """
+    return _remote_features_version() or local_features_version()
+
+
+def features_fingerprint(text: str, version: Optional[str] = None) -> str:
+    """
+    Hash of a document's text together with the feature models version.
+    
+    Args:
+        text: Document text
+        version: Features version of the encoder that produced the stored
+            features (from encode_texts_versioned); defaults to the current one
+    """
+    payload = f"{version or get_features_version()}:{text}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _token_length(tokenizer, text: str) -> int:
+    return len(tokenizer(text, add_special_tokens=False)['input_ids'])
+
+
+def _fit_pieces(paragraph: str, tokenizer, window: int) -> List[Tuple[str, int]]:
+    """Split a paragraph into (piece, token_count) pairs no longer than the window."""
+    length = _token_length(tokenizer, paragraph)
+    if length <= window:
+        return [(paragraph, length)]
+    
+    pieces = []
+    for sentence in _SENTENCE_BREAK.split(paragraph):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
         
-        model = get_sentence_model()
+        encoding = tokenizer(sentence, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = encoding['offset_mapping']
+        if len(offsets) <= window:
+            pieces.append((sentence, len(offsets)))
+            continue
         
-        # Truncate texts for embedding (model has max length)
-        text1_truncated = text1[:10000]
-        text2_truncated = text2[:10000]
+        # A single sentence longer than the window: cut on token offsets
+        for start in range(0, len(offsets), window):
+            window_offsets = offsets[start:start + window]
+            piece = sentence[window_offsets[0][0]:window_offsets[-1][1]]
+            pieces.append((piece, len(window_offsets)))
+    
+    return pieces
+
+
+def chunk_text(text: str, tokenizer, window: int) -> List[str]:
+    """
+    Split text into model-sized windows on section and sentence boundaries.
+    
+    Paragraphs (blank-line separated blocks, which is how sections come out
+    of the PDF parser) are packed greedily into windows of at most
+    ``window`` tokens. Paragraphs that are too long on their own are split
+    by sentence/line, and overlong sentences by token offsets.
+    """
+    chunks = []
+    current = []
+    current_length = 0
+    
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
         
-        # Generate embeddings
-        embeddings = model.encode([text1_truncated, text2_truncated])
+        for piece, length in _fit_pieces(paragraph, tokenizer, window):
+            if current and current_length + length > window:
+                chunks.append('\n'.join(current))
+                current = []
+                current_length = 0
+            current.append(piece)
+            current_length += length
+    
+    if current:
+        chunks.append('\n'.join(current))
+    
+    return chunks or ['']
+
+
+def encode_texts(texts: List[str]):
+    """
+    Encode texts with the sentence model in a single batch.
+    
+    In 'chunked' mode (CRITIQUE_EMBEDDING_MODE) every text is split into
+    token windows, the chunks of all texts are encoded in one ``encode``
+    call, and all of each text's chunk vectors are pooled (mean or max)
+    into a single embedding. 'truncate' mode (the default) encodes the
+    first EMBEDDING_MAX_CHARS characters of each text, of which the model
+    only sees its first max_seq_length tokens.
+    
+    Uses the local inference server when one is configured and running.
+    """
+    return encode_texts_versioned(texts)[0]
+
+
+def encode_texts_versioned(texts: List[str]):
+    """
+    encode_texts(), plus the features version of the encoder that ran it.
+    
+    Returns:
+        (embeddings, version) to fingerprint persisted embeddings with
+    """
+    remote = _remote_embeddings(texts)
+    if remote is not None:
+        return remote
+    return _encode_texts_local(texts), local_features_version()
+
+
+def _encode_texts_local(texts: List[str]):
+    import numpy as np
+    from django.conf import settings
+    
+    model = get_sentence_model()
+    
+    if getattr(settings, 'CRITIQUE_EMBEDDING_MODE', 'truncate') != 'chunked':
+        # Truncate texts for embedding (model has max length)
+        return model.encode([text[:EMBEDDING_MAX_CHARS] for text in texts])
+    
+    pooling = getattr(settings, 'CRITIQUE_EMBEDDING_POOLING', 'mean')
+    # Leave room for the [CLS] and [SEP] tokens
+    window = model.max_seq_length - 2
+    
+    chunks = []
+    bounds = []
+    for text in texts:
+        text_chunks = chunk_text(text, model.tokenizer, window)
+        bounds.append((len(chunks), len(chunks) + len(text_chunks)))
+        chunks.extend(text_chunks)
+    
+    chunk_embeddings = model.encode(chunks)
+    
+    pool = np.max if pooling == 'max' else np.mean
+    return np.stack([pool(chunk_embeddings[start:end], axis=0) for start, end in bounds])
+
+
+def cosine_similarity(vec1, vec2) -> float:
+    """Cosine similarity between two dense vectors."""
+    import numpy as np
+    
+    vec1 = np.asarray(vec1, dtype=np.float32)
+    vec2 = np.asarray(vec2, dtype=np.float32)
+    denominator = np.linalg.norm(vec1) * np.linalg.norm(vec2)
+    if denominator == 0:
+        return 0.0
+    return float(np.dot(vec1, vec2) / denominator)
+
+
+def compute_document_features(texts: List[str]) -> List[DocumentFeatures]:
+    """
+    Compute keywords and embeddings for documents that are scored repeatedly.
+    
+    Embeddings are None if the encoder failed, and ``complete`` is False
+    if spaCy did, so callers can avoid persisting an incomplete result.
+    """
+    complete = True
+    version = None
+    try:
+        keyword_sets = extract_keywords_batch(texts, strict=True)
+    except CritiqueError as e:
+        logger.error(f"Document keyword extraction failed: {e}")
+        keyword_sets = extract_keywords_batch(texts)
+        complete = False
+    
+    try:
+        embeddings, version = encode_texts_versioned(texts)
+        embeddings = [embedding.tolist() for embedding in embeddings]
+    except Exception as e:
+        logger.error(f"Document embedding failed: {e}")
+        embeddings = [None] * len(texts)
+    
+    return [
+        DocumentFeatures(
+            keywords=keywords,
+            embedding=embedding,
+            fingerprint=features_fingerprint(text, version),
+            complete=complete
+        )
+        for text, keywords, embedding in zip(texts, keyword_sets, embeddings)
+    ]
+
+
+def calculate_semantic_similarity(
+    text1: str,
+    text2: str,
+    embedding2: Optional[List[float]] = None,
+    embedding1: Optional[List[float]] = None
+) -> Optional[float]:
+    """
+    Calculate semantic similarity using sentence embeddings.
+    
+    Uses cosine similarity between dense vector representations.
+    Precomputed embeddings are used instead of encoding the matching text.
+    Returns None if the texts could not be encoded.
+    """
+    try:
+        # Generate embeddings for whichever side is missing
+        if embedding1 is None and embedding2 is None:
+            embedding1, embedding2 = encode_texts([text1, text2])
+        elif embedding1 is None:
+            embedding1 = encode_texts([text1])[0]
+        elif embedding2 is None:
+            embedding2 = encode_texts([text2])[0]
         
         # Calculate cosine similarity
-        cosine_sim = util.cos_sim(embeddings[0], embeddings[1]).item()
+        cosine_sim = cosine_similarity(embedding1, embedding2)
         
         # Normalize to 0-1 range (cosine can be negative)
         return max(0.0, cosine_sim)
         
     except Exception as e:
         logger.error(f"Semantic similarity calculation failed: {e}")
-        return 0.5  # Default neutral score on error
+        return None
+
+
+def build_critique_score(
+    resume_keywords: Set[str],
+    jd_keywords: Set[str],
+    semantic_sim: float,
+    keyword_weight: float = 0.3,
+    semantic_weight: float = 0.7,
+    degraded: bool = False
+) -> CritiqueScore:
+    """Combine keyword overlap and a semantic similarity into a CritiqueScore."""
+    # Calculate Jaccard similarity (keyword overlap)
+    jaccard_sim = calculate_jaccard_similarity(resume_keywords, jd_keywords)
+    
+    # Calculate weighted final score
+    final_score = (keyword_weight * jaccard_sim) + (semantic_weight * semantic_sim)
+    
+    # Identify matched and missing keywords
+    matched = resume_keywords.intersection(jd_keywords)
+    missing = jd_keywords - resume_keywords
+    
+    return CritiqueScore(
+        overall_score=round(final_score * 100, 2),
+        keyword_score=round(jaccard_sim * 100, 2),
+        semantic_score=round(semantic_sim * 100, 2),
+        matched_keywords=sorted(list(matched)),
+        missing_keywords=sorted(list(missing)),
+        resume_keywords=sorted(list(resume_keywords)),
+        jd_keywords=sorted(list(jd_keywords)),
+        degraded=degraded
+    )
 
 
 def calculate_hybrid_score(
     resume_text: str,
     jd_text: str,
     keyword_weight: float = 0.3,
-    semantic_weight: float = 0.7
+    semantic_weight: float = 0.7,
+    jd_features: Optional[DocumentFeatures] = None,
+    resume_features: Optional[DocumentFeatures] = None
 ) -> CritiqueScore:
     """
     Calculate hybrid score combining keyword overlap and semantic similarity.
@@ -204,36 +716,154 @@ def calculate_hybrid_score(
         jd_text: Job description text
         keyword_weight: Weight for Jaccard similarity (default 30%)
         semantic_weight: Weight for semantic similarity (default 70%)
+        jd_features: Precomputed job description keywords/embedding.
+            When given, the JD is not re-processed.
+        resume_features: Precomputed resume keywords/embedding.
         
     Returns:
         CritiqueScore with detailed breakdown
     """
-    # Extract keywords
-    resume_keywords = extract_keywords(resume_text)
-    jd_keywords = extract_keywords(jd_text)
-    
-    # Calculate Jaccard similarity (keyword overlap)
-    jaccard_sim = calculate_jaccard_similarity(resume_keywords, jd_keywords)
+    # Extract keywords for whichever documents have no precomputed features
+    if jd_features is None and resume_features is None:
+        # Both documents in one spaCy batch
+        resume_keywords, jd_keywords = extract_keywords_batch([resume_text, jd_text])
+    else:
+        resume_keywords = (
+            set(resume_features.keywords) if resume_features is not None
+            else extract_keywords(resume_text)
+        )
+        jd_keywords = (
+            set(jd_features.keywords) if jd_features is not None
+            else extract_keywords(jd_text)
+        )
     
     # Calculate semantic similarity
-    semantic_sim = calculate_semantic_similarity(resume_text, jd_text)
+    semantic_sim = calculate_semantic_similarity(
+        resume_text,
+        jd_text,
+        embedding2=jd_features.embedding if jd_features is not None else None,
+        embedding1=resume_features.embedding if resume_features is not None else None,
+    )
     
-    # Calculate weighted final score
-    final_score = (keyword_weight * jaccard_sim) + (semantic_weight * semantic_sim)
+    # Encoder failure: neutral similarity, flagged so the result is not cached
+    degraded = semantic_sim is None
+    if degraded:
+        semantic_sim = 0.5
     
-    # Identify matched and missing keywords
-    matched = resume_keywords.intersection(jd_keywords)
-    missing = jd_keywords - resume_keywords
+    return build_critique_score(
+        resume_keywords, jd_keywords, semantic_sim, keyword_weight, semantic_weight,
+        degraded=degraded
+    )
+
+
+def rank_against_job(
+    resume_features: List[DocumentFeatures],
+    jd_features: DocumentFeatures,
+    keyword_weight: float = 0.3,
+    semantic_weight: float = 0.7
+) -> List[CritiqueScore]:
+    """
+    Score many resumes against one job description at once.
     
-    return CritiqueScore(
-        overall_score=round(final_score * 100, 2),
-        keyword_score=round(jaccard_sim * 100, 2),
-        semantic_score=round(semantic_sim * 100, 2),
-        matched_keywords=sorted(list(matched)),
-        missing_keywords=sorted(list(missing)),
-        resume_keywords=sorted(list(resume_keywords)),
-        jd_keywords=sorted(list(jd_keywords))
+    All resume embeddings are stacked into one matrix and compared with the
+    JD vector in a single matrix-vector product. Every resume must have an
+    embedding.
+    """
+    import numpy as np
+    
+    if not resume_features:
+        return []
+    
+    matrix = np.asarray([features.embedding for features in resume_features], dtype=np.float32)
+    jd_vector = np.asarray(jd_features.embedding, dtype=np.float32)
+    
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(jd_vector)
+    similarities = np.divide(
+        matrix @ jd_vector, norms,
+        out=np.zeros(len(matrix), dtype=np.float32),
+        where=norms > 0
     )
+    
+    # Normalize to 0-1 range (cosine can be negative)
+    similarities = np.maximum(similarities, 0.0)
+    
+    jd_keywords = set(jd_features.keywords)
+    return [
+        build_critique_score(
+            set(features.keywords), jd_keywords, float(similarity),
+            keyword_weight, semantic_weight
+        )
+        for features, similarity in zip(resume_features, similarities)
+    ]
+
+
+def lexical_similarities(resume_texts: List[str], jd_text: str):
+    """
+    TF-IDF cosine similarity of each resume to the job description.
+    
+    A cheap stand-in for the transformer similarity when prefiltering
+    large candidate pools.
+    """
+    import numpy as np
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    
+    if not resume_texts:
+        return np.zeros(0)
+    
+    vectorizer = TfidfVectorizer(stop_words='english', sublinear_tf=True)
+    try:
+        matrix = vectorizer.fit_transform([jd_text] + list(resume_texts))
+    except ValueError:
+        # Empty vocabulary (only stop words / no text)
+        return np.zeros(len(resume_texts))
+    
+    # Rows are L2-normalized, so the dot product is the cosine
+    return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+
+def prefilter_scores(
+    resume_texts: List[str],
+    jd_text: str,
+    keyword_weight: float = 0.3,
+    semantic_weight: float = 0.7
+) -> List[CritiqueScore]:
+    """
+    Cheap first-tier scores for a pool of resumes.
+    
+    Uses dictionary-only keywords (no spaCy) and TF-IDF similarity
+    (no encoder) in place of the full hybrid score's components.
+    """
+    matcher = get_skill_matcher()
+    jd_keywords = matcher.find(jd_text.lower())
+    similarities = lexical_similarities(resume_texts, jd_text)
+    
+    return [
+        build_critique_score(
+            matcher.find(text.lower()), jd_keywords, float(similarity),
+            keyword_weight, semantic_weight
+        )
+        for text, similarity in zip(resume_texts, similarities)
+    ]
+
+
+def select_shortlist(
+    scores: List[CritiqueScore],
+    top_k: Optional[int] = None,
+    threshold: Optional[float] = None
+) -> Set[int]:
+    """
+    Indices of the scores that advance to the full analysis.
+    
+    Takes the top_k best overall scores plus everything at or above
+    threshold (0-100 scale).
+    """
+    shortlist = set()
+    if top_k:
+        order = sorted(range(len(scores)), key=lambda i: scores[i].overall_score, reverse=True)
+        shortlist.update(order[:top_k])
+    if threshold is not None:
+        shortlist.update(i for i, score in enumerate(scores) if score.overall_score >= threshold)
+    return shortlist
 
 
 def generate_qualitative_feedback(
@@ -301,24 +931,65 @@ def generate_qualitative_feedback(
     return strengths, weaknesses, recommendations
 
 
-def analyze_formatting(resume_text: str) -> List[str]:
+# Words whose presence anywhere in the resume counts as having the section
+_FORMATTING_SECTION_PATTERNS = {
+    'summary': re.compile(r'summary|objective|profile', re.IGNORECASE),
+    'experience': re.compile(r'experience|employment|work history', re.IGNORECASE),
+    'education': re.compile(r'education|academic', re.IGNORECASE),
+    'skills': re.compile(r'skills|competencies|technologies', re.IGNORECASE),
+}
+_QUANTIFIED_RE = re.compile(r'\d+%|\$\d+|\d+\s*(years?|months?)')
+ACTION_VERBS = (
+    'achieved', 'developed', 'led', 'managed', 'created', 'implemented',
+    'increased', 'reduced', 'improved', 'designed', 'built', 'launched',
+)
+
+
+_FORMATTING_SECTION_RE = re.compile(
+    # Lookahead, so a match never hides an overlapping one of another section
+    '(?=' + '|'.join(
+        f'(?P<{name}>{pattern.pattern})' for name, pattern in _FORMATTING_SECTION_PATTERNS.items()
+    ) + ')',
+    re.IGNORECASE
+)
+
+
+def _present_formatting_sections(resume_text: str, sections=None) -> Set[str]:
+    """Which of the expected sections the resume mentions."""
+    # Header lines from split_sections() usually settle it without a full scan
+    headers = [section.header for section in sections or [] if section.header]
+    present = {
+        name for name, pattern in _FORMATTING_SECTION_PATTERNS.items()
+        if any(pattern.search(header) for header in headers)
+    }
+    if len(present) == len(_FORMATTING_SECTION_PATTERNS):
+        return present
+    
+    # One pass over the text for the rest, stopping once all are found
+    for match in _FORMATTING_SECTION_RE.finditer(resume_text):
+        present.add(match.lastgroup)
+        if len(present) == len(_FORMATTING_SECTION_PATTERNS):
+            break
+    
+    return present
+
+
+def analyze_formatting(resume_text: str, sections=None) -> List[str]:
     """
     Analyze resume formatting and structure.
     
+    Args:
+        resume_text: Cleaned resume text
+        sections: Optional split_sections() output for the same text
+    
     Returns list of formatting observations/suggestions.
     """
     notes = []
     
     # Check for section presence
-    sections = {
-        'summary': r'(?i)(summary|objective|profile)',
-        'experience': r'(?i)(experience|employment|work history)',
-        'education': r'(?i)(education|academic)',
-        'skills': r'(?i)(skills|competencies|technologies)',
-    }
-    
-    for section, pattern in sections.items():
-        if not re.search(pattern, resume_text):
+    present = _present_formatting_sections(resume_text, sections)
+    for section in _FORMATTING_SECTION_PATTERNS:
+        if section not in present:
             notes.append(f"Consider adding a clear '{section.title()}' section")
     
     # Check for bullet points
@@ -326,15 +997,13 @@ def analyze_formatting(resume_text: str) -> List[str]:
         notes.append("Use bullet points to improve readability and ATS parsing")
     
     # Check for quantifiable achievements
-    if not re.search(r'\d+%|\$\d+|\d+\s*(years?|months?)', resume_text):
+    if not _QUANTIFIED_RE.search(resume_text):
         notes.append("Add quantifiable achievements (percentages, dollar amounts, timeframes)")
     
     # Check for action verbs at the start of lines
-    action_verbs = ['achieved', 'developed', 'led', 'managed', 'created', 'implemented',
-                    'increased', 'reduced', 'improved', 'designed', 'built', 'launched']
-    has_action_verbs = any(
-        resume_text.lower().startswith(verb) or f'\n{verb}' in resume_text.lower()
-        for verb in action_verbs
+    text_lower = resume_text.lower()
+    has_action_verbs = text_lower.startswith(ACTION_VERBS) or any(
+        f'\n{verb}' in text_lower for verb in ACTION_VERBS
     )
     if not has_action_verbs:
         notes.append("Start bullet points with strong action verbs")
@@ -342,22 +1011,28 @@ def analyze_formatting(resume_text: str) -> List[str]:
     return notes if notes else ["Resume formatting appears well-structured"]
 
 
-def run_full_critique(resume_text: str, jd_text: str) -> DetailedCritique:
+def build_detailed_critique(
+    resume_text: str,
+    jd_text: str,
+    scores: CritiqueScore,
+    sections=None
+) -> DetailedCritique:
     """
-    Run the complete critique pipeline.
+    Add qualitative feedback and formatting notes to a score.
     
-    Returns a DetailedCritique with all analysis results.
+    Args:
+        sections: split_sections() output for resume_text, e.g. stored on
+            the Candidate at extraction time; split here if not given
     """
-    # Calculate hybrid score
-    scores = calculate_hybrid_score(resume_text, jd_text)
-    
     # Generate qualitative feedback
     strengths, weaknesses, recommendations = generate_qualitative_feedback(
         resume_text, jd_text, scores
     )
     
-    # Analyze formatting
-    formatting_notes = analyze_formatting(resume_text)
+    # Analyze formatting, reusing the section split for the presence checks
+    if sections is None:
+        sections = split_sections(resume_text)
+    formatting_notes = analyze_formatting(resume_text, sections=sections)
     
     return DetailedCritique(
         scores=scores,
@@ -368,6 +1043,25 @@ def run_full_critique(resume_text: str, jd_text: str) -> DetailedCritique:
     )
 
 
+def run_full_critique(
+    resume_text: str,
+    jd_text: str,
+    jd_features: Optional[DocumentFeatures] = None,
+    resume_features: Optional[DocumentFeatures] = None
+) -> DetailedCritique:
+    """
+    Run the complete critique pipeline.
+    
+    Returns a DetailedCritique with all analysis results.
+    """
+    # Calculate hybrid score
+    scores = calculate_hybrid_score(
+        resume_text, jd_text, jd_features=jd_features, resume_features=resume_features
+    )
+    
+    return build_detailed_critique(resume_text, jd_text, scores)
+
+
 def critique_to_dict(critique: DetailedCritique) -> dict:
     """Convert DetailedCritique to JSON-serializable dict."""
     return {
@@ -10,26 +10,43 @@ logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def run_critique_pipeline(self, candidate_id: str, job_id: str):
+def run_critique_pipeline(self, candidate_id: str, job_id: str, lock_key: str = None):
     """
     Asynchronous task to run the full critique pipeline.
     
     Args:
         candidate_id: UUID of the Candidate
         job_id: UUID of the JobPosting
+        lock_key: Single-flight key claimed by generate_critique; its TTL
+            restarts with every attempt and it is released when the task
+            finishes (but held across retries)
         
-    This task:
-    1. Loads the candidate and job posting
-    2. Extracts text from the resume PDF
-    3. Runs the hybrid scoring engine
-    4. Generates qualitative feedback
-    5. Saves results to CritiqueResult
+    The pipeline runs as checkpointed stages:
+    1. extract    - resume text (Candidate.resume_text)
+    2. keywords   - resume keywords (Candidate.keywords)
+    3. embeddings - resume embedding (Candidate.embedding)
+    4. score      - hybrid score (CritiqueResult scores)
+    5. feedback   - qualitative feedback (CritiqueResult.result_json)
+    
+    CritiqueResult.stage records the last finished stage, so a retry
+    resumes at the stage that failed. NonRetryableError failures (e.g. too
+    little text in the resume) are not retried.
+    
+    Progress events (started, each finished stage, retrying, done, failed)
+    are published for the SSE stream under this task's id.
     """
     from api.models import Candidate, JobPosting, CritiqueResult
-    from .parser import extract_text_from_pdf
-    from .services import run_full_critique, critique_to_dict
+    from core.progress import publish_progress, DONE, FAILED
+    from .cache import get_cached_critique
+    from .exceptions import ExtractionBudgetExceeded, InsufficientTextError, NonRetryableError
+    from .locks import refresh_single_flight, release_single_flight
+    
+    Stage = CritiqueResult.Stage
+    retrying = False
     
     logger.info(f"Starting critique pipeline for candidate {candidate_id}")
+    if lock_key:
+        refresh_single_flight(lock_key, self.request.id)
     
     try:
         # Load models
@@ -41,33 +58,39 @@ def run_critique_pipeline(self, candidate_id: str, job_id: str):
         critique.status = CritiqueResult.Status.PROCESSING
         critique.save(update_fields=['status'])
         
-        # Step 1: Extract resume text
-        logger.info(f"Extracting text from resume: {candidate.resume_file.name}")
+        if critique.stage:
+            logger.info(f"Resuming critique after stage '{critique.stage}'")
+        publish_progress(self.request.id, 'started', resumed_after=critique.stage.lower() or None)
         
-        if not candidate.resume_text:
-            resume_text = extract_text_from_pdf(candidate.resume_file)
-            candidate.resume_text = resume_text
-            candidate.save(update_fields=['resume_text'])
-        else:
+        # Stage 1: Extract resume text, unless done at upload time
+        if not critique.reached(Stage.EXTRACT):
+            extraction = _ensure_resume_text(candidate)
             resume_text = candidate.resume_text
+            
+            if not resume_text or len(resume_text.strip()) < 50:
+                if extraction is not None and extraction.truncated:
+                    raise ExtractionBudgetExceeded(extraction.reason)
+                raise InsufficientTextError("Could not extract sufficient text from resume")
+            
+            _checkpoint(critique, Stage.EXTRACT)
         
-        if not resume_text or len(resume_text.strip()) < 50:
-            raise ValueError("Could not extract sufficient text from resume")
+        resume_text = candidate.resume_text
+        jd_text = job_posting.description_text
         
-        # Step 2: Get job description text
-        jd_text = f"{job_posting.title}\n\n{job_posting.description}"
-        if job_posting.requirements:
-            jd_text += f"\n\nRequirements:\n{job_posting.requirements}"
-        
-        # Step 3: Run full critique
-        logger.info("Running critique analysis...")
-        detailed_critique = run_full_critique(resume_text, jd_text)
+        # Same texts already scored: skip straight to the result
+        result = get_cached_critique(resume_text, jd_text)
+        if result is not None:
+            logger.info("Critique served from cache")
+        else:
+            result = _run_scoring_stages(critique, candidate, job_posting, resume_text, jd_text)
         
-        # Step 4: Save results
-        critique.overall_score = detailed_critique.scores.overall_score
-        critique.keyword_score = detailed_critique.scores.keyword_score
-        critique.semantic_score = detailed_critique.scores.semantic_score
-        critique.result_json = critique_to_dict(detailed_critique)
+        # Save results
+        critique.overall_score = result['scores']['overall_score']
+        critique.keyword_score = result['scores']['keyword_score']
+        critique.semantic_score = result['scores']['semantic_score']
+        critique.tier = CritiqueResult.Tier.FULL
+        critique.result_json = result
+        critique.stage = Stage.FEEDBACK
         critique.status = CritiqueResult.Status.COMPLETED
         critique.completed_at = timezone.now()
         critique.error_message = ''
@@ -77,6 +100,7 @@ def run_critique_pipeline(self, candidate_id: str, job_id: str):
             f"Critique completed for {candidate.name}: "
             f"Score={critique.overall_score:.2f}"
         )
+        publish_progress(self.request.id, DONE, overall_score=critique.overall_score)
         
         return {
             'status': 'completed',
@@ -86,24 +110,669 @@ def run_critique_pipeline(self, candidate_id: str, job_id: str):
         
     except Candidate.DoesNotExist:
         logger.error(f"Candidate {candidate_id} not found")
+        publish_progress(self.request.id, FAILED, error='Candidate not found')
         return {'status': 'error', 'message': 'Candidate not found'}
         
     except JobPosting.DoesNotExist:
         logger.error(f"JobPosting {job_id} not found")
         _mark_critique_failed(candidate_id, "Job posting not found")
+        publish_progress(self.request.id, FAILED, error='Job posting not found')
         return {'status': 'error', 'message': 'Job posting not found'}
         
+    except NonRetryableError as e:
+        logger.error(f"Critique pipeline failed permanently: {e}")
+        _mark_critique_failed(candidate_id, str(e))
+        publish_progress(self.request.id, FAILED, error=str(e))
+        return {'status': 'error', 'message': str(e)}
+        
     except Exception as e:
         logger.exception(f"Critique pipeline failed: {e}")
         _mark_critique_failed(candidate_id, str(e))
         
         # Retry on transient errors
         if self.request.retries < self.max_retries:
+            retrying = True
+            publish_progress(self.request.id, 'retrying', attempt=self.request.retries + 1)
             raise self.retry(exc=e)
         
+        publish_progress(self.request.id, FAILED, error=str(e))
+        return {'status': 'error', 'message': str(e)}
+    
+    finally:
+        if lock_key and not retrying:
+            release_single_flight(lock_key, self.request.id)
+
+
+def _checkpoint(critique, stage: str, fields=()):
+    """Record a finished pipeline stage, with the fields it produced."""
+    from core.progress import publish_progress
+    
+    critique.stage = stage
+    critique.save(update_fields=['stage', *fields])
+    publish_progress(critique.task_id, stage.lower())
+
+
+def _run_scoring_stages(critique, candidate, job_posting, resume_text: str, jd_text: str) -> dict:
+    """
+    Keywords -> embeddings -> score -> feedback, skipping finished stages.
+    
+    Returns the critique_to_dict() result.
+    """
+    from dataclasses import asdict
+    from api.models import CritiqueResult
+    from .cache import set_cached_critique
+    from .exceptions import CritiqueError
+    from .services import (
+        CritiqueScore, DocumentFeatures, extract_keywords, encode_texts_versioned, features_fingerprint,
+        calculate_hybrid_score, build_detailed_critique, critique_to_dict,
+    )
+    
+    Stage = CritiqueResult.Stage
+    
+    # Features stored by an earlier run, the eager or the bulk tasks count
+    # as finished keyword and embedding stages
+    if not critique.reached(Stage.EMBEDDINGS) and _load_features(candidate, resume_text):
+        _checkpoint(critique, Stage.EMBEDDINGS)
+    
+    # Stage 2: Resume keywords; spaCy errors propagate so partial keywords
+    # are never stored (bulk ranking reuses them)
+    if not critique.reached(Stage.KEYWORDS):
+        logger.info("Extracting resume keywords...")
+        candidate.keywords = sorted(extract_keywords(resume_text, strict=True))
+        candidate.save(update_fields=['keywords'])
+        _checkpoint(critique, Stage.KEYWORDS)
+    
+    # Stage 3: Resume embedding; encoder errors propagate so the retry
+    # resumes here
+    if not critique.reached(Stage.EMBEDDINGS):
+        logger.info("Encoding resume...")
+        embeddings, version = encode_texts_versioned([resume_text])
+        candidate.embedding = embeddings[0].tolist()
+        # Stamped with the version of the encoder that actually ran (the
+        # inference server's, if it served the request)
+        candidate.features_fingerprint = features_fingerprint(resume_text, version)
+        candidate.save(update_fields=['embedding', 'features_fingerprint'])
+        _checkpoint(critique, Stage.EMBEDDINGS)
+    
+    # Stage 4: Hybrid score against the stored JD features
+    if not critique.reached(Stage.SCORE):
+        logger.info("Scoring resume against job description...")
+        jd_features = get_job_features(job_posting)
+        # A neutral fallback score must not be checkpointed as a result;
+        # raise so the retry resumes here
+        if jd_features.embedding is None or not jd_features.complete:
+            raise CritiqueError("Could not compute job description features")
+        
+        resume_features = DocumentFeatures(
+            keywords=set(candidate.keywords or []),
+            embedding=candidate.embedding,
+            fingerprint=candidate.features_fingerprint
+        )
+        scores = calculate_hybrid_score(
+            resume_text, jd_text,
+            jd_features=jd_features,
+            resume_features=resume_features
+        )
+        if scores.degraded:
+            raise CritiqueError("Semantic similarity unavailable")
+        critique.overall_score = scores.overall_score
+        critique.keyword_score = scores.keyword_score
+        critique.semantic_score = scores.semantic_score
+        critique.result_json = {'scores': asdict(scores)}
+        _checkpoint(
+            critique, Stage.SCORE,
+            ['overall_score', 'keyword_score', 'semantic_score', 'result_json']
+        )
+    
+    # Stage 5: Qualitative feedback
+    logger.info("Generating feedback...")
+    scores = CritiqueScore(**critique.result_json['scores'])
+    result = critique_to_dict(build_detailed_critique(
+        resume_text, jd_text, scores, sections=_resume_sections(candidate)
+    ))
+    # Degraded scores (encoder fallback) are skipped by the cache
+    set_cached_critique(resume_text, jd_text, result)
+    return result
+
+
+def _resume_sections(candidate):
+    """The candidate's stored split_sections() output, or a fresh split."""
+    from .parser import sections_from_json, split_sections
+    
+    sections = sections_from_json(candidate.resume_section_spans)
+    return sections if sections is not None else split_sections(candidate.resume_text)
+
+
+def _ensure_resume_text(candidate):
+    """
+    Fill a Candidate's resume_text, resume_sections and
+    resume_section_spans if missing.
+    
+    Text already extracted from an identical upload is reused; otherwise
+    the PDF goes through the sandboxed extractor.
+    
+    Returns:
+        The ExtractionResult if the PDF was extracted, else None
+    """
+    from api.uploads import hash_file
+    from .cache import get_extracted_text
+    from .parser import extract_sections, sections_to_json, split_sections
+    from .sandbox import extract_resume_text
+    
+    extraction = None
+    update_fields = []
+    
+    if not candidate.resume_text:
+        if not candidate.resume_sha256:
+            candidate.resume_sha256 = hash_file(candidate.resume_file)
+        
+        # Same PDF already extracted for another posting?
+        extracted = get_extracted_text(candidate.resume_sha256)
+        if extracted:
+            logger.info("Resume text reused from an identical upload")
+            candidate.resume_text, candidate.resume_truncated = extracted
+        else:
+            logger.info(f"Extracting text from resume: {candidate.resume_file.name}")
+            extraction = extract_resume_text(candidate.resume_file)
+            candidate.resume_text = extraction.text
+            candidate.resume_truncated = extraction.truncated
+        
+        update_fields += ['resume_sha256', 'resume_text', 'resume_truncated']
+    
+    if candidate.resume_text and (
+        candidate.resume_sections is None or candidate.resume_section_spans is None
+    ):
+        # One split serves the section map and the offsets later stages reuse
+        sections = split_sections(candidate.resume_text)
+        candidate.resume_sections = extract_sections(candidate.resume_text, sections)
+        candidate.resume_section_spans = sections_to_json(sections)
+        update_fields += ['resume_sections', 'resume_section_spans']
+    
+    if update_fields:
+        candidate.save(update_fields=update_fields)
+    
+    return extraction
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def extract_candidate_text(self, candidate_id: str):
+    """
+    Extract a new Candidate's resume text and sections ahead of time.
+    
+    Enqueued on upload (routed to the low-priority 'extraction' queue) so
+    a later critique only pays for scoring.
+    """
+    from api.models import Candidate
+    from .exceptions import NonRetryableError
+    
+    try:
+        candidate = Candidate.objects.get(id=candidate_id)
+        _ensure_resume_text(candidate)
+        return {
+            'status': 'completed',
+            'candidate_id': str(candidate_id),
+            'chars': len(candidate.resume_text),
+            'truncated': candidate.resume_truncated,
+        }
+        
+    except Candidate.DoesNotExist:
+        logger.error(f"Candidate {candidate_id} not found")
+        return {'status': 'error', 'message': 'Candidate not found'}
+        
+    except NonRetryableError as e:
+        logger.error(f"Resume extraction failed permanently: {e}")
+        return {'status': 'error', 'message': str(e)}
+        
+    except Exception as e:
+        # The critique pipeline extracts again if this never succeeds
+        logger.exception(f"Resume extraction failed: {e}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=e)
         return {'status': 'error', 'message': str(e)}
 
 
+def _load_features(instance, text: str):
+    """
+    Return the features stored on a JobPosting or Candidate.
+    
+    Returns None when they are missing or were computed from a different
+    text or model version.
+    """
+    from .services import DocumentFeatures, features_fingerprint
+    
+    fingerprint = features_fingerprint(text)
+    if instance.features_fingerprint == fingerprint and instance.embedding is not None:
+        return DocumentFeatures(
+            keywords=set(instance.keywords or []),
+            embedding=instance.embedding,
+            fingerprint=fingerprint
+        )
+    return None
+
+
+def _assign_features(instance, features) -> bool:
+    """Copy features onto a model instance. Returns False for a failed encode or spaCy run."""
+    # Don't persist features from a failed encode or partial keywords
+    if features.embedding is None or not features.complete:
+        return False
+    instance.keywords = sorted(features.keywords)
+    instance.embedding = features.embedding
+    instance.features_fingerprint = features.fingerprint
+    return True
+
+
+FEATURE_FIELDS = ['keywords', 'embedding', 'features_fingerprint']
+
+
+def get_job_features(job_posting):
+    """
+    Return the job description's keywords and embedding.
+    
+    Reads the values stored on the JobPosting when they were computed from
+    the current text and models, otherwise recomputes and stores them.
+    """
+    from .services import compute_document_features
+    
+    jd_text = job_posting.description_text
+    features = _load_features(job_posting, jd_text)
+    if features is not None:
+        return features
+    
+    features = compute_document_features([jd_text])[0]
+    if _assign_features(job_posting, features):
+        job_posting.save(update_fields=FEATURE_FIELDS)
+        logger.info(f"Stored features for job posting {job_posting.id}")
+    
+    return features
+
+
+def get_candidate_features(candidate):
+    """Return the resume's keywords and embedding, computing and storing them if stale."""
+    from .services import compute_document_features
+    
+    features = _load_features(candidate, candidate.resume_text)
+    if features is not None:
+        return features
+    
+    features = compute_document_features([candidate.resume_text])[0]
+    if _assign_features(candidate, features):
+        candidate.save(update_fields=FEATURE_FIELDS)
+    
+    return features
+
+
+@shared_task
+def index_job_posting(job_id: str):
+    """
+    Compute and store a job posting's keywords and embedding.
+    
+    Triggered when a posting is created or updated so critiques only
+    encode the resume.
+    """
+    from api.models import JobPosting
+    
+    try:
+        job_posting = JobPosting.objects.get(id=job_id)
+    except JobPosting.DoesNotExist:
+        logger.error(f"JobPosting {job_id} not found")
+        return {'status': 'error', 'message': 'Job posting not found'}
+    
+    features = get_job_features(job_posting)
+    return {
+        'status': 'completed' if features.embedding is not None else 'error',
+        'job_id': str(job_id),
+        'keyword_count': len(features.keywords),
+    }
+
+
+CRITIQUE_RESULT_FIELDS = [
+    'overall_score', 'keyword_score', 'semantic_score', 'tier', 'result_json',
+    'stage', 'status', 'completed_at', 'error_message',
+]
+
+
+def _score_candidates(candidates, jd_features):
+    """
+    Full keyword + semantic scores for candidates with resume text.
+    
+    Stored features are reused; the rest are computed in one batch
+    (nlp.pipe + one encoder call) and saved with bulk_update.
+    
+    Returns:
+        (candidate, CritiqueScore) pairs, skipping failed encodes
+    """
+    from api.models import Candidate
+    from .services import compute_document_features, rank_against_job
+    
+    resume_features = {}
+    stale = []
+    for candidate in candidates:
+        features = _load_features(candidate, candidate.resume_text)
+        if features is not None:
+            resume_features[candidate.id] = features
+        else:
+            stale.append(candidate)
+    
+    if stale:
+        logger.info(f"Computing features for {len(stale)} candidates")
+        computed = compute_document_features([candidate.resume_text for candidate in stale])
+        updated = []
+        for candidate, features in zip(stale, computed):
+            if _assign_features(candidate, features):
+                resume_features[candidate.id] = features
+                updated.append(candidate)
+        Candidate.objects.bulk_update(updated, FEATURE_FIELDS, batch_size=500)
+    
+    ranked = [candidate for candidate in candidates if candidate.id in resume_features]
+    scores = rank_against_job([resume_features[c.id] for c in ranked], jd_features)
+    return list(zip(ranked, scores))
+
+
+def _has_full_critique(candidate) -> bool:
+    """Whether the candidate has a completed full critique of its current resume text."""
+    from api.models import CritiqueResult
+    from .services import features_fingerprint
+    
+    critique = getattr(candidate, 'critique', None)
+    return (
+        critique is not None
+        and critique.tier == CritiqueResult.Tier.FULL
+        and critique.status == CritiqueResult.Status.COMPLETED
+        and candidate.features_fingerprint == features_fingerprint(candidate.resume_text)
+    )
+
+
+def _critique_of(candidate, new_critiques, existing_critiques):
+    """The candidate's CritiqueResult, filed under new or existing for bulk writes."""
+    from api.models import CritiqueResult
+    
+    critique = getattr(candidate, 'critique', None)
+    if critique is None:
+        critique = CritiqueResult(candidate=candidate)
+        candidate.critique = critique
+        new_critiques.append(critique)
+    else:
+        existing_critiques.append(critique)
+    return critique
+
+
+def _save_scored_critiques(results, jd_text: str, failures=()):
+    """
+    Write scored and failed critiques with bulk_create / bulk_update.
+    
+    Args:
+        results: (candidate, CritiqueScore, tier) triples
+        jd_text: Job description the scores were computed against
+        failures: (candidate, error message) pairs
+    """
+    from api.models import CritiqueResult
+    from .services import build_detailed_critique, critique_to_dict
+    
+    now = timezone.now()
+    new_critiques = []
+    existing_critiques = []
+    
+    for candidate, score, tier in results:
+        critique = _critique_of(candidate, new_critiques, existing_critiques)
+        detailed_critique = build_detailed_critique(
+            candidate.resume_text, jd_text, score, sections=_resume_sections(candidate)
+        )
+        critique.overall_score = score.overall_score
+        critique.keyword_score = score.keyword_score
+        critique.semantic_score = score.semantic_score
+        critique.tier = tier
+        critique.result_json = critique_to_dict(detailed_critique)
+        critique.stage = CritiqueResult.Stage.FEEDBACK
+        critique.status = CritiqueResult.Status.COMPLETED
+        critique.completed_at = now
+        critique.error_message = ''
+    
+    for candidate, error_message in failures:
+        critique = _critique_of(candidate, new_critiques, existing_critiques)
+        critique.status = CritiqueResult.Status.FAILED
+        critique.error_message = error_message[:1000]
+    
+    CritiqueResult.objects.bulk_create(new_critiques, batch_size=500)
+    CritiqueResult.objects.bulk_update(existing_critiques, CRITIQUE_RESULT_FIELDS, batch_size=500)
+
+
+@shared_task
+def rank_job_candidates(
+    job_id: str,
+    cascade: bool = False,
+    top_k: int = None,
+    threshold: float = None
+):
+    """
+    Re-score every candidate of a job posting in one pass.
+    
+    Resume embeddings stored on the candidates are stacked into a matrix and
+    compared with the JD vector in one matrix-vector product; candidates
+    without current features are encoded together in a single batch.
+    Results are written back with bulk_update.
+    
+    With ``cascade``, every candidate is first scored by the cheap
+    prefilter (dictionary keywords + TF-IDF). Only the top_k candidates
+    and those scoring at least ``threshold`` get the full NER + semantic
+    analysis; the rest get their prefilter score. Each CritiqueResult
+    records its tier. Prefilter scores are on a different scale, so they
+    never replace a completed full critique of the same resume text.
+    
+    Candidates without extracted text, or with a critique in progress,
+    are skipped; they go through run_critique_pipeline instead.
+    """
+    from django.conf import settings
+    from api.models import Candidate, JobPosting, CritiqueResult
+    from .services import prefilter_scores, select_shortlist
+    
+    try:
+        job_posting = JobPosting.objects.get(id=job_id)
+    except JobPosting.DoesNotExist:
+        logger.error(f"JobPosting {job_id} not found")
+        return {'status': 'error', 'message': 'Job posting not found'}
+    
+    jd_text = job_posting.description_text
+    jd_features = get_job_features(job_posting)
+    if jd_features.embedding is None:
+        return {'status': 'error', 'message': 'Could not encode job description'}
+    
+    candidates = list(
+        Candidate.objects.filter(job_posting=job_posting)
+        .exclude(resume_text='')
+        .exclude(critique__status=CritiqueResult.Status.PROCESSING)
+        .select_related('critique')
+    )
+    
+    # Tier 1: cheap prefilter for everyone, shortlist for the full analysis
+    results = []
+    shortlisted = candidates
+    kept_full = 0
+    if cascade:
+        if top_k is None and threshold is None:
+            top_k = settings.CRITIQUE_CASCADE_TOP_K
+            threshold = settings.CRITIQUE_CASCADE_THRESHOLD
+        
+        cheap_scores = prefilter_scores([c.resume_text for c in candidates], jd_text)
+        shortlist = select_shortlist(cheap_scores, top_k=top_k, threshold=threshold)
+        shortlisted = [c for i, c in enumerate(candidates) if i in shortlist]
+        for i, (candidate, score) in enumerate(zip(candidates, cheap_scores)):
+            if i in shortlist:
+                continue
+            if _has_full_critique(candidate):
+                kept_full += 1
+            else:
+                results.append((candidate, score, CritiqueResult.Tier.PREFILTER))
+        logger.info(
+            f"Cascade for job {job_id}: {len(shortlisted)}/{len(candidates)} shortlisted, "
+            f"{kept_full} full critiques kept"
+        )
+    
+    # Tier 2: full semantic scoring, one encoder batch for stale features
+    full_results = _score_candidates(shortlisted, jd_features)
+    results.extend(
+        (candidate, score, CritiqueResult.Tier.FULL)
+        for candidate, score in full_results
+    )
+    
+    _save_scored_critiques(results, jd_text)
+    
+    logger.info(f"Ranked {len(results)} candidates for job {job_id}")
+    
+    ranking = sorted(
+        (pair for pair in results if pair[2] == CritiqueResult.Tier.FULL),
+        key=lambda pair: pair[1].overall_score,
+        reverse=True
+    )
+    return {
+        'status': 'completed',
+        'job_id': str(job_id),
+        'ranked': len(results),
+        'full_analysis': len(full_results),
+        'kept_full': kept_full,
+        'skipped': len(candidates) - len(results) - kept_full,
+        'top': [
+            {'candidate_id': str(candidate.id), 'overall_score': score.overall_score}
+            for candidate, score, _ in ranking[:10]
+        ],
+    }
+
+
+@shared_task(bind=True)
+def critique_job_candidates(self, job_id: str, chunk_size: int = None):
+    """
+    Run the full critique for every candidate of a job posting.
+    
+    Candidates are processed in chunks within this one task. The JD text
+    and features are computed once; each chunk extracts missing resume
+    text, computes features in one batch, scores against the shared JD
+    embedding and writes all critiques with bulk operations. Progress is
+    reported per chunk as a PROGRESS state with counts in the task meta.
+    
+    Candidates with a critique already in progress are skipped. Each
+    chunk re-checks that and claims its candidates' single-flight keys
+    (as generate_critique does) for the time it takes to score them, so a
+    single critique started meanwhile is neither overwritten nor run on
+    top of the bulk write.
+    """
+    from django.conf import settings
+    from api.models import Candidate, JobPosting, CritiqueResult
+    from .locks import release_single_flight
+    
+    chunk_size = chunk_size or getattr(settings, 'CRITIQUE_BULK_CHUNK_SIZE', 25)
+    
+    try:
+        job_posting = JobPosting.objects.get(id=job_id)
+    except JobPosting.DoesNotExist:
+        logger.error(f"JobPosting {job_id} not found")
+        return {'status': 'error', 'message': 'Job posting not found'}
+    
+    jd_text = job_posting.description_text
+    jd_features = get_job_features(job_posting)
+    if jd_features.embedding is None:
+        return {'status': 'error', 'message': 'Could not encode job description'}
+    
+    candidate_ids = list(
+        Candidate.objects.filter(job_posting=job_posting)
+        .exclude(critique__status=CritiqueResult.Status.PROCESSING)
+        .values_list('id', flat=True)
+    )
+    total = len(candidate_ids)
+    chunks = (total + chunk_size - 1) // chunk_size
+    completed = 0
+    failed = 0
+    
+    for chunk_index, offset in enumerate(range(0, total, chunk_size), 1):
+        chunk = list(
+            Candidate.objects.filter(id__in=candidate_ids[offset:offset + chunk_size])
+            .exclude(critique__status=CritiqueResult.Status.PROCESSING)
+            .select_related('critique')
+        )
+        chunk, claims = _claim_candidates(chunk, job_id, self.request.id)
+        try:
+            ready = []
+            failures = []
+            for candidate in chunk:
+                try:
+                    _ensure_resume_text(candidate)
+                except Exception as e:
+                    logger.warning(f"Resume extraction failed for candidate {candidate.id}: {e}")
+                    failures.append((candidate, str(e)))
+                    continue
+                
+                if len(candidate.resume_text.strip()) < 50:
+                    failures.append((candidate, "Could not extract sufficient text from resume"))
+                else:
+                    ready.append(candidate)
+            
+            scored = _score_candidates(ready, jd_features)
+            scored_ids = {candidate.id for candidate, _ in scored}
+            failures.extend(
+                (candidate, "Could not encode resume")
+                for candidate in ready if candidate.id not in scored_ids
+            )
+            
+            _save_scored_critiques(
+                [(candidate, score, CritiqueResult.Tier.FULL) for candidate, score in scored],
+                jd_text,
+                failures=failures
+            )
+        finally:
+            for key in claims:
+                release_single_flight(key, self.request.id)
+        completed += len(scored)
+        failed += len(failures)
+        
+        self.update_state(state='PROGRESS', meta={
+            'job_id': str(job_id),
+            'chunk': chunk_index,
+            'chunks': chunks,
+            'processed': min(offset + chunk_size, total),
+            'total': total,
+            'completed': completed,
+            'failed': failed,
+        })
+        logger.info(f"Critique chunk {chunk_index}/{chunks} done for job {job_id}")
+    
+    return {
+        'status': 'completed',
+        'job_id': str(job_id),
+        'total': total,
+        'completed': completed,
+        'failed': failed,
+    }
+
+
+def _claim_candidates(candidates, job_id: str, task_id: str):
+    """
+    Take the single-flight key of each candidate for ``task_id``.
+    
+    Returns:
+        (candidates claimed, keys to release). Candidates whose key is
+        held by a running generate_critique are left out. Without Redis,
+        every candidate is kept and the PROCESSING status check is all
+        that guards them.
+    """
+    from .locks import acquire_single_flight, candidate_single_flight_key
+    
+    claimed = []
+    keys = []
+    for candidate in candidates:
+        key = candidate_single_flight_key(candidate, job_id)
+        try:
+            in_flight = acquire_single_flight(key, task_id)
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable, using status check: {e}")
+            claimed.append(candidate)
+            continue
+        
+        if in_flight:
+            logger.info(f"Skipping candidate {candidate.id}: critique {in_flight} in flight")
+            continue
+        claimed.append(candidate)
+        keys.append(key)
+    return claimed, keys
+
+
 def _mark_critique_failed(candidate_id: str, error_message: str):
     """Helper to mark a critique as failed."""
     from api.models import Candidate, CritiqueResult
@@ -0,0 +1,41 @@
+"""
+clean_resume_text must give exactly the output of the multi-pass version
+it replaced.
+"""
+
+import random
+
+import pytest
+
+from critique.management.commands.benchmark_text_cleaner import (
+    BULLET_CHARS, reference_clean_resume_text,
+)
+from critique.parser import clean_resume_text
+
+# Bullets, control characters, Unicode whitespace and ASCII
+FUZZ_ALPHABET = (
+    list('abC+.# ') + ['\n'] * 4 + ['\t', '  ', '\r', '\x0b', '\x0c', '\x00', '\x1c', '\x7f']
+    + BULLET_CHARS
+    + ['é', '—', '\xa0', ' ', '　', '​', '\x85', '😀']
+)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_matches_reference_on_random_text(seed):
+    rng = random.Random(seed)
+    for _ in range(5000):
+        text = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 60)))
+        assert clean_resume_text(text) == reference_clean_resume_text(text), repr(text)
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    '   ',
+    '\n\n\n\n',
+    'plain ascii line',
+    ' '.join(BULLET_CHARS),
+    '•\t Led a team of 4  – 2019–2023 \n\n\n\n▪ Built APIs\r\n',
+    '\x00\x1c\x7f\x85\xa0　​😀',
+])
+def test_matches_reference_on_edge_cases(text):
+    assert clean_resume_text(text) == reference_clean_resume_text(text)
@@ -101,4 +101,29 @@ export const getCritique = async (id) => {
     return response.data;
 };
 
+// Compact status of many critiques; data is null when the batch is unchanged (304)
+export const getCritiqueStatuses = async (taskIds, etag = null) => {
+    const response = await api.get('/critiques/status/', {
+        params: { task_ids: taskIds.join(',') },
+        headers: etag ? { 'If-None-Match': etag } : {},
+        validateStatus: (status) => status === 200 || status === 304,
+    });
+    return {
+        etag: response.headers.etag || null,
+        data: response.status === 304 ? null : response.data,
+    };
+};
+
+// ===== Progress streams (Server-Sent Events) =====
+
+export const critiqueStreamUrl = (taskId) => `${api.defaults.baseURL}/critiques/stream/${taskId}/`;
+
+// EventSource cannot send the JWT header: fetch a short-lived, single-use
+// ticket for each connection instead of putting the token in the URL
+export const resumeStreamUrl = async (resumeId) => {
+    const response = await api.post(`/agents/stream_ticket/${resumeId}/`);
+    const ticket = encodeURIComponent(response.data.ticket);
+    return `${api.defaults.baseURL}/agents/stream/${resumeId}/?ticket=${ticket}`;
+};
+
 export default api;
@@ -1,10 +1,10 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import {
     ArrowLeft, Upload, User, Mail, FileText,
     Trash2, Zap, Clock, CheckCircle, XCircle, AlertCircle
 } from 'lucide-react';
-import { getJob, uploadCandidate, deleteCandidate, generateCritique } from '../api/client';
+import { getJob, uploadCandidate, deleteCandidate, generateCritique, getCritiqueStatuses } from '../api/client';
 import CritiqueModal from './CritiqueModal';
 
 function JobDetail() {
@@ -14,16 +14,30 @@ function JobDetail() {
     const [showUploadModal, setShowUploadModal] = useState(false);
     const [selectedCandidate, setSelectedCandidate] = useState(null);
     const [processingIds, setProcessingIds] = useState(new Set());
+    // Critiques in flight: task_id -> candidate id
+    const [trackedTasks, setTrackedTasks] = useState({});
+    const statusEtag = useRef(null);
 
     useEffect(() => {
         loadJob();
     }, [jobId]);
 
+    const trackTask = (taskId, candidateId) => {
+        setTrackedTasks((prev) => ({ ...prev, [taskId]: candidateId }));
+    };
+
     const loadJob = async () => {
         try {
             setIsLoading(true);
             const data = await getJob(jobId);
             setJob(data);
+
+            // Pick up critiques already running (e.g. from another tab)
+            (data.candidates || []).forEach((candidate) => {
+                if (candidate.critique_status === 'PROCESSING' && candidate.critique_task_id) {
+                    trackTask(candidate.critique_task_id, candidate.id);
+                }
+            });
         } catch (err) {
             console.error('Failed to load job:', err);
         } finally {
@@ -51,27 +65,74 @@ function JobDetail() {
         }
     };
 
+    const stopProcessing = (candidateIds) => {
+        setProcessingIds((prev) => {
+            const next = new Set(prev);
+            candidateIds.forEach((id) => next.delete(id));
+            return next;
+        });
+    };
+
     const handleGenerateCritique = async (candidateId) => {
         try {
             setProcessingIds((prev) => new Set([...prev, candidateId]));
-            await generateCritique(candidateId);
-            // Start polling by refreshing occasionally
-            const pollInterval = setInterval(() => {
-                loadJob();
-            }, 3000);
-
-            // Stop polling after 2 minutes
-            setTimeout(() => clearInterval(pollInterval), 120000);
+            const data = await generateCritique(candidateId);
+            trackTask(data.task_id, candidateId);
         } catch (err) {
+            // Already running: follow the run in flight
+            if (err.response?.status === 409 && err.response.data?.task_id) {
+                trackTask(err.response.data.task_id, candidateId);
+                return;
+            }
             console.error('Failed to generate critique:', err);
-            setProcessingIds((prev) => {
-                const next = new Set(prev);
-                next.delete(candidateId);
-                return next;
-            });
+            stopProcessing([candidateId]);
         }
     };
 
+    // One batch status request for every critique in flight; unchanged
+    // batches come back as an empty 304
+    useEffect(() => {
+        const taskIds = Object.keys(trackedTasks);
+        if (taskIds.length === 0) return;
+
+        const poll = setInterval(async () => {
+            try {
+                const { etag, data } = await getCritiqueStatuses(taskIds, statusEtag.current);
+                statusEtag.current = etag;
+                if (!data) return;
+
+                const finished = taskIds.filter((taskId) =>
+                    data.missing.includes(taskId) ||
+                    ['COMPLETED', 'FAILED'].includes(data.results[taskId]?.status)
+                );
+
+                setJob((prev) => prev && {
+                    ...prev,
+                    candidates: prev.candidates.map((candidate) => {
+                        const taskId = taskIds.find((id) => trackedTasks[id] === candidate.id);
+                        const row = taskId && data.results[taskId];
+                        return row
+                            ? { ...candidate, critique_status: row.status, overall_score: row.overall_score }
+                            : candidate;
+                    }),
+                });
+
+                if (finished.length > 0) {
+                    stopProcessing(finished.map((taskId) => trackedTasks[taskId]));
+                    setTrackedTasks((prev) => {
+                        const next = { ...prev };
+                        finished.forEach((taskId) => delete next[taskId]);
+                        return next;
+                    });
+                }
+            } catch (err) {
+                console.error('Failed to poll critique status:', err);
+            }
+        }, 3000);
+
+        return () => clearInterval(poll);
+    }, [trackedTasks]);
+
     const getScoreClass = (score) => {
         if (score >= 80) return 'score-excellent';
         if (score >= 60) return 'score-good';
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { Link } from 'react-router-dom';
 import { Plus, FileText, Download, Eye, Zap, Clock, CheckCircle, XCircle } from 'lucide-react';
 import { useSelector, useDispatch } from 'react-redux';
@@ -6,6 +6,17 @@ import { selectUser } from '../store/slices/authSlice';
 import { fetchResumes, generateResume, checkResumeStatus, selectResumes, selectResumesLoading, selectGenerating, selectResumesError, clearError } from '../store/slices/resumesSlice';
 import { selectIsProfileComplete, selectCompletionPercentage } from '../store/slices/profileSlice';
 import { generateResumePDF } from '../lib/pdfGenerator';
+import { resumeStreamUrl } from '../api/client';
+import { useProgressStream, TERMINAL_STAGES } from '../hooks/useProgressStream';
+
+const describeProgress = (progress) => {
+    switch (progress?.stage) {
+        case 'generator': return `Writing draft ${progress.iteration}...`;
+        case 'reviewer': return 'Reviewing...';
+        case 'analyzer': return 'Analyzing match...';
+        default: return 'Generating...';
+    }
+};
 
 function ResumeDashboard() {
     const dispatch = useDispatch();
@@ -23,9 +34,21 @@ function ResumeDashboard() {
         dispatch(fetchResumes());
     }, [dispatch]);
 
-    // Poll for generating resume status
+    const streamUrl = useCallback(() => resumeStreamUrl(generating), [generating]);
+    const { event: progress, unavailable: streamUnavailable } = useProgressStream(
+        generating ? streamUrl : null
+    );
+
+    // Refresh once the progress stream reports the end of the generation
+    useEffect(() => {
+        if (!generating || !TERMINAL_STAGES.includes(progress?.stage)) return;
+
+        dispatch(checkResumeStatus(generating)).then(() => dispatch(fetchResumes()));
+    }, [generating, progress, dispatch]);
+
+    // Poll for generating resume status when the stream is unavailable
     useEffect(() => {
-        if (!generating) return;
+        if (!generating || !streamUnavailable) return;
 
         const poll = setInterval(() => {
             dispatch(checkResumeStatus(generating)).then((result) => {
@@ -36,7 +59,7 @@ function ResumeDashboard() {
         }, 3000);
 
         return () => clearInterval(poll);
-    }, [generating, dispatch]);
+    }, [generating, streamUnavailable, dispatch]);
 
     const handleGenerate = async (jobDescription, title) => {
         dispatch(clearError());
@@ -92,7 +115,7 @@ function ResumeDashboard() {
                 {isProfileComplete ? (
                     <button className="btn btn-primary" onClick={() => setShowGenerateModal(true)} disabled={!!generating}>
                         {generating ? <span className="spinner" /> : <Zap size={18} />}
-                        {generating ? 'Generating...' : 'Generate Resume'}
+                        {generating ? describeProgress(progress) : 'Generate Resume'}
                     </button>
                 ) : (
                     <Link to="/profile/setup" className="btn btn-primary">
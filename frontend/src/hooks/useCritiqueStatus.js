@@ -1,14 +1,21 @@
 /**
- * Custom hook for polling critique status.
+ * Custom hook for following a critique task.
+ *
+ * Listens to the critique's progress stream and only falls back to polling
+ * when the stream is unavailable.
  */
 import { useState, useEffect, useCallback } from 'react';
-import { getCritiqueByTask } from '../api/client';
+import { getCritiqueByTask, critiqueStreamUrl } from '../api/client';
+import { useProgressStream } from './useProgressStream';
 
 export const useCritiqueStatus = (taskId, pollingInterval = 2000) => {
     const [status, setStatus] = useState('PENDING');
+    const [stage, setStage] = useState(null);
     const [result, setResult] = useState(null);
     const [error, setError] = useState(null);
-    const [isPolling, setIsPolling] = useState(false);
+    const { event, unavailable } = useProgressStream(taskId ? critiqueStreamUrl(taskId) : null);
+
+    const finished = status === 'COMPLETED' || status === 'FAILED' || error !== null;
 
     const fetchStatus = useCallback(async () => {
         if (!taskId) return;
@@ -19,41 +26,49 @@ export const useCritiqueStatus = (taskId, pollingInterval = 2000) => {
 
             if (data.status === 'COMPLETED') {
                 setResult(data);
-                setIsPolling(false);
             } else if (data.status === 'FAILED') {
                 setError(data.error_message || 'Analysis failed');
-                setIsPolling(false);
             }
         } catch (err) {
             setError(err.message);
-            setIsPolling(false);
         }
     }, [taskId]);
 
     useEffect(() => {
-        if (!taskId) return;
-
-        setIsPolling(true);
+        setStatus('PENDING');
+        setStage(null);
         setError(null);
         setResult(null);
-        setStatus('PENDING');
+    }, [taskId]);
 
-        // Initial fetch
-        fetchStatus();
+    // Pushed progress; the full result is fetched once at the end
+    useEffect(() => {
+        if (!event || event.task_id !== taskId) return;
 
-        // Set up polling
-        const intervalId = setInterval(() => {
-            if (status === 'PENDING' || status === 'PROCESSING') {
-                fetchStatus();
-            } else {
-                clearInterval(intervalId);
-            }
-        }, pollingInterval);
+        setStage(event.stage);
+        if (event.stage === 'done') {
+            fetchStatus();
+        } else if (event.stage === 'failed') {
+            setStatus('FAILED');
+            setError(event.error || 'Analysis failed');
+        } else {
+            setStatus('PROCESSING');
+        }
+    }, [event, taskId, fetchStatus]);
+
+    // Fallback polling
+    const isPolling = Boolean(taskId) && unavailable && !finished;
+
+    useEffect(() => {
+        if (!isPolling) return;
+
+        fetchStatus();
+        const intervalId = setInterval(fetchStatus, pollingInterval);
 
         return () => clearInterval(intervalId);
-    }, [taskId, pollingInterval, fetchStatus, status]);
+    }, [isPolling, pollingInterval, fetchStatus]);
 
-    return { status, result, error, isPolling };
+    return { status, stage, result, error, isPolling };
 };
 
 export default useCritiqueStatus;
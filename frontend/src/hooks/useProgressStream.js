@@ -0,0 +1,87 @@
+/**
+ * Custom hook for a task progress stream (Server-Sent Events).
+ */
+import { useState, useEffect } from 'react';
+
+export const TERMINAL_STAGES = ['done', 'failed'];
+
+// Delay before reopening a stream the server ended
+const RECONNECT_DELAY = 3000;
+
+/**
+ * Subscribe to a progress stream.
+ *
+ * `url` is the stream URL, or an async function resolving one (e.g. a URL
+ * with a single-use ticket), called again for every reconnect; pass a
+ * stable (memoized) function.
+ *
+ * Returns the latest event ({ task_id, stage, ... }) and whether the stream
+ * is unavailable (no EventSource support, or a connection failed before
+ * any event arrived, e.g. a 503 from a busy server), in which case the
+ * caller should fall back to polling.
+ */
+export const useProgressStream = (url) => {
+    const [event, setEvent] = useState(null);
+    const [unavailable, setUnavailable] = useState(false);
+
+    useEffect(() => {
+        setEvent(null);
+        setUnavailable(false);
+        if (!url) return;
+
+        if (typeof EventSource === 'undefined') {
+            setUnavailable(true);
+            return;
+        }
+
+        let source = null;
+        let reconnectTimer = null;
+        let cancelled = false;
+
+        const connect = async () => {
+            let streamUrl;
+            try {
+                streamUrl = typeof url === 'function' ? await url() : url;
+            } catch (err) {
+                if (!cancelled) setUnavailable(true);
+                return;
+            }
+            if (cancelled) return;
+
+            let received = false;
+            source = new EventSource(streamUrl, { withCredentials: true });
+
+            source.onmessage = (message) => {
+                received = true;
+                const data = JSON.parse(message.data);
+                setEvent(data);
+                if (TERMINAL_STAGES.includes(data.stage)) {
+                    source.close();
+                }
+            };
+
+            source.onerror = () => {
+                source.close();
+                // Streams are closed by the server after a while: reopen
+                // (with a fresh URL) if this one worked, otherwise poll
+                if (received) {
+                    reconnectTimer = setTimeout(connect, RECONNECT_DELAY);
+                } else {
+                    setUnavailable(true);
+                }
+            };
+        };
+
+        connect();
+
+        return () => {
+            cancelled = true;
+            clearTimeout(reconnectTimer);
+            if (source) source.close();
+        };
+    }, [url]);
+
+    return { event, unavailable };
+};
+
+export default useProgressStream;